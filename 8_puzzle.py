@@ -1,13 +1,14 @@
 
 import pygame
 import sys
-import heapq
 import time
-import random
-import threading
-from collections import deque
 from enum import Enum
-import math
+
+from npuzzle import (PuzzleSize, SearchAlgorithm, NPuzzleState, AdvancedAIEngine, OPTIMAL_ALGORITHMS,
+                     SolutionCache, SolverJob, EXACT_DEPTH_SIZES, depth_layers, random_board_at_distance,
+                     random_solvable_board, random_walk_board, walk_path, apply_path, invert_path,
+                     load_solutions, write_solutions, find_solution)
+from npuzzle.solutions import DEFAULT_SOLUTIONS_PATH
 
 # Initialize Pygame
 pygame.init()
@@ -17,6 +18,13 @@ WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 900
 TILE_MARGIN = 3
 
+# Budgets for one AI solve before it is stopped
+SOLVER_TIME_LIMIT = 120  # seconds
+SOLVER_MEMORY_LIMIT = 2 * 1024 * 1024 * 1024  # bytes of growth
+
+# Saved (board, solution) pairs: S appends the current plan, L replays them
+SOLUTIONS_FILE = DEFAULT_SOLUTIONS_PATH
+
 # Colors
 COLORS = {
     'background': (15, 15, 25),
@@ -38,336 +46,22 @@ COLORS = {
     'difficulty_expert': (255, 0, 255)
 }
 
-class PuzzleSize(Enum):
-    EIGHT = (3, "8-Puzzle")
-    FIFTEEN = (4, "15-Puzzle")
-    TWENTY_FOUR = (5, "24-Puzzle")
-    THIRTY_FIVE = (6, "35-Puzzle")
-
-class SearchAlgorithm(Enum):
-    BFS = "Breadth-First Search"
-    DFS = "Depth-First Search"
-    A_STAR_MANHATTAN = "A* (Manhattan Distance)"
-    A_STAR_EUCLIDEAN = "A* (Euclidean Distance)"
-    A_STAR_LINEAR_CONFLICT = "A* (Linear Conflict)"
-    GREEDY_MANHATTAN = "Greedy (Manhattan)"
-    IDA_STAR = "IDA* (Iterative Deepening A*)"
-
 class DifficultyLevel(Enum):
     EASY = (10, "Easy", COLORS['difficulty_easy'])
     MEDIUM = (25, "Medium", COLORS['difficulty_medium'])
     HARD = (50, "Hard", COLORS['difficulty_hard'])
     EXPERT = (100, "Expert", COLORS['difficulty_expert'])
 
-class NPuzzleState:
-    """Represents a state of the N-puzzle"""
-
-    def __init__(self, board, size, parent=None, move=None, depth=0):
-        self.board = [row[:] for row in board]  # Deep copy
-        self.size = size
-        self.parent = parent
-        self.move = move
-        self.depth = depth
-        self.empty_pos = self.find_empty()
-        self.hash_value = self._calculate_hash()
-
-    def find_empty(self):
-        """Find the position of the empty tile (0)"""
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return None
-
-    def _calculate_hash(self):
-        """Calculate hash for efficient state comparison"""
-        return hash(tuple(tuple(row) for row in self.board))
-
-    def __hash__(self):
-        return self.hash_value
-
-    def __eq__(self, other):
-        return isinstance(other, NPuzzleState) and self.board == other.board
-
-    def __lt__(self, other):
-        return False
-
-    def is_goal(self):
-        """Check if this is the goal state"""
-        goal = self.get_goal_state()
-        return self.board == goal
-
-    def get_goal_state(self):
-        """Get the goal state for the current puzzle size"""
-        goal = []
-        num = 1
-        for i in range(self.size):
-            row = []
-            for j in range(self.size):
-                if i == self.size - 1 and j == self.size - 1:
-                    row.append(0)  # Empty space at bottom right
-                else:
-                    row.append(num)
-                    num += 1
-            goal.append(row)
-        return goal
-
-    def manhattan_distance(self):
-        """Calculate Manhattan distance heuristic"""
-        distance = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] != 0:
-                    value = self.board[i][j]
-                    target_row = (value - 1) // self.size
-                    target_col = (value - 1) % self.size
-                    distance += abs(i - target_row) + abs(j - target_col)
-        return distance
-
-    def euclidean_distance(self):
-        """Calculate Euclidean distance heuristic"""
-        distance = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] != 0:
-                    value = self.board[i][j]
-                    target_row = (value - 1) // self.size
-                    target_col = (value - 1) % self.size
-                    distance += math.sqrt((i - target_row)**2 + (j - target_col)**2)
-        return distance
-
-    def linear_conflict(self):
-        """Calculate Linear Conflict heuristic (Manhattan + conflicts)"""
-        manhattan = self.manhattan_distance()
-        conflicts = 0
-
-        # Check row conflicts
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] != 0:
-                    value = self.board[i][j]
-                    target_row = (value - 1) // self.size
-                    if i == target_row:  # Tile is in correct row
-                        for k in range(j + 1, self.size):
-                            if self.board[i][k] != 0:
-                                other_value = self.board[i][k]
-                                other_target_row = (other_value - 1) // self.size
-                                other_target_col = (other_value - 1) % self.size
-                                if (i == other_target_row and 
-                                    (value - 1) % self.size > other_target_col):
-                                    conflicts += 1
-
-        # Check column conflicts
-        for j in range(self.size):
-            for i in range(self.size):
-                if self.board[i][j] != 0:
-                    value = self.board[i][j]
-                    target_col = (value - 1) % self.size
-                    if j == target_col:  # Tile is in correct column
-                        for k in range(i + 1, self.size):
-                            if self.board[k][j] != 0:
-                                other_value = self.board[k][j]
-                                other_target_row = (other_value - 1) // self.size
-                                other_target_col = (other_value - 1) % self.size
-                                if (j == other_target_col and 
-                                    (value - 1) // self.size > other_target_row):
-                                    conflicts += 1
-
-        return manhattan + 2 * conflicts
-
-    def misplaced_tiles(self):
-        """Calculate misplaced tiles heuristic"""
-        goal = self.get_goal_state()
-        count = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] != 0 and self.board[i][j] != goal[i][j]:
-                    count += 1
-        return count
-
-    def is_solvable(self):
-        """Check if the puzzle state is solvable"""
-        # Convert 2D board to 1D array excluding the empty tile
-        flat = []
-        empty_row = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    empty_row = i
-                else:
-                    flat.append(self.board[i][j])
-
-        # Count inversions
-        inversions = 0
-        for i in range(len(flat)):
-            for j in range(i + 1, len(flat)):
-                if flat[i] > flat[j]:
-                    inversions += 1
-
-        # Apply solvability rules
-        if self.size % 2 == 1:  # Odd size
-            return inversions % 2 == 0
-        else:  # Even size
-            return (inversions + empty_row) % 2 == 1
-
-    def get_neighbors(self):
-        """Get all possible neighbor states"""
-        neighbors = []
-        row, col = self.empty_pos
-        moves = [(-1, 0, 'UP'), (1, 0, 'DOWN'), (0, -1, 'LEFT'), (0, 1, 'RIGHT')]
-
-        for dr, dc, move_name in moves:
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < self.size and 0 <= new_col < self.size:
-                # Create new board with swapped tiles
-                new_board = [row[:] for row in self.board]
-                new_board[row][col], new_board[new_row][new_col] = \
-                    new_board[new_row][new_col], new_board[row][col]
-                neighbors.append(NPuzzleState(new_board, self.size, self, move_name, self.depth + 1))
-
-        return neighbors
-
-    def get_path(self):
-        """Get the path from start to this state"""
-        path = []
-        current = self
-        while current.parent is not None:
-            path.append(current.move)
-            current = current.parent
-        return path[::-1]
-
-class AdvancedAIEngine:
-    """Advanced AI Engine with multiple search algorithms"""
-
-    def __init__(self):
-        self.stats = {
-            'nodes_explored': 0,
-            'max_depth': 0,
-            'time_elapsed': 0,
-            'memory_used': 0,
-            'solution_length': 0
-        }
-
-    def reset_stats(self):
-        """Reset search statistics"""
-        self.stats = {
-            'nodes_explored': 0,
-            'max_depth': 0,
-            'time_elapsed': 0,
-            'memory_used': 0,
-            'solution_length': 0
-        }
-
-    def breadth_first_search(self, initial_state, max_nodes=100000):
-        """BFS with memory limit"""
-        self.reset_stats()
-        start_time = time.time()
-
-        if initial_state.is_goal():
-            return initial_state.get_path()
-
-        queue = deque([initial_state])
-        visited = {initial_state}
-
-        while queue and len(visited) < max_nodes:
-            current = queue.popleft()
-            self.stats['nodes_explored'] += 1
-            self.stats['max_depth'] = max(self.stats['max_depth'], current.depth)
-
-            for neighbor in current.get_neighbors():
-                if neighbor not in visited:
-                    if neighbor.is_goal():
-                        self.stats['time_elapsed'] = time.time() - start_time
-                        self.stats['solution_length'] = len(neighbor.get_path())
-                        return neighbor.get_path()
-
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-
-        self.stats['time_elapsed'] = time.time() - start_time
-        return None
-
-    def a_star_search(self, initial_state, heuristic_func, max_nodes=50000):
-        """A* Search with memory limit"""
-        self.reset_stats()
-        start_time = time.time()
-
-        if initial_state.is_goal():
-            return initial_state.get_path()
-
-        open_set = []
-        heapq.heappush(open_set, (heuristic_func(initial_state), 0, initial_state))
-
-        g_score = {initial_state: 0}
-        visited = set()
-
-        while open_set and len(visited) < max_nodes:
-            _, current_g, current = heapq.heappop(open_set)
-
-            if current in visited:
-                continue
-
-            visited.add(current)
-            self.stats['nodes_explored'] += 1
-            self.stats['max_depth'] = max(self.stats['max_depth'], current.depth)
-
-            if current.is_goal():
-                self.stats['time_elapsed'] = time.time() - start_time
-                self.stats['solution_length'] = len(current.get_path())
-                return current.get_path()
-
-            for neighbor in current.get_neighbors():
-                if neighbor in visited:
-                    continue
-
-                tentative_g = current_g + 1
-
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic_func(neighbor)
-                    heapq.heappush(open_set, (f_score, tentative_g, neighbor))
-
-        self.stats['time_elapsed'] = time.time() - start_time
-        return None
-
-    def ida_star_search(self, initial_state, heuristic_func, max_iterations=100):
-        """IDA* Search implementation"""
-        self.reset_stats()
-        start_time = time.time()
-
-        def search(node, g, threshold):
-            f = g + heuristic_func(node)
-            if f > threshold:
-                return f, None
-
-            if node.is_goal():
-                return f, node.get_path()
-
-            min_threshold = float('inf')
-            for neighbor in node.get_neighbors():
-                self.stats['nodes_explored'] += 1
-                t, path = search(neighbor, g + 1, threshold)
-                if path is not None:
-                    return t, path
-                if t < min_threshold:
-                    min_threshold = t
-
-            return min_threshold, None
-
-        threshold = heuristic_func(initial_state)
-
-        for iteration in range(max_iterations):
-            t, path = search(initial_state, 0, threshold)
-            if path is not None:
-                self.stats['time_elapsed'] = time.time() - start_time
-                self.stats['solution_length'] = len(path)
-                return path
-            if t == float('inf'):
-                break
-            threshold = t
-
-        self.stats['time_elapsed'] = time.time() - start_time
-        return None
+def rounded_panel(width, height, color, font=None, text=None, text_color=COLORS['text_primary']):
+    """Rounded, bordered box with optional centred text on a transparent surface"""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    rect = surface.get_rect()
+    pygame.draw.rect(surface, color, rect, border_radius=5)
+    pygame.draw.rect(surface, COLORS['border'], rect, 2, border_radius=5)
+    if text is not None:
+        text_surface = font.render(text, True, text_color)
+        surface.blit(text_surface, text_surface.get_rect(center=rect.center))
+    return surface
 
 class Button:
     """Enhanced button class"""
@@ -379,15 +73,20 @@ class Button:
         self.hovered = False
         self.color = color or COLORS['button']
         self.hover_color = COLORS['button_hover']
+        self.surfaces = {}
+
+    def render(self):
+        """Cached surface for the current text and hover state"""
+        key = (self.text, self.hovered)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            color = self.hover_color if self.hovered else self.color
+            surface = self.surfaces[key] = rounded_panel(self.rect.width, self.rect.height, color,
+                                                         self.font, self.text)
+        return surface
 
     def draw(self, screen):
-        color = self.hover_color if self.hovered else self.color
-        pygame.draw.rect(screen, color, self.rect, border_radius=5)
-        pygame.draw.rect(screen, COLORS['border'], self.rect, 2, border_radius=5)
-
-        text_surface = self.font.render(self.text, True, COLORS['text_primary'])
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.render(), self.rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -397,6 +96,101 @@ class Button:
                 return True
         return False
 
+class TileSprites:
+    """Pre-rendered tile surfaces for one board size and tile size"""
+
+    _cache = {}
+
+    def __init__(self, size, tile_size):
+        font = pygame.font.Font(None, min(tile_size // 3, 24))
+        self.empty = rounded_panel(tile_size, tile_size, COLORS['empty_space'])
+        numbers = range(1, size * size)
+        self.normal = [None] + [rounded_panel(tile_size, tile_size, COLORS['tile_normal'], font, str(n))
+                                for n in numbers]
+        self.correct = [None] + [rounded_panel(tile_size, tile_size, COLORS['tile_correct'], font, str(n))
+                                 for n in numbers]
+
+    @classmethod
+    def get(cls, size, tile_size):
+        sprites = cls._cache.get((size, tile_size))
+        if sprites is None:
+            sprites = cls._cache[(size, tile_size)] = cls(size, tile_size)
+        return sprites
+
+class TextCache:
+    """Rendered text surfaces, re-rendered only when the text (or font/color) changes"""
+
+    def __init__(self, limit=512):
+        self.limit = limit
+        self.surfaces = {}
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.limit:
+                # Live counters (nodes explored while solving) would otherwise grow this forever
+                self.surfaces.clear()
+            surface = self.surfaces[key] = font.render(text, True, color)
+        return surface
+
+class DirtyRenderer:
+    """Collects a frame's blits and repaints only the rectangles that changed since the last frame
+
+    Each blit carries a stable key; cached surfaces keep their identity, so
+    an item is dirty when its surface object or position changed, or when it
+    appeared or disappeared. Dirty areas are repainted from the background
+    up with every overlapping item, clipped to the area, and then pushed
+    with pygame.display.update. A frame with nothing dirty draws nothing.
+    """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.items = []
+        self.previous = None
+
+    def blit(self, key, surface, position):
+        rect = surface.get_rect(topleft=position)
+        self.items.append((key, surface, rect))
+        return rect
+
+    def invalidate(self):
+        """Force a full repaint on the next present()"""
+        self.previous = None
+
+    def present(self):
+        """Repaint and push the dirty rectangles; returns them (empty when idle)"""
+        items = self.items
+        self.items = []
+        current = {key: (surface, rect) for key, surface, rect in items}
+        if self.previous is None:
+            dirty = [self.screen.get_rect()]
+        else:
+            dirty = []
+            for key, (surface, rect) in current.items():
+                old = self.previous.get(key)
+                if old is None:
+                    dirty.append(rect)
+                elif old[0] is not surface or old[1] != rect:
+                    dirty.append(rect.union(old[1]))
+            for key, (surface, rect) in self.previous.items():
+                if key not in current:
+                    dirty.append(rect)
+        self.previous = current
+        if not dirty:
+            return dirty
+
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.screen.fill(self.background, area)
+            for _, surface, rect in items:
+                if rect.colliderect(area):
+                    self.screen.blit(surface, rect)
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        return dirty
+
 class UltimateNPuzzle:
     """Ultimate N-Puzzle game supporting multiple sizes"""
 
@@ -427,16 +221,29 @@ class UltimateNPuzzle:
 
         # AI components
         self.ai_engine = AdvancedAIEngine()
+        self.solution_cache = SolutionCache()
+        self.served_from_cache = False
         self.current_algorithm = SearchAlgorithm.A_STAR_MANHATTAN
         self.solution_path = []
         self.solution_index = 0
+        self.plan_origin = None
+        self.solution_bound = None
         self.solving = False
+        self.solver_job = None
+        self.solve_progress = None
+        self.solver_message = None
         self.auto_solve = False
+        self.saved_index = 0
 
         # Statistics
         self.best_scores = {}
         self.solve_statistics = []
 
+        # Rendering caches
+        self.renderer = DirtyRenderer(self.screen, COLORS['background'])
+        self.text_cache = TextCache()
+        self.progress_bars = {}
+
         # UI elements
         self.create_buttons()
 
@@ -485,14 +292,22 @@ class UltimateNPuzzle:
             'solve_astar_m': Button(button_x, start_y + 300, button_width, button_height, "Solve (A* Manhattan)", self.font_small),
             'solve_astar_lc': Button(button_x, start_y + 330, button_width, button_height, "Solve (A* Linear)", self.font_small),
             'solve_ida': Button(button_x, start_y + 360, button_width, button_height, "Solve (IDA*)", self.font_small),
-
-            'auto_solve': Button(button_x, start_y + 400, button_width, button_height, "Auto Solve", self.font_small),
-            'next_move': Button(button_x, start_y + 430, button_width, button_height, "Next Move", self.font_small),
-            'analyze': Button(button_x, start_y + 460, button_width, button_height, "Analyze Puzzle", self.font_small),
+            'solve_pdb': Button(button_x, start_y + 390, button_width, button_height, "Solve (IDA* PDB)", self.font_small),
+            'solve_parallel': Button(button_x, start_y + 420, button_width, button_height, "Solve (Parallel IDA*)", self.font_small),
+            'solve_bidir': Button(button_x, start_y + 450, button_width, button_height, "Solve (Bidirectional)", self.font_small),
+            'solve_bounded': Button(button_x, start_y + 480, button_width, button_height, "Solve (Bounded A*)", self.font_small),
+            'solve_weighted': Button(button_x, start_y + 510, button_width, button_height, "Solve (Weighted A*)", self.font_small),
+            'solve_anytime': Button(button_x, start_y + 540, button_width, button_height, "Solve (Anytime)", self.font_small),
+            'solve_realtime': Button(button_x, start_y + 570, button_width, button_height, "Solve (Real-Time)", self.font_small),
+
+            'auto_solve': Button(button_x, start_y + 610, button_width, button_height, "Auto Solve", self.font_small),
+            'next_move': Button(button_x, start_y + 640, button_width, button_height, "Next Move", self.font_small),
+            'analyze': Button(button_x, start_y + 670, button_width, button_height, "Analyze Puzzle", self.font_small),
         }
 
     def reset_puzzle(self):
         """Reset puzzle to solved state"""
+        self.cancel_solve()
         self.board = []
         num = 1
         for i in range(self.size):
@@ -509,27 +324,27 @@ class UltimateNPuzzle:
         self.moves = 0
         self.game_won = False
         self.solution_path = []
+        self.solution_index = 0
         self.start_time = time.time()
         self.calculate_board_position()
 
     def shuffle_puzzle(self):
         """Shuffle the puzzle based on difficulty"""
-        shuffle_moves = self.difficulty.value[0]
-        for _ in range(shuffle_moves):
-            possible_moves = self.get_possible_moves()
-            if possible_moves:
-                row, col = random.choice(possible_moves)
-                self.move_tile(row, col, count_move=False)
-
-        # Ensure puzzle is solvable
-        state = NPuzzleState(self.board, self.size)
-        if not state.is_solvable():
-            # Make one more move to fix solvability
-            possible_moves = self.get_possible_moves()
-            if possible_moves:
-                row, col = possible_moves[0]
-                self.move_tile(row, col, count_move=False)
+        self.cancel_solve()
+        distance = self.difficulty.value[0]
+        if self.difficulty == DifficultyLevel.EXPERT:
+            self.board = random_solvable_board(self.size)
+        elif self.size in EXACT_DEPTH_SIZES:
+            # Exact optimal distance, capped at the farthest reachable board
+            distance = min(distance, len(depth_layers(self.size)) - 1)
+            self.board = random_board_at_distance(self.size, distance)
+        else:
+            self.board = random_walk_board(self.size, distance)
 
+        state = NPuzzleState(self.board, self.size)
+        self.empty_pos = state.empty_pos
+        self.solution_path = []
+        self.solution_index = 0
         self.moves = 0
         self.start_time = time.time()
 
@@ -573,44 +388,112 @@ class UltimateNPuzzle:
         self.game_won = state.is_goal()
 
     def solve_with_algorithm(self, algorithm):
-        """Solve puzzle using specified algorithm"""
-        if self.solving:
+        """Solve puzzle using specified algorithm, replacing any solve still running"""
+        self.cancel_solve()
+        current_state = NPuzzleState(self.board, self.size)
+        self.current_algorithm = algorithm
+        self.solve_progress = None
+        self.solver_message = None
+        self.plan_origin = current_state
+        self.solution_path = []
+        self.solution_index = 0
+        self.solution_bound = None
+
+        solution = self.solution_cache.lookup(current_state)
+        self.served_from_cache = solution is not None
+        if solution is not None:
+            self.ai_engine = AdvancedAIEngine()
+            self.ai_engine.stats['solution_length'] = len(solution)
+            self.ai_engine.stats['suboptimality_bound'] = 1.0
+            self.finish_solve(current_state, algorithm, solution)
             return
 
+        self.solver_job = SolverJob(current_state, algorithm, SOLVER_TIME_LIMIT, SOLVER_MEMORY_LIMIT).start()
+        # The job's engine updates its stats live, so the panel follows the search
+        self.ai_engine = self.solver_job.engine
         self.solving = True
-        current_state = NPuzzleState(self.board, self.size)
 
-        def solve_thread():
-            try:
-                solution = None
-                if algorithm == SearchAlgorithm.BFS:
-                    solution = self.ai_engine.breadth_first_search(current_state)
-                elif algorithm == SearchAlgorithm.A_STAR_MANHATTAN:
-                    solution = self.ai_engine.a_star_search(current_state, NPuzzleState.manhattan_distance)
-                elif algorithm == SearchAlgorithm.A_STAR_LINEAR_CONFLICT:
-                    solution = self.ai_engine.a_star_search(current_state, NPuzzleState.linear_conflict)
-                elif algorithm == SearchAlgorithm.IDA_STAR:
-                    solution = self.ai_engine.ida_star_search(current_state, NPuzzleState.manhattan_distance)
-
-                self.solution_path = solution if solution else []
-                self.solution_index = 0
-                self.current_algorithm = algorithm
-
-                # Store statistics
-                if solution:
-                    stats = self.ai_engine.stats.copy()
-                    stats['algorithm'] = algorithm.value
-                    stats['puzzle_size'] = self.current_size.value[1]
-                    stats['difficulty'] = self.difficulty.value[1]
-                    self.solve_statistics.append(stats)
-
-            except Exception as e:
-                print(f"Solver error: {e}")
-                self.solution_path = []
-            finally:
-                self.solving = False
-
-        threading.Thread(target=solve_thread, daemon=True).start()
+    def cancel_solve(self, reason='cancelled'):
+        """Stop the running solver job, if any; it exits at its next progress check"""
+        if self.solver_job is not None:
+            self.solver_job.cancel(reason)
+            self.solver_job = None
+            self.solver_message = f"Solver {reason}"
+        self.solving = False
+
+    def poll_solver(self):
+        """Pick up progress snapshots and the result of the running solver job"""
+        job = self.solver_job
+        if job is None:
+            return
+        snapshots = job.snapshots()
+        if snapshots:
+            self.solve_progress = snapshots[-1]
+        # Streaming searches: committed moves extend the plan, better solutions replace it
+        for item in job.partial_results():
+            if item[0] == 'move':
+                self.solution_path.append(item[1])
+            elif self.adopt_solution(job.state, item[1]):
+                self.solution_bound = item[2]
+        if not job.done():
+            return
+
+        self.solver_job = None
+        self.solving = False
+        if job.status == 'error':
+            print(f"Solver error: {job.error}")
+            self.solver_message = "Solver error"
+        elif job.status not in ('solved', 'unsolved'):
+            self.solver_message = f"Solver stopped: {job.status}"
+        self.finish_solve(job.state, job.algorithm, job.result)
+
+    def finish_solve(self, state, algorithm, solution):
+        """Adopt a solution for state, unless the board has changed since the solve started"""
+        if not self.adopt_solution(state, solution):
+            return
+        if solution and not self.served_from_cache:
+            # Only shortest paths may be chained from other boards later
+            if algorithm in OPTIMAL_ALGORITHMS or self.ai_engine.stats.get('optimal', False):
+                self.solution_cache.store(state, solution)
+        if solution:
+            self.solution_bound = self.ai_engine.stats.get('suboptimality_bound')
+
+        # Store statistics
+        if solution:
+            stats = self.ai_engine.stats.copy()
+            stats['algorithm'] = algorithm.value
+            stats['puzzle_size'] = self.current_size.value[1]
+            stats['difficulty'] = self.difficulty.value[1]
+            stats['cached'] = self.served_from_cache
+            self.solve_statistics.append(stats)
+
+    def adopt_solution(self, origin, solution):
+        """Switch the plan to a solution from origin, keeping the moves of the plan already played
+
+        Returns False when the board no longer follows from origin. Once moves
+        have been played the new plan continues from the current board's
+        place on the new path (or backs the played moves out first), and is
+        only taken if the current plan is unfinished or longer.
+        """
+        if origin is not self.plan_origin:
+            return False
+        played = self.solution_path[:self.solution_index]
+        current_key = NPuzzleState(self.board, self.size).key
+        if apply_path(origin, played).key != current_key:
+            return False
+        if not solution:
+            return True
+        remaining = solution
+        if played:
+            remaining = solution if current_key == origin.key else invert_path(played) + solution
+            for index, state in enumerate(walk_path(origin, solution)):
+                if state.key == current_key:
+                    remaining = solution[index + 1:]
+            planned = self.solution_path[self.solution_index:]
+            if len(remaining) >= len(planned) and apply_path(origin, self.solution_path).is_goal():
+                return True
+        self.solution_path = played + remaining
+        return True
 
     def execute_next_move(self):
         """Execute the next move in the solution path"""
@@ -620,21 +503,84 @@ class UltimateNPuzzle:
         move = self.solution_path[self.solution_index]
         empty_row, empty_col = self.empty_pos
 
-        # Convert move direction to tile position
+        # Moves are named after the way the blank goes, so the tile comes from that side
         move_map = {
-            'UP': (empty_row + 1, empty_col),
-            'DOWN': (empty_row - 1, empty_col),
-            'LEFT': (empty_row, empty_col + 1),
-            'RIGHT': (empty_row, empty_col - 1)
+            'UP': (empty_row - 1, empty_col),
+            'DOWN': (empty_row + 1, empty_col),
+            'LEFT': (empty_row, empty_col - 1),
+            'RIGHT': (empty_row, empty_col + 1)
         }
 
         if move in move_map:
             tile_pos = move_map[move]
-            if self.move_tile(tile_pos[0], tile_pos[1]):
+            if (0 <= tile_pos[0] < self.size and 0 <= tile_pos[1] < self.size
+                    and self.move_tile(tile_pos[0], tile_pos[1])):
                 self.solution_index += 1
                 return True
         return False
 
+    def save_solution(self):
+        """Append the current plan and the board it starts from to the solutions file"""
+        origin = self.plan_origin
+        if origin is None or not self.solution_path or not apply_path(origin, self.solution_path).is_goal():
+            self.solver_message = "No solution to save"
+            return False
+        try:
+            write_solutions(SOLUTIONS_FILE, [(origin, self.solution_path)], append=True)
+        except OSError as error:
+            print(f"Could not save solution: {error}")
+            self.solver_message = "Could not save solution"
+            return False
+        self.solver_message = f"Saved solution ({len(self.solution_path)} moves)"
+        return True
+
+    def load_saved_solution(self):
+        """Auto-play a saved solution without searching
+
+        Uses the current board's solution when the file has one, otherwise
+        sets up the next saved board of this size. Every solution is replayed
+        on its board before it is played.
+        """
+        try:
+            records = load_solutions(SOLUTIONS_FILE)
+        except (OSError, ValueError) as error:
+            print(f"Could not load solutions: {error}")
+            self.solver_message = "No saved solutions"
+            return False
+
+        state = NPuzzleState(self.board, self.size)
+        solution = find_solution(records, state)
+        if solution is None:
+            candidates = [record for record in records if record[0] == self.size]
+            for offset in range(len(candidates)):
+                size, tiles, moves = candidates[(self.saved_index + offset) % len(candidates)]
+                board = [tiles[i * size:(i + 1) * size] for i in range(size)]
+                solution = find_solution([(size, tiles, moves)], NPuzzleState(board, size))
+                if solution is not None:
+                    self.saved_index += offset + 1
+                    break
+            if solution is None:
+                self.solver_message = f"No saved solutions for the {self.current_size.value[1]}"
+                return False
+            self.cancel_solve()
+            self.board = board
+            state = NPuzzleState(self.board, self.size)
+            self.empty_pos = state.empty_pos
+            self.moves = 0
+            self.game_won = False
+            self.start_time = time.time()
+
+        self.cancel_solve()
+        self.plan_origin = state
+        self.solution_path = list(solution)
+        self.solution_index = 0
+        self.solution_bound = None
+        self.served_from_cache = False
+        self.solver_message = f"Playing saved solution ({len(solution)} moves)"
+        self.auto_solve = True
+        self.buttons['auto_solve'].text = "Stop Auto"
+        return True
+
     def analyze_puzzle(self):
         """Analyze current puzzle state"""
         state = NPuzzleState(self.board, self.size)
@@ -653,52 +599,35 @@ class UltimateNPuzzle:
 
     def draw_board(self):
         """Draw the puzzle board"""
+        sprites = TileSprites.get(self.size, self.tile_size)
         for row in range(self.size):
             for col in range(self.size):
                 x = self.board_x + col * (self.tile_size + TILE_MARGIN)
                 y = self.board_y + row * (self.tile_size + TILE_MARGIN)
 
-                if self.board[row][col] == 0:
-                    # Empty space
-                    pygame.draw.rect(self.screen, COLORS['empty_space'], 
-                                   pygame.Rect(x, y, self.tile_size, self.tile_size), border_radius=5)
-                    pygame.draw.rect(self.screen, COLORS['border'], 
-                                   pygame.Rect(x, y, self.tile_size, self.tile_size), 2, border_radius=5)
+                number = self.board[row][col]
+                if number == 0:
+                    sprite = sprites.empty
+                elif number == row * self.size + col + 1:
+                    sprite = sprites.correct[number]
                 else:
-                    # Tile
-                    number = self.board[row][col]
-                    target_row, target_col = (number - 1) // self.size, (number - 1) % self.size
-
-                    if row == target_row and col == target_col:
-                        color = COLORS['tile_correct']
-                    else:
-                        color = COLORS['tile_normal']
-
-                    pygame.draw.rect(self.screen, color, 
-                                   pygame.Rect(x, y, self.tile_size, self.tile_size), border_radius=5)
-                    pygame.draw.rect(self.screen, COLORS['border'], 
-                                   pygame.Rect(x, y, self.tile_size, self.tile_size), 2, border_radius=5)
-
-                    # Draw number
-                    font_size = min(self.tile_size // 3, 24)
-                    font = pygame.font.Font(None, font_size)
-                    text = font.render(str(number), True, COLORS['text_primary'])
-                    text_rect = text.get_rect(center=(x + self.tile_size // 2, y + self.tile_size // 2))
-                    self.screen.blit(text, text_rect)
+                    sprite = sprites.normal[number]
+                self.renderer.blit(('tile', row, col), sprite, (x, y))
+
+    def draw_text(self, key, font, text, color, position):
+        """Queue one cached line of text"""
+        return self.renderer.blit(key, self.text_cache.render(font, text, color), position)
 
     def draw_ui(self):
         """Draw the user interface"""
         # Title
-        title = self.font_title.render("Ultimate N-Puzzle", True, COLORS['text_primary'])
-        self.screen.blit(title, (20, 20))
-
-        subtitle = self.font_medium.render("World's Most Advanced Puzzle Game", True, COLORS['text_secondary'])
-        self.screen.blit(subtitle, (20, 65))
+        self.draw_text('title', self.font_title, "Ultimate N-Puzzle", COLORS['text_primary'], (20, 20))
+        self.draw_text('subtitle', self.font_medium, "World's Most Advanced Puzzle Game",
+                       COLORS['text_secondary'], (20, 65))
 
         # Current puzzle info
         puzzle_info = f"{self.current_size.value[1]} - {self.difficulty.value[1]} Difficulty"
-        info_text = self.font_medium.render(puzzle_info, True, self.difficulty.value[2])
-        self.screen.blit(info_text, (20, 100))
+        self.draw_text('info', self.font_medium, puzzle_info, self.difficulty.value[2], (20, 100))
 
         # Game statistics
         stats_y = 130
@@ -709,14 +638,14 @@ class UltimateNPuzzle:
         ]
 
         for i, text in enumerate(game_stats):
-            surface = self.font_medium.render(text, True, COLORS['text_secondary'])
-            self.screen.blit(surface, (20, stats_y + i * 25))
+            self.draw_text(('game_stats', i), self.font_medium, text, COLORS['text_secondary'],
+                           (20, stats_y + i * 25))
 
         # AI Analysis
         if hasattr(self, 'current_analysis'):
             analysis_y = 650
-            analysis_title = self.font_medium.render("Puzzle Analysis:", True, COLORS['text_primary'])
-            self.screen.blit(analysis_title, (20, analysis_y))
+            self.draw_text('analysis_title', self.font_medium, "Puzzle Analysis:", COLORS['text_primary'],
+                           (20, analysis_y))
 
             analysis_items = [
                 f"Solvable: {'Yes' if self.current_analysis['solvable'] else 'No'}",
@@ -726,14 +655,14 @@ class UltimateNPuzzle:
             ]
 
             for i, text in enumerate(analysis_items):
-                surface = self.font_small.render(text, True, COLORS['text_secondary'])
-                self.screen.blit(surface, (20, analysis_y + 25 + i * 20))
+                self.draw_text(('analysis', i), self.font_small, text, COLORS['text_secondary'],
+                               (20, analysis_y + 25 + i * 20))
 
         # AI Statistics
-        if hasattr(self.ai_engine, 'stats') and self.ai_engine.stats['nodes_explored'] > 0:
+        if self.ai_engine.stats['nodes_explored'] > 0 or self.served_from_cache:
             ai_stats_y = 350
-            ai_title = self.font_medium.render("AI Search Statistics:", True, COLORS['text_primary'])
-            self.screen.blit(ai_title, (20, ai_stats_y))
+            self.draw_text('ai_title', self.font_medium, "AI Search Statistics:", COLORS['text_primary'],
+                           (20, ai_stats_y))
 
             ai_stats = [
                 f"Algorithm: {self.current_algorithm.value}",
@@ -741,41 +670,51 @@ class UltimateNPuzzle:
                 f"Max Depth: {self.ai_engine.stats['max_depth']}",
                 f"Time: {self.ai_engine.stats['time_elapsed']:.3f}s",
                 f"Solution Length: {self.ai_engine.stats['solution_length']}",
-                f"Nodes/Second: {int(self.ai_engine.stats['nodes_explored'] / max(self.ai_engine.stats['time_elapsed'], 0.001)):,}"
+                f"Nodes/Second: {int(self.ai_engine.stats['nodes_explored'] / max(self.ai_engine.stats['time_elapsed'], 0.001)):,}",
+                f"Bound: within {self.solution_bound:.2f}x of optimal" if self.solution_bound else "Bound: -",
+                f"Cache: {self.solution_cache.stats['hits']} hits / {self.solution_cache.stats['misses']} misses"
+                + (" (served from cache)" if self.served_from_cache else "")
             ]
 
             for i, text in enumerate(ai_stats):
-                surface = self.font_small.render(text, True, COLORS['text_secondary'])
-                self.screen.blit(surface, (20, ai_stats_y + 25 + i * 20))
+                self.draw_text(('ai_stats', i), self.font_small, text, COLORS['text_secondary'],
+                               (20, ai_stats_y + 25 + i * 20))
 
         # Solution progress
         if self.solution_path:
             progress_y = 550
             progress_text = f"Solution Progress: {self.solution_index}/{len(self.solution_path)}"
-            surface = self.font_medium.render(progress_text, True, COLORS['solution_path'])
-            self.screen.blit(surface, (20, progress_y))
+            self.draw_text('progress', self.font_medium, progress_text, COLORS['solution_path'], (20, progress_y))
 
             # Progress bar
-            if len(self.solution_path) > 0:
-                bar_width = 200
-                bar_height = 10
-                progress_ratio = self.solution_index / len(self.solution_path)
-
-                pygame.draw.rect(self.screen, COLORS['empty_space'], 
-                               pygame.Rect(20, progress_y + 25, bar_width, bar_height))
-                pygame.draw.rect(self.screen, COLORS['solution_path'], 
-                               pygame.Rect(20, progress_y + 25, int(bar_width * progress_ratio), bar_height))
+            bar_width = 200
+            bar_height = 10
+            filled = int(bar_width * self.solution_index / len(self.solution_path))
+            bar = self.progress_bars.get(filled)
+            if bar is None:
+                bar = self.progress_bars[filled] = pygame.Surface((bar_width, bar_height))
+                bar.fill(COLORS['empty_space'])
+                bar.fill(COLORS['solution_path'], pygame.Rect(0, 0, filled, bar_height))
+            self.renderer.blit('progress_bar', bar, (20, progress_y + 25))
 
         # Solving indicator
         if self.solving:
-            solving_text = self.font_medium.render("AI is thinking...", True, COLORS['ai_move'])
             # Add blinking effect
             if int(time.time() * 2) % 2:
-                self.screen.blit(solving_text, (20, 600))
+                self.draw_text('solving', self.font_medium, "AI is thinking... (Esc to cancel)", COLORS['ai_move'],
+                               (20, 600))
+            progress = self.solve_progress
+            if progress:
+                bound = progress['bound'] if progress['bound'] is not None else '-'
+                progress_text = (f"{progress['nodes']:,} nodes  bound {bound}  frontier {progress['frontier']:,}  "
+                                 f"{int(progress['nodes_per_sec']):,}/s  {progress['elapsed']:.1f}s")
+                self.draw_text('solve_progress', self.font_small, progress_text, COLORS['text_secondary'], (20, 625))
+        elif self.solver_message:
+            self.draw_text('solving', self.font_medium, self.solver_message, COLORS['ai_move'], (20, 600))
 
         # Draw buttons
-        for button in self.buttons.values():
-            button.draw(self.screen)
+        for name, button in self.buttons.items():
+            self.renderer.blit(('button', name), button.render(), button.rect.topleft)
 
         # Instructions
         instructions = [
@@ -783,20 +722,29 @@ class UltimateNPuzzle:
             "• Click tiles to move them",
             "• Use AI solvers for optimal solutions",
             "• Try different puzzle sizes and difficulties",
-            "• Analyze puzzle complexity with heuristics"
+            "• Analyze puzzle complexity with heuristics",
+            "• S saves the current solution, L replays saved ones"
         ]
 
         instr_y = WINDOW_HEIGHT - 120
         for i, instr in enumerate(instructions):
             color = COLORS['text_primary'] if i == 0 else COLORS['text_secondary']
-            surface = self.font_small.render(instr, True, color)
-            self.screen.blit(surface, (WINDOW_WIDTH - 350, instr_y + i * 18))
+            self.draw_text(('instructions', i), self.font_small, instr, color, (WINDOW_WIDTH - 560, instr_y + i * 18))
 
     def handle_events(self):
         """Handle game events"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # The window contents were lost, repaint everything
+                self.renderer.invalidate()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.cancel_solve()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                self.save_solution()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_l:
+                self.load_saved_solution()
 
             # Handle button clicks
             for name, button in self.buttons.items():
@@ -829,9 +777,27 @@ class UltimateNPuzzle:
                         self.solve_with_algorithm(SearchAlgorithm.A_STAR_LINEAR_CONFLICT)
                     elif name == 'solve_ida':
                         self.solve_with_algorithm(SearchAlgorithm.IDA_STAR)
+                    elif name == 'solve_pdb':
+                        self.solve_with_algorithm(SearchAlgorithm.IDA_STAR_PDB)
+                    elif name == 'solve_parallel':
+                        self.solve_with_algorithm(SearchAlgorithm.PARALLEL_IDA_STAR)
+                    elif name == 'solve_bidir':
+                        self.solve_with_algorithm(SearchAlgorithm.BIDIRECTIONAL_BFS)
+                    elif name == 'solve_bounded':
+                        self.solve_with_algorithm(SearchAlgorithm.MEMORY_BOUNDED_A_STAR)
+                    elif name == 'solve_weighted':
+                        self.solve_with_algorithm(SearchAlgorithm.WEIGHTED_A_STAR)
+                    elif name == 'solve_anytime':
+                        self.solve_with_algorithm(SearchAlgorithm.ANYTIME_ARA_STAR)
+                    elif name == 'solve_realtime':
+                        self.solve_with_algorithm(SearchAlgorithm.REAL_TIME_LRTA_STAR)
                     elif name == 'auto_solve':
                         self.auto_solve = not self.auto_solve
                         button.text = "Stop Auto" if self.auto_solve else "Auto Solve"
+                        # Nothing left to play: start moving at once and let the anytime search refine the plan
+                        if (self.auto_solve and not self.solving and self.solution_index >= len(self.solution_path)
+                                and not NPuzzleState(self.board, self.size).is_goal()):
+                            self.solve_with_algorithm(SearchAlgorithm.ANYTIME_ARA_STAR)
                     elif name == 'next_move':
                         self.execute_next_move()
                     elif name == 'analyze':
@@ -859,6 +825,7 @@ class UltimateNPuzzle:
 
     def update(self):
         """Update game state"""
+        self.poll_solver()
         if self.auto_solve and self.solution_path and self.solution_index < len(self.solution_path):
             current_time = pygame.time.get_ticks()
             if not hasattr(self, 'last_auto_move') or current_time - self.last_auto_move > 300:
@@ -873,14 +840,11 @@ class UltimateNPuzzle:
             running = self.handle_events()
             self.update()
 
-            # Clear screen
-            self.screen.fill(COLORS['background'])
-
-            # Draw game elements
+            # Queue game elements; only what changed since last frame is repainted
             self.draw_board()
             self.draw_ui()
+            self.renderer.present()
 
-            pygame.display.flip()
             self.clock.tick(60)
 
         pygame.quit()
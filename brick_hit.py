@@ -1,90 +1,38 @@
 
+import argparse
 import pygame
 import random
 import math
 import time
 import json
-from enum import Enum
-from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
+from brickbreaker import (WORLD_WIDTH, WORLD_HEIGHT, FIXED_DT, Colors, PowerUpType, GameState,
+                          Controls, Ball, Paddle, Brick, Simulation)
+from brickbreaker.particles import PALETTE, ParticlePool
+from brickbreaker.profiler import FULL_HISTORY, PHASES, FrameProfiler
+from brickbreaker.replay import InputRecorder, Replay
+
 # Initialize Pygame
 pygame.init()
 
 # Constants
-WINDOW_WIDTH = 1200
-WINDOW_HEIGHT = 800
+WINDOW_WIDTH = WORLD_WIDTH
+WINDOW_HEIGHT = WORLD_HEIGHT
 FPS = 120
-
-# Modern Color Palette
-class Colors:
-    # Background gradients
-    BG_PRIMARY = (12, 15, 25)
-    BG_SECONDARY = (18, 22, 35)
-    BG_ACCENT = (25, 30, 45)
-
-    # UI Elements
-    UI_PRIMARY = (255, 255, 255)
-    UI_SECONDARY = (180, 190, 210)
-    UI_ACCENT = (120, 140, 180)
-    UI_MUTED = (80, 90, 110)
-
-    # Game Elements
-    PADDLE_PRIMARY = (64, 123, 255)
-    PADDLE_GLOW = (100, 150, 255)
-    BALL_PRIMARY = (255, 255, 255)
-    BALL_TRAIL = (180, 200, 255)
-
-    # Brick Colors (Modern flat design)
-    BRICK_TIER_1 = (46, 204, 113)    # Emerald
-    BRICK_TIER_2 = (52, 152, 219)    # Peter River
-    BRICK_TIER_3 = (155, 89, 182)    # Amethyst
-    BRICK_TIER_4 = (241, 196, 15)    # Sun Flower
-    BRICK_TIER_5 = (231, 76, 60)     # Alizarin
-    BRICK_SPECIAL = (230, 126, 34)   # Carrot
-
-    # Power-ups
-    POWERUP_SPEED = (231, 76, 60)
-    POWERUP_MULTI = (46, 204, 113)
-    POWERUP_PADDLE = (52, 152, 219)
-    POWERUP_LASER = (241, 196, 15)
-    POWERUP_SHIELD = (155, 89, 182)
-    POWERUP_LIFE = (26, 188, 156)
-
-    # Status colors
-    SUCCESS = (46, 204, 113)
-    WARNING = (241, 196, 15)
-    DANGER = (231, 76, 60)
-    INFO = (52, 152, 219)
-
-@dataclass
-class GameSettings:
-    """Game configuration settings"""
-    paddle_speed: float = 600.0
-    ball_speed: float = 400.0
-    brick_rows: int = 8
-    brick_cols: int = 12
-    powerup_chance: float = 0.2
-    lives: int = 3
-    enable_particles: bool = True
-    enable_sounds: bool = True
-    enable_screen_shake: bool = True
-
-class PowerUpType(Enum):
-    SPEED_BOOST = ("Speed Boost", "⚡", Colors.POWERUP_SPEED)
-    MULTI_BALL = ("Multi Ball", "●", Colors.POWERUP_MULTI)
-    WIDE_PADDLE = ("Wide Paddle", "━", Colors.POWERUP_PADDLE)
-    LASER_PADDLE = ("Laser Paddle", "▲", Colors.POWERUP_LASER)
-    SHIELD = ("Shield", "◐", Colors.POWERUP_SHIELD)
-    EXTRA_LIFE = ("Extra Life", "♥", Colors.POWERUP_LIFE)
-
-class GameState(Enum):
-    MENU = "menu"
-    PLAYING = "playing"
-    PAUSED = "paused"
-    GAME_OVER = "game_over"
-    LEVEL_COMPLETE = "level_complete"
-    SETTINGS = "settings"
+MAX_PARTICLES = 4096
+
+# Overlay colour of each profiled phase
+PHASE_COLORS = {
+    'events': Colors.UI_MUTED,
+    'sim': Colors.INFO,
+    'collisions': Colors.BRICK_TIER_3,
+    'particles': Colors.WARNING,
+    'animation': Colors.SUCCESS,
+    'draw': Colors.PADDLE_GLOW,
+    'overlay': Colors.UI_ACCENT,
+    'present': Colors.DANGER,
+}
 
 class UIElement:
     """Base class for UI elements with animations"""
@@ -187,71 +135,137 @@ class ModernButton(UIElement):
         text_rect = text_surface.get_rect(center=rect.center)
         screen.blit(text_surface, text_rect)
 
-class Particle:
-    """Advanced particle system with multiple types"""
-
-    def __init__(self, x: float, y: float, particle_type: str = "default"):
-        self.x = x
-        self.y = y
-        self.particle_type = particle_type
-        self.life = 1.0
-        self.max_life = 1.0
-
-        if particle_type == "explosion":
-            self.vx = random.uniform(-300, 300)
-            self.vy = random.uniform(-400, -100)
-            self.size = random.uniform(3, 8)
-            self.color = random.choice([Colors.BRICK_TIER_1, Colors.BRICK_TIER_2, Colors.BRICK_TIER_3])
-            self.max_life = 1.5
-        elif particle_type == "trail":
-            self.vx = random.uniform(-50, 50)
-            self.vy = random.uniform(-100, 100)
-            self.size = random.uniform(1, 3)
-            self.color = Colors.BALL_TRAIL
-            self.max_life = 0.5
-        elif particle_type == "sparkle":
-            self.vx = random.uniform(-100, 100)
-            self.vy = random.uniform(-200, -50)
-            self.size = random.uniform(2, 5)
-            self.color = Colors.UI_PRIMARY
-            self.max_life = 1.0
-
-        self.life = self.max_life
-
-    def update(self, dt: float):
-        """Update particle"""
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vy += 500 * dt  # Gravity
-        self.life -= dt
-
-        # Fade and shrink
-        life_ratio = self.life / self.max_life
-        self.alpha = int(255 * life_ratio)
-        self.current_size = self.size * life_ratio
-
-    def draw(self, screen: pygame.Surface):
-        """Draw particle"""
-        if self.life > 0 and self.current_size > 0:
-            color = (*self.color, max(0, min(255, self.alpha)))
-            pygame.draw.circle(screen, color[:3], (int(self.x), int(self.y)), 
-                             max(1, int(self.current_size)))
-
-    def is_alive(self) -> bool:
-        return self.life > 0
+class RenderAssets:
+    """Pre-rendered surfaces, built on first use and reused every frame
+
+    Holds the background gradient per window size, ball glows per whole
+    pixel of radius, brick sprites per colour, flash level and scale step,
+    power-up capsules per kind, and health digits. Clearing `cached` rebuilds every surface on every
+    request, which is what drawing cost before the cache and what
+    benchmark_rendering() compares against.
+    """
+
+    FLASH_LEVELS = 8
+    SCALE_STEPS = 20
+
+    def __init__(self, cached: bool = True):
+        self.cached = cached
+        self.surfaces = {}
+        self.font = None
+
+    def get(self, key: tuple, build) -> pygame.Surface:
+        if not self.cached:
+            return build()
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = build()
+        return surface
+
+    def background(self, size: Tuple[int, int]) -> pygame.Surface:
+        """Vertical gradient from BG_PRIMARY to BG_SECONDARY"""
+        def build():
+            width, height = size
+            surface = pygame.Surface(size)
+            for y in range(height):
+                ratio = y / height
+                color = tuple(int(top + (bottom - top) * ratio)
+                              for top, bottom in zip(Colors.BG_PRIMARY, Colors.BG_SECONDARY))
+                pygame.draw.line(surface, color, (0, y), (width, y))
+            return surface
+        return self.get(('background', size), build)
+
+    def glow(self, radius: int) -> pygame.Surface:
+        """Faint disc behind the ball"""
+        def build():
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (*Colors.BALL_PRIMARY, 20), (radius, radius), radius)
+            return surface
+        return self.get(('glow', radius), build)
+
+    def small_font(self) -> pygame.font.Font:
+        font = self.font if self.cached else None
+        if font is None:
+            font = pygame.font.Font(None, 16)
+            if self.cached:
+                self.font = font
+        return font
+
+    def digit(self, number: int) -> pygame.Surface:
+        """Health count drawn on bricks"""
+        return self.get(('digit', number), lambda: self.small_font().render(str(number), True, Colors.UI_PRIMARY))
+
+    def powerup(self, kind: PowerUpType, width: int, height: int) -> pygame.Surface:
+        """Falling capsule in the power-up's colour, labelled with the initials of its name"""
+        def build():
+            name, _, color = kind.value
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            rect = surface.get_rect()
+            pygame.draw.rect(surface, color, rect, border_radius=height // 2)
+            border_color = tuple(min(255, int(c * 1.3)) for c in color)
+            pygame.draw.rect(surface, border_color, rect, 1, border_radius=height // 2)
+            label = self.small_font().render(''.join(word[0] for word in name.split()), True, Colors.BG_PRIMARY)
+            surface.blit(label, label.get_rect(center=rect.center))
+            return surface
+        return self.get(('powerup', kind, width, height), build)
+
+    def brick(self, color: Tuple[int, int, int], flash: int, scale: int,
+              width: float, height: float) -> pygame.Surface:
+        """Brick with its shadow, flashed by flash / FLASH_LEVELS and scaled by scale / SCALE_STEPS"""
+        def build():
+            ratio = scale / self.SCALE_STEPS
+            rect = pygame.Rect(0, 0, width * ratio, height * ratio)
+            surface = pygame.Surface((rect.width + 2, rect.height + 2), pygame.SRCALPHA)
+            base_color = color
+            if flash:
+                intensity = flash / self.FLASH_LEVELS
+                base_color = tuple(min(255, int(c + (255 - c) * intensity)) for c in color)
+            if ratio > 0.5:
+                pygame.draw.rect(surface, Colors.BG_PRIMARY, rect.move(2, 2), border_radius=6)
+            pygame.draw.rect(surface, base_color, rect, border_radius=6)
+            border_color = tuple(min(255, int(c * 1.2)) for c in base_color)
+            pygame.draw.rect(surface, border_color, rect, 1, border_radius=6)
+            return surface
+        return self.get(('brick', color, flash, scale, width, height), build)
+
+ASSETS = RenderAssets()
+
+class ParticleRenderer:
+    """Draws a ParticlePool with one blits() call, from circle sprites cached per colour and radius"""
 
-class ModernBrick:
+    def __init__(self):
+        self.sprites = {}
+
+    def sprite(self, color: int, radius: int) -> pygame.Surface:
+        key = (color, radius)
+        surface = self.sprites.get(key)
+        if surface is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, PALETTE[color], (radius, radius), radius)
+            self.sprites[key] = surface
+        return surface
+
+    def draw(self, screen: pygame.Surface, pool: ParticlePool):
+        """Draw every live particle, shrunk by the life it has left"""
+        n = pool.count
+        if not n:
+            return
+        radii = pool.current_size().astype(int).clip(1, None)
+        xs = pool.x[:n].astype(int) - radii
+        ys = pool.y[:n].astype(int) - radii
+        sprite = self.sprite
+        screen.blits([(sprite(color, radius), (x, y))
+                      for color, radius, x, y in zip(pool.color[:n].tolist(), radii.tolist(),
+                                                     xs.tolist(), ys.tolist())], doreturn=False)
+
+class ModernBrick(Brick):
     """Modern brick with clean design and animations"""
 
+    # Shake directions only; reseeded per game so that replays look the same too
+    fx_rng = random.Random()
+
     def __init__(self, x: float, y: float, width: float, height: float, tier: int):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.tier = tier
-        self.max_health = tier
-        self.health = tier
-        self.destroyed = False
+        super().__init__(x, y, width, height, tier)
+        self.rect = pygame.Rect(x, y, width, height)
 
         # Animation properties
         self.scale = 1.0
@@ -272,21 +286,19 @@ class ModernBrick:
 
     def hit(self) -> bool:
         """Handle brick being hit"""
-        self.health -= 1
         self.hit_flash = 0.3
         self.target_scale = 1.1
 
         # Shake effect
-        self.shake_x = random.uniform(-3, 3)
-        self.shake_y = random.uniform(-3, 3)
+        self.shake_x = self.fx_rng.uniform(-3, 3)
+        self.shake_y = self.fx_rng.uniform(-3, 3)
 
-        if self.health <= 0:
-            self.destroyed = True
+        if super().hit():
             self.target_scale = 0.0
             return True
         return False
 
-    def update(self, dt: float):
+    def animate(self, dt: float):
         """Update brick animations"""
         # Scale animation
         self.scale += (self.target_scale - self.scale) * dt * 8
@@ -310,70 +322,49 @@ class ModernBrick:
         if self.alpha <= 0:
             return
 
-        # Calculate position with shake
-        draw_x = self.x + self.shake_x
-        draw_y = self.y + self.shake_y
-
-        # Scale rectangle
-        scaled_width = self.width * self.scale
-        scaled_height = self.height * self.scale
-        offset_x = (self.width - scaled_width) / 2
-        offset_y = (self.height - scaled_height) / 2
-
-        rect = pygame.Rect(draw_x + offset_x, draw_y + offset_y, scaled_width, scaled_height)
-
-        # Get base color
-        base_color = self.colors.get(self.health, Colors.BRICK_TIER_1)
-
-        # Apply hit flash
-        if self.hit_flash > 0:
-            flash_intensity = self.hit_flash / 0.3
-            base_color = tuple(min(255, int(c + (255 - c) * flash_intensity)) for c in base_color)
-
-        # Apply alpha
-        if self.alpha < 255:
-            base_color = (*base_color, int(self.alpha))
-
-        # Draw shadow
-        if self.scale > 0.5:
-            shadow_rect = pygame.Rect(rect.x + 2, rect.y + 2, rect.width, rect.height)
-            pygame.draw.rect(screen, (*Colors.BG_PRIMARY, 50), shadow_rect, border_radius=6)
-
-        # Draw brick
-        pygame.draw.rect(screen, base_color[:3], rect, border_radius=6)
+        scale = round(self.scale * RenderAssets.SCALE_STEPS)
+        if scale <= 0:
+            return
+        flash = math.ceil(max(0.0, self.hit_flash) / 0.3 * RenderAssets.FLASH_LEVELS)
+        sprite = ASSETS.brick(self.colors.get(self.health, Colors.BRICK_TIER_1),
+                              min(flash, RenderAssets.FLASH_LEVELS), scale, self.width, self.height)
 
-        # Draw subtle border
-        border_color = tuple(min(255, int(c * 1.2)) for c in base_color[:3])
-        pygame.draw.rect(screen, border_color, rect, 1, border_radius=6)
+        # Centre the scaled brick on its slot, moved by the shake
+        width = self.width * scale / RenderAssets.SCALE_STEPS
+        height = self.height * scale / RenderAssets.SCALE_STEPS
+        rect = pygame.Rect(self.x + self.shake_x + (self.width - width) / 2,
+                           self.y + self.shake_y + (self.height - height) / 2, width, height)
+        screen.blit(sprite, rect.topleft)
 
         # Draw health indicator
         if self.health > 1:
-            font = pygame.font.Font(None, 16)
-            health_text = font.render(str(self.health), True, Colors.UI_PRIMARY)
-            text_rect = health_text.get_rect(center=rect.center)
-            screen.blit(health_text, text_rect)
+            health_text = ASSETS.digit(self.health)
+            screen.blit(health_text, health_text.get_rect(center=rect.center))
 
     def get_rect(self) -> pygame.Rect:
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        return self.rect
 
-class ModernBall:
+class ModernBall(Ball):
     """Modern ball with trail effects and smooth physics"""
 
-    def __init__(self, x: float, y: float, radius: float = 10):
-        self.x = x
-        self.y = y
-        self.radius = radius
-        self.vx = random.choice([-300, 300])
-        self.vy = -400
-        self.active = True
+    __slots__ = ('trail_points', 'glow_size', 'pulse_timer')
+
+    def __init__(self, radius: float = 10):
+        super().__init__(radius)
 
         # Visual effects
         self.trail_points = []
         self.glow_size = radius * 2
         self.pulse_timer = 0
 
-    def update(self, dt: float):
-        """Update ball physics and effects"""
+    def launch(self, x: float, y: float, vx: float, vy: float):
+        """Start a pooled ball afresh, without the trail of its last life"""
+        super().launch(x, y, vx, vy)
+        self.trail_points.clear()
+        self.pulse_timer = 0
+
+    def animate(self, dt: float):
+        """Update the trail and pulse effects"""
         if not self.active:
             return
 
@@ -382,26 +373,6 @@ class ModernBall:
         if len(self.trail_points) > 15:
             self.trail_points.pop(0)
 
-        # Move ball
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-
-        # Wall collisions
-        if self.x <= self.radius:
-            self.x = self.radius
-            self.vx = abs(self.vx)
-        elif self.x >= WINDOW_WIDTH - self.radius:
-            self.x = WINDOW_WIDTH - self.radius
-            self.vx = -abs(self.vx)
-
-        if self.y <= self.radius:
-            self.y = self.radius
-            self.vy = abs(self.vy)
-
-        # Check if ball fell off screen
-        if self.y > WINDOW_HEIGHT + 50:
-            self.active = False
-
         # Update pulse effect
         self.pulse_timer += dt * 8
         self.glow_size = self.radius * 2 + math.sin(self.pulse_timer) * 3
@@ -421,10 +392,8 @@ class ModernBall:
                                  (int(trail_x), int(trail_y)), trail_radius)
 
         # Draw glow
-        glow_surface = pygame.Surface((self.glow_size * 2, self.glow_size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (*Colors.BALL_PRIMARY, 20), 
-                          (int(self.glow_size), int(self.glow_size)), int(self.glow_size))
-        screen.blit(glow_surface, (self.x - self.glow_size, self.y - self.glow_size))
+        glow_radius = int(self.glow_size)
+        screen.blit(ASSETS.glow(glow_radius), (self.x - glow_radius, self.y - glow_radius))
 
         # Draw ball
         pygame.draw.circle(screen, Colors.BALL_PRIMARY, (int(self.x), int(self.y)), int(self.radius))
@@ -437,80 +406,21 @@ class ModernBall:
         return pygame.Rect(self.x - self.radius, self.y - self.radius, 
                           self.radius * 2, self.radius * 2)
 
-class ModernPaddle:
+class ModernPaddle(Paddle):
     """Modern paddle with smooth animations and effects"""
 
-    def __init__(self, x: float, y: float):
-        self.x = x
-        self.y = y
-        self.width = 120
-        self.height = 16
-        self.base_width = 120
-        self.speed = 600
+    def __init__(self, x: float, y: float, speed: float = 600):
+        super().__init__(x, y, speed)
 
         # Visual effects
         self.glow_intensity = 1.0
         self.pulse_timer = 0
 
-        # Power-ups
-        self.wide_paddle_timer = 0
-        self.laser_timer = 0
-        self.shield_timer = 0
-        self.lasers = []
-
-    def update(self, dt: float, keys):
-        """Update paddle"""
-        # Handle input
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.x -= self.speed * dt
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.x += self.speed * dt
-
-        # Keep on screen
-        self.x = max(0, min(WINDOW_WIDTH - self.width, self.x))
-
-        # Update power-up timers
-        if self.wide_paddle_timer > 0:
-            self.wide_paddle_timer -= dt
-            self.width = self.base_width * 1.6
-        else:
-            self.width = self.base_width
-
-        if self.laser_timer > 0:
-            self.laser_timer -= dt
-
-        if self.shield_timer > 0:
-            self.shield_timer -= dt
-
-        # Update lasers
-        for laser in self.lasers[:]:
-            laser['y'] -= 800 * dt
-            if laser['y'] < 0:
-                self.lasers.remove(laser)
-
-        # Update visual effects
+    def animate(self, dt: float):
+        """Update visual effects"""
         self.pulse_timer += dt * 6
         self.glow_intensity = 0.8 + 0.2 * math.sin(self.pulse_timer)
 
-    def shoot_laser(self):
-        """Shoot laser if available"""
-        if self.laser_timer > 0:
-            self.lasers.append({
-                'x': self.x + self.width / 2,
-                'y': self.y,
-                'width': 4,
-                'height': 20
-            })
-
-    def apply_powerup(self, powerup_type: PowerUpType):
-        """Apply power-up effect"""
-        if powerup_type == PowerUpType.WIDE_PADDLE:
-            self.wide_paddle_timer = 12.0
-        elif powerup_type == PowerUpType.LASER_PADDLE:
-            self.laser_timer = 15.0
-        elif powerup_type == PowerUpType.SHIELD:
-            self.shield_timer = 20.0
-
     def draw(self, screen: pygame.Surface):
         """Draw paddle with modern design"""
         rect = pygame.Rect(self.x, self.y, self.width, self.height)
@@ -534,12 +444,6 @@ class ModernPaddle:
             pygame.draw.rect(screen, (*Colors.POWERUP_SHIELD, shield_alpha), shield_rect, 
                            3, border_radius=12)
 
-        # Draw lasers
-        for laser in self.lasers:
-            laser_rect = pygame.Rect(laser['x'] - laser['width'] // 2, laser['y'], 
-                                   laser['width'], laser['height'])
-            pygame.draw.rect(screen, Colors.POWERUP_LASER, laser_rect, border_radius=2)
-
     def get_rect(self) -> pygame.Rect:
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
@@ -557,21 +461,40 @@ class UltimateBrickBreaker:
         self.font_medium = pygame.font.Font(None, 32)
         self.font_small = pygame.font.Font(None, 24)
 
-        # Game state
+        # Game state; the simulation owns score, lives, level and every game object
         self.state = GameState.MENU
-        self.score = 0
-        self.lives = 3
-        self.level = 1
         self.high_score = self.load_high_score()
-        self.combo_multiplier = 1.0
-        self.combo_timer = 0
-
-        # Game objects
-        self.paddle = ModernPaddle(WINDOW_WIDTH // 2 - 60, WINDOW_HEIGHT - 80)
-        self.balls = []
-        self.bricks = []
-        self.powerups = []
-        self.particles = []
+        self.sim = Simulation(random.randrange(1 << 32), ball_class=ModernBall, paddle_class=ModernPaddle,
+                              brick_class=ModernBrick)
+        self.sim_accumulator = 0.0
+        self.fire_pressed = False
+        try:
+            self.particles = ParticlePool(MAX_PARTICLES)
+        except RuntimeError as error:
+            print(f"Particles disabled: {error}")
+            self.particles = None
+        self.particle_renderer = ParticleRenderer()
+
+        # Input recording (--record) and playback (--replay)
+        self.record_path = None
+        self.recorder = None
+        self.replay = None
+        self.replay_controls = None
+        self.quit_after_replay = False
+        self.quit_requested = False
+        # Seconds per frame when frames are not paced by the clock (--uncapped)
+        self.fixed_frame_dt = None
+
+        # Opt-in frame profiler (F3 or --profile); without one the loop only checks for None
+        self.profiler = None
+        self.show_profiler = False
+        self.profiler_font = None
+        self.profiler_text = []
+        self.profiler_text_frame = 0
+        self.profiler_panel = None
+        self.profiler_graph = None
+        self.profiler_graphed = 0
+        self.profile_csv = None
 
         # UI elements
         self.buttons = {}
@@ -582,8 +505,33 @@ class UltimateBrickBreaker:
         self.background_particles = []
         self.create_background_particles()
 
-        # Initialize first level
-        self.reset_level()
+    @property
+    def score(self) -> int:
+        return self.sim.score
+
+    @property
+    def lives(self) -> int:
+        return self.sim.lives
+
+    @property
+    def level(self) -> int:
+        return self.sim.level
+
+    @property
+    def combo_multiplier(self) -> float:
+        return self.sim.combo_multiplier
+
+    @property
+    def paddle(self) -> ModernPaddle:
+        return self.sim.paddle
+
+    @property
+    def balls(self) -> List[ModernBall]:
+        return self.sim.balls
+
+    @property
+    def bricks(self) -> List[ModernBrick]:
+        return self.sim.bricks
 
     def create_ui_elements(self):
         """Create modern UI elements"""
@@ -642,119 +590,77 @@ class UltimateBrickBreaker:
         except:
             pass
 
-    def reset_level(self):
-        """Reset level with new layout"""
-        self.balls = [ModernBall(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 150)]
-        self.powerups = []
-        self.particles = []
-        self.combo_multiplier = 1.0
-        self.combo_timer = 0
-
-        self.create_brick_layout()
-
-    def create_brick_layout(self):
-        """Create modern brick layout"""
-        self.bricks = []
-        brick_width = 80
-        brick_height = 25
-        margin = 8
-        start_y = 120
-
-        # Calculate grid
-        total_width = WINDOW_WIDTH - 2 * margin
-        cols = (total_width + margin) // (brick_width + margin)
-        start_x = (WINDOW_WIDTH - (cols * (brick_width + margin) - margin)) // 2
-
-        rows = min(10, 4 + self.level)
-
-        for row in range(rows):
-            for col in range(cols):
-                x = start_x + col * (brick_width + margin)
-                y = start_y + row * (brick_height + margin)
-
-                # Create tier pattern
-                tier = min(5, (row // 2) + 1)
-
-                # Skip some bricks for interesting patterns
-                if random.random() < 0.05 and row > 2:
-                    continue
-
-                brick = ModernBrick(x, y, brick_width, brick_height, tier)
-                self.bricks.append(brick)
-
-    def handle_collisions(self):
-        """Handle all game collisions with modern physics"""
-        for ball in self.balls[:]:
-            if not ball.active:
-                continue
-
-            ball_rect = ball.get_rect()
-
-            # Paddle collision with improved physics
-            if ball_rect.colliderect(self.paddle.get_rect()) and ball.vy > 0:
-                # Calculate hit position for angle variation
-                hit_pos = (ball.x - self.paddle.x) / self.paddle.width
-                hit_pos = max(0, min(1, hit_pos))
-
-                # Convert to angle (-60 to 60 degrees)
-                angle = (hit_pos - 0.5) * 120 * math.pi / 180
-                speed = math.sqrt(ball.vx**2 + ball.vy**2)
-
-                ball.vx = speed * math.sin(angle)
-                ball.vy = -abs(speed * math.cos(angle))
-
-                # Ensure minimum upward velocity
-                if ball.vy > -200:
-                    ball.vy = -200
-
+    def start_game(self, seed: Optional[int] = None):
+        """Start a new game, with a fresh seed unless one is given"""
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.sim = Simulation(seed, ball_class=ModernBall, paddle_class=ModernPaddle, brick_class=ModernBrick)
+        self.sim.profiler = self.profiler
+        self.sim_accumulator = 0.0
+        self.fire_pressed = False
+        ModernBrick.fx_rng.seed(seed)
+        if self.particles is not None:
+            self.particles.clear(seed)
+        self.replay_controls = None
+        self.recorder = InputRecorder(self.sim) if self.record_path else None
+        self.state = GameState.PLAYING
+
+    def start_replay(self, replay: Replay):
+        """Play back a recorded game, ignoring the keyboard until it ends"""
+        self.start_game(replay.seed)
+        self.replay = replay
+        self.replay_controls = replay.controls()
+
+    def finish_replay(self):
+        """Check the replayed game ended in the recorded state"""
+        digest = self.sim.digest()
+        if digest == self.replay.digest:
+            print(f"Replay finished after {self.sim.frame:,} steps; state matches ({digest})")
+        else:
+            print(f"Replay finished after {self.sim.frame:,} steps; STATE DIVERGED "
+                  f"({digest}, recorded {self.replay.digest})")
+        self.replay_controls = None
+        self.state = GameState.GAME_OVER
+        if self.quit_after_replay:
+            self.quit_requested = True
+
+    def save_recording(self):
+        """Write the game recorded so far to record_path"""
+        if self.recorder is None or not self.recorder.replay.runs:
+            return
+        replay = self.recorder.finish()
+        try:
+            replay.save(self.record_path)
+            print(f"Recorded {replay.steps:,} steps (seed {replay.seed}) to {self.record_path}")
+        except OSError as error:
+            print(f"Could not save the recording: {error}")
+
+    def emit_particles(self, kind: str, x: float, y: float, count: int):
+        if self.particles is not None:
+            self.particles.emit(kind, x, y, count)
+
+    def handle_sim_events(self, events: list):
+        """Turn simulation events into particles, screen shake and high scores"""
+        for event in events:
+            kind = event[0]
+            if kind == 'paddle_hit':
                 self.screen_shake = 8
-
-                # Create impact particles
-                for _ in range(8):
-                    particle = Particle(ball.x, ball.y, "sparkle")
-                    self.particles.append(particle)
-
-            # Brick collisions
-            for brick in self.bricks[:]:
-                if brick.destroyed or brick.alpha <= 0:
-                    continue
-
-                if ball_rect.colliderect(brick.get_rect()):
-                    # Improved collision detection
-                    dx = ball.x - (brick.x + brick.width / 2)
-                    dy = ball.y - (brick.y + brick.height / 2)
-
-                    if abs(dx) / brick.width > abs(dy) / brick.height:
-                        ball.vx = -ball.vx
-                    else:
-                        ball.vy = -ball.vy
-
-                    # Hit brick
-                    destroyed = brick.hit()
-
-                    if destroyed:
-                        # Score with combo multiplier
-                        points = brick.tier * 50 * int(self.combo_multiplier)
-                        self.score += points
-
-                        # Update combo
-                        self.combo_multiplier = min(5.0, self.combo_multiplier + 0.2)
-                        self.combo_timer = 3.0
-
-                        # Create destruction particles
-                        for _ in range(15):
-                            particle = Particle(brick.x + brick.width/2, 
-                                               brick.y + brick.height/2, "explosion")
-                            self.particles.append(particle)
-
-                        # Powerup chance
-                        if random.random() < 0.25:
-                            # Create powerup (implementation would go here)
-                            pass
-
-                        self.screen_shake = 6
-
-                    break
+                self.emit_particles("sparkle", event[1], event[2], 8)
+            elif kind == 'brick_destroyed':
+                brick = event[1]
+                self.emit_particles("explosion", brick.x + brick.width/2, brick.y + brick.height/2, 15)
+                self.screen_shake = 6
+            elif kind == 'powerup_collected':
+                self.emit_particles("sparkle", event[2], event[3], 12)
+            elif kind == 'game_over':
+                self.state = GameState.GAME_OVER
+                if self.score > self.high_score:
+                    self.high_score = self.score
+                    self.save_high_score()
+                self.save_recording()
+                self.recorder = None
+                if self.replay_controls is not None:
+                    self.finish_replay()
 
     def update_background_particles(self, dt: float):
         """Update ambient background particles"""
@@ -778,14 +684,7 @@ class UltimateBrickBreaker:
 
     def draw_background(self):
         """Draw modern gradient background"""
-        # Create gradient
-        for y in range(WINDOW_HEIGHT):
-            ratio = y / WINDOW_HEIGHT
-            r = int(Colors.BG_PRIMARY[0] + (Colors.BG_SECONDARY[0] - Colors.BG_PRIMARY[0]) * ratio)
-            g = int(Colors.BG_PRIMARY[1] + (Colors.BG_SECONDARY[1] - Colors.BG_PRIMARY[1]) * ratio)
-            b = int(Colors.BG_PRIMARY[2] + (Colors.BG_SECONDARY[2] - Colors.BG_PRIMARY[2]) * ratio)
-
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WINDOW_WIDTH, y))
+        self.screen.blit(ASSETS.background(self.screen.get_size()), (0, 0))
 
         # Draw background particles
         for particle in self.background_particles:
@@ -859,59 +758,60 @@ class UltimateBrickBreaker:
                 self.buttons[button_name].draw(self.screen)
 
     def update(self, dt: float):
-        """Update game state"""
+        """Advance the simulation in fixed steps covering dt, then run the visual effects"""
         if self.state != GameState.PLAYING:
             return
 
-        # Update combo timer
-        if self.combo_timer > 0:
-            self.combo_timer -= dt
-        else:
-            self.combo_multiplier = max(1.0, self.combo_multiplier - dt * 0.5)
+        profiler = self.profiler
+        if profiler is not None:
+            started = profiler.enter()
+        keys = pygame.key.get_pressed()
+        self.sim_accumulator += dt
+        while self.sim_accumulator >= FIXED_DT and self.state == GameState.PLAYING:
+            self.sim_accumulator -= FIXED_DT
+            if self.replay_controls is not None:
+                controls = next(self.replay_controls, None)
+                if controls is None:
+                    self.finish_replay()
+                    break
+            else:
+                controls = Controls(left=bool(keys[pygame.K_LEFT] or keys[pygame.K_a]),
+                                    right=bool(keys[pygame.K_RIGHT] or keys[pygame.K_d]),
+                                    fire=self.fire_pressed)
+            # A key press fires once, on the first step after it
+            self.fire_pressed = False
+            if self.recorder is not None:
+                self.recorder.record(controls)
+            self.handle_sim_events(self.sim.step(controls))
+            if self.sim.state == GameState.LEVEL_COMPLETE:
+                self.sim.start_level()
+        if profiler is not None:
+            profiler.leave('sim', started)
+            started = profiler.enter()
 
         # Update screen shake
         if self.screen_shake > 0:
             self.screen_shake -= dt * 20
 
-        # Update game objects
-        keys = pygame.key.get_pressed()
-        self.paddle.update(dt, keys)
-
-        for ball in self.balls[:]:
-            ball.update(dt)
-            if not ball.active:
-                self.balls.remove(ball)
-
+        # Animations follow the rendered frame rate
+        self.paddle.animate(dt)
+        for ball in self.balls:
+            ball.animate(dt)
         for brick in self.bricks:
-            brick.update(dt)
-
-        for particle in self.particles[:]:
-            particle.update(dt)
-            if not particle.is_alive():
-                self.particles.remove(particle)
+            brick.animate(dt)
 
         # Update UI elements
         for button in self.buttons.values():
             button.update(dt)
+        if profiler is not None:
+            profiler.leave('animation', started)
 
-        # Handle collisions
-        self.handle_collisions()
-
-        # Check game conditions
-        if not self.balls:
-            self.lives -= 1
-            if self.lives <= 0:
-                self.state = GameState.GAME_OVER
-                if self.score > self.high_score:
-                    self.high_score = self.score
-                    self.save_high_score()
-            else:
-                self.balls = [ModernBall(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 150)]
-
-        # Check level complete
-        if not any(not brick.destroyed for brick in self.bricks):
-            self.level += 1
-            self.state = GameState.LEVEL_COMPLETE
+        if self.particles is not None:
+            if profiler is not None:
+                started = profiler.enter()
+            self.particles.update(dt)
+            if profiler is not None:
+                profiler.leave('particles', started)
 
     def draw(self):
         """Main draw function"""
@@ -926,13 +826,19 @@ class UltimateBrickBreaker:
             for brick in self.bricks:
                 brick.draw(self.screen)
 
+            self.draw_entities()
             self.paddle.draw(self.screen)
 
             for ball in self.balls:
                 ball.draw(self.screen)
 
-            for particle in self.particles:
-                particle.draw(self.screen)
+            if self.particles is not None:
+                profiler = self.profiler
+                if profiler is not None:
+                    started = profiler.enter()
+                self.particle_renderer.draw(self.screen, self.particles)
+                if profiler is not None:
+                    profiler.leave('particles', started)
 
             self.draw_modern_ui()
 
@@ -940,6 +846,7 @@ class UltimateBrickBreaker:
             # Draw game state
             for brick in self.bricks:
                 brick.draw(self.screen)
+            self.draw_entities()
             self.paddle.draw(self.screen)
             for ball in self.balls:
                 ball.draw(self.screen)
@@ -964,6 +871,18 @@ class UltimateBrickBreaker:
             self.buttons['restart'].draw(self.screen)
             self.buttons['menu'].draw(self.screen)
 
+    def draw_entities(self):
+        """Draw the simulation's lasers, falling power-ups and shield"""
+        screen = self.screen
+        for laser in self.sim.lasers:
+            pygame.draw.rect(screen, Colors.POWERUP_LASER,
+                             (laser.x - laser.width // 2, laser.y, laser.width, laser.height), border_radius=2)
+        for powerup in self.sim.powerups:
+            screen.blit(ASSETS.powerup(powerup.kind, powerup.width, powerup.height), (powerup.x, powerup.y))
+        if self.paddle.shield_timer > 0:
+            pygame.draw.line(screen, Colors.POWERUP_SHIELD, (0, WINDOW_HEIGHT - 2),
+                             (WINDOW_WIDTH, WINDOW_HEIGHT - 2), 3)
+
     def handle_events(self):
         """Handle events with modern UI"""
         mouse_pos = pygame.mouse.get_pos()
@@ -976,19 +895,11 @@ class UltimateBrickBreaker:
             for button_name, button in self.buttons.items():
                 if button.handle_event(event, mouse_pos):
                     if button_name == 'play' and self.state == GameState.MENU:
-                        self.state = GameState.PLAYING
-                        self.score = 0
-                        self.lives = 3
-                        self.level = 1
-                        self.reset_level()
+                        self.start_game()
                     elif button_name == 'quit':
                         return False
                     elif button_name == 'restart' and self.state == GameState.GAME_OVER:
-                        self.state = GameState.PLAYING
-                        self.score = 0
-                        self.lives = 3
-                        self.level = 1
-                        self.reset_level()
+                        self.start_game()
                     elif button_name == 'menu':
                         self.state = GameState.MENU
 
@@ -996,12 +907,85 @@ class UltimateBrickBreaker:
             if event.type == pygame.KEYDOWN:
                 if self.state == GameState.PLAYING:
                     if event.key == pygame.K_SPACE:
-                        self.paddle.shoot_laser()
+                        self.fire_pressed = True
                     elif event.key == pygame.K_ESCAPE:
                         self.state = GameState.MENU
+                if event.key == pygame.K_F3:
+                    self.toggle_profiler()
 
         return True
 
+    def enable_profiler(self, memory_every: int = 60, history: int = 0) -> FrameProfiler:
+        """Attach a FrameProfiler to the game loop and the simulation, keeping `history` frames for CSV"""
+        if self.profiler is None:
+            self.profiler = FrameProfiler(memory_every=memory_every, history=history)
+            self.sim.profiler = self.profiler
+        return self.profiler
+
+    def toggle_profiler(self):
+        """Show or hide the frame-time overlay, profiling from the first time it is shown"""
+        self.enable_profiler()
+        self.show_profiler = not self.show_profiler
+
+    def draw_profiler_overlay(self):
+        """Stacked per-phase frame times of recent frames, with rolling percentiles"""
+        profiler = self.profiler
+        graph_width = 240
+        graph_height = 125
+        budget_ms = 1000 / 60
+        # Bottom left, clear of the paddle
+        x0 = 10
+        y0 = WINDOW_HEIGHT - graph_height - 110
+
+        if self.profiler_panel is None:
+            self.profiler_panel = pygame.Surface((graph_width + 330, graph_height + 10), pygame.SRCALPHA)
+            self.profiler_panel.fill((*Colors.BG_PRIMARY, 210))
+            self.profiler_graph = pygame.Surface((graph_width, graph_height), pygame.SRCALPHA)
+        self.screen.blit(self.profiler_panel, (x0 - 5, y0 - 5))
+
+        # One column per frame, phases stacked bottom-up; full height is a 60 FPS frame.
+        # The graph scrolls left by a column per finished frame, so only the newest is drawn.
+        graph = self.profiler_graph
+        scale = graph_height / budget_ms
+        recent = profiler.recent(1)
+        if recent and recent[0]['frame'] != self.profiler_graphed:
+            frame = recent[0]
+            self.profiler_graphed = frame['frame']
+            graph.scroll(-1, 0)
+            column = graph_width - 1
+            graph.fill((0, 0, 0, 0), (column, 0, 1, graph_height))
+            bottom = graph_height
+            for phase in PHASES:
+                height = frame['phases'][phase] / 1e6 * scale
+                if height >= 0.5:
+                    top = max(0, bottom - height)
+                    pygame.draw.line(graph, PHASE_COLORS[phase], (column, bottom), (column, top))
+                    bottom = top
+        self.screen.blit(graph, (x0, y0))
+        for fps in (120, 60):
+            y = y0 + graph_height - 1000 / fps * scale
+            pygame.draw.line(self.screen, Colors.UI_SECONDARY, (x0, y), (x0 + graph_width, y))
+
+        # Percentile text is rebuilt every 60 frames
+        if self.profiler_font is None:
+            self.profiler_font = pygame.font.Font(None, 18)
+        if profiler.count - self.profiler_text_frame >= 60 or not self.profiler_text:
+            self.profiler_text_frame = profiler.count
+            lines = []
+            for name, values in profiler.percentiles().items():
+                if values[99] >= 0.005 or name == 'frame':
+                    color = PHASE_COLORS.get(name, Colors.UI_PRIMARY)
+                    lines.append((f"{name:>10}  p50 {values[50]:6.2f}  p95 {values[95]:6.2f}  "
+                                  f"p99 {values[99]:6.2f} ms", color))
+            memory = profiler.last_memory_frame()
+            if memory is not None:
+                lines.append((f"alloc: {memory['alloc_blocks']} live blocks, "
+                              f"peak {memory['alloc_peak_bytes'] / 1024:.0f} KiB (frame {memory['frame']})",
+                              Colors.UI_SECONDARY))
+            self.profiler_text = [self.profiler_font.render(text, True, color) for text, color in lines]
+        for row, text in enumerate(self.profiler_text):
+            self.screen.blit(text, (x0 + graph_width + 10, y0 + row * 12))
+
     def run(self):
         """Main game loop"""
         running = True
@@ -1011,17 +995,123 @@ class UltimateBrickBreaker:
             current_time = time.time()
             dt = min(current_time - last_time, 1/30)  # Cap delta time
             last_time = current_time
+            if self.fixed_frame_dt is not None:
+                dt = self.fixed_frame_dt
+
+            profiler = self.profiler
+            if profiler is None:
+                running = self.handle_events() and not self.quit_requested
+                self.update(dt)
+                self.draw()
+                pygame.display.flip()
+            else:
+                profiler.begin_frame()
+                started = profiler.enter()
+                running = self.handle_events() and not self.quit_requested
+                profiler.leave('events', started)
+                self.update(dt)
+                started = profiler.enter()
+                self.draw()
+                profiler.leave('draw', started)
+                if self.show_profiler:
+                    started = profiler.enter()
+                    self.draw_profiler_overlay()
+                    profiler.leave('overlay', started)
+                started = profiler.enter()
+                pygame.display.flip()
+                profiler.leave('present', started)
+                profiler.end_frame()
+
+            # Frame pacing sleeps here, outside the profiled frame
+            self.clock.tick(FPS if self.fixed_frame_dt is None else 0)
+
+        self.save_recording()
+        if self.profiler is not None and self.profile_csv:
+            self.profiler.to_csv(self.profile_csv)
+            print(f"Wrote {len(self.profiler.frames)} frames to {self.profile_csv}")
+        pygame.quit()
 
-            running = self.handle_events()
-            self.update(dt)
-            self.draw()
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
+def benchmark_rendering(frames: int = 600, balls: int = 12, level: int = 6) -> dict:
+    """Mean and 95th percentile draw() time in ms, with RenderAssets caching off and on
 
-        pygame.quit()
+    The same busy scene is drawn both ways: a full wall of bricks, some of
+    them flashing and scaling as if just hit, and several balls pulsing.
+    The simulation is not stepped, so both runs draw identical frames.
+    """
+    game = UltimateBrickBreaker()
+    game.start_game()
+    game.sim.level = level
+    game.sim.start_level()
+    rng = random.Random(0)
+    for _ in range(balls - 1):
+        ball = game.sim.new_ball()
+        ball.x = rng.uniform(50, WINDOW_WIDTH - 50)
+        ball.y = rng.uniform(WINDOW_HEIGHT * 0.5, WINDOW_HEIGHT * 0.8)
+
+    results = {}
+    for cached in (False, True):
+        ASSETS.cached = cached
+        ASSETS.surfaces.clear()
+        ASSETS.font = None
+        times = []
+        for frame in range(frames):
+            if frame % 4 == 0:
+                brick = game.bricks[frame // 4 % len(game.bricks)]
+                brick.hit_flash = 0.3
+                brick.target_scale = 1.1
+            for brick in game.bricks:
+                brick.animate(1 / FPS)
+            for ball in game.balls:
+                ball.animate(1 / FPS)
+            start = time.perf_counter()
+            game.draw()
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        results['cached' if cached else 'uncached'] = {
+            'mean_ms': sum(times) / len(times),
+            'p95_ms': times[int(len(times) * 0.95)],
+            'surfaces': len(ASSETS.surfaces),
+        }
+    ASSETS.cached = True
+    return results
 
 # Run the game
 if __name__ == "__main__":
-    game = UltimateBrickBreaker()
-    game.run()
+    parser = argparse.ArgumentParser(description="Ultimate Brick Breaker")
+    parser.add_argument('--bench-render', action='store_true',
+                        help="time drawing a busy scene with and without the render cache, then exit")
+    parser.add_argument('--frames', type=int, default=600, help="frames to draw per --bench-render run")
+    parser.add_argument('--profile', action='store_true', help="start with the frame profiler overlay shown (F3)")
+    parser.add_argument('--profile-csv', metavar='PATH', help="profile every frame and write them as CSV on exit")
+    parser.add_argument('--profile-memory-every', type=int, default=60, metavar='N',
+                        help="trace allocations in one frame out of N while profiling (0: never)")
+    parser.add_argument('--record', metavar='PATH', help="record each game's seed and input to PATH")
+    parser.add_argument('--replay', metavar='PATH', help="play back a recorded game, then exit")
+    parser.add_argument('--uncapped', action='store_true',
+                        help=f"advance a fixed 1/{FPS} s per frame as fast as frames can be drawn")
+    args = parser.parse_args()
+    if args.bench_render:
+        results = benchmark_rendering(args.frames)
+        for name, result in results.items():
+            print(f"{name:>9}: {result['mean_ms']:6.2f} ms mean  {result['p95_ms']:6.2f} ms p95  "
+                  f"{result['surfaces']} cached surfaces")
+        print(f"speedup: {results['uncached']['mean_ms'] / results['cached']['mean_ms']:.1f}x")
+        pygame.quit()
+    else:
+        game = UltimateBrickBreaker()
+        if args.profile or args.profile_csv:
+            game.enable_profiler(args.profile_memory_every, FULL_HISTORY if args.profile_csv else 0)
+            game.show_profiler = args.profile
+            game.profile_csv = args.profile_csv
+        game.record_path = args.record
+        if args.uncapped:
+            game.fixed_frame_dt = 1 / FPS
+        if args.replay:
+            try:
+                replay = Replay.load(args.replay)
+            except (OSError, ValueError) as error:
+                print(f"Could not load {args.replay}: {error}")
+                raise SystemExit(1)
+            game.quit_after_replay = True
+            game.start_replay(replay)
+        game.run()
@@ -0,0 +1,10 @@
+from .config import (WORLD_WIDTH, WORLD_HEIGHT, SIM_HZ, FIXED_DT, Colors, GameSettings, PowerUpType,
+                     GameState)
+from .collide import sweep_circle_box, sweep_circle_point, reflect
+from .entities import Laser, Pool, PowerUp
+from .grid import SpatialGrid
+from .particles import PARTICLE_KINDS, PALETTE, ParticlePool
+from .profiler import FrameProfiler
+from .sim import Controls, NO_INPUT, Ball, Paddle, Brick, Simulation, boxes_overlap
+from .headless import autopilot, run_entity_stress, run_headless, run_stress
+from .replay import InputRecorder, Replay, advance, record_session, run_replay
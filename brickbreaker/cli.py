@@ -0,0 +1,121 @@
+import argparse
+import json
+
+from .config import SIM_HZ
+from .headless import run_entity_stress, run_headless, run_stress
+from .replay import Replay, record_session, run_replay
+
+def cmd_bench(args):
+    runs = [run_headless(args.frames, args.seed) for _ in range(args.repeat)]
+    best = max(runs, key=lambda run: run['frames_per_sec'])
+    deterministic = len({run['digest'] for run in runs}) == 1
+    if args.json:
+        print(json.dumps({'runs': runs, 'best': best, 'deterministic': deterministic}, indent=2))
+    else:
+        print(f"{args.frames:,} frames at {SIM_HZ} Hz, seed {args.seed}, best of {args.repeat}: "
+              f"{best['frames_per_sec']:,.0f} simulated frames/s ({best['realtime_factor']:,.1f}x real time)")
+        print(f"score {best['score']:,}  level {best['level']}  levels cleared {best['levels_cleared']}  "
+              f"games over {best['games_over']}  state {best['digest']}")
+        if args.repeat > 1:
+            print("deterministic" if deterministic else "WARNING: runs with the same seed diverged")
+    return 0 if deterministic else 1
+
+def cmd_stress(args):
+    result = run_stress(args.balls, args.speed, args.dt, args.steps, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{args.balls} balls at {args.speed:,.0f} px/s, dt {args.dt:.4f} s "
+              f"({args.speed * args.dt:,.0f} px per step), {args.steps:,} steps")
+        print(f"{result['steps_per_sec']:,.0f} steps/s, {result['ball_steps_per_sec']:,.0f} ball moves/s, "
+              f"{result['bricks_destroyed']:,} bricks destroyed, {result['walls_rebuilt']} walls rebuilt")
+        print(f"tunnelled: {result['tunnelled']}")
+    return 0 if result['tunnelled'] == 0 else 1
+
+def cmd_entities(args):
+    result = run_entity_stress(args.balls, args.steps, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        growth = result['pool_growth']
+        print(f"{args.balls} balls, lasers and power-ups, {args.steps:,} steps at {SIM_HZ} Hz, seed {args.seed}")
+        print(f"{result['steps_per_sec']:,.0f} steps/s ({result['realtime_factor']:,.1f}x real time); peak "
+              f"{result['peak_balls']} balls, {result['peak_lasers']} lasers, {result['peak_powerups']} power-ups")
+        print(f"{result['lasers_fired']:,} lasers fired, {result['powerups_collected']:,} of "
+              f"{result['powerups_spawned']:,} power-ups caught, {result['bricks_destroyed']:,} bricks destroyed, "
+              f"{result['walls_rebuilt']} walls rebuilt")
+        print(f"pool growth past preallocation: balls {growth['balls']}, lasers {growth['lasers']}, "
+              f"power-ups {growth['powerups']}  state {result['digest']}")
+    return 0
+
+def cmd_record(args):
+    replay = record_session(args.frames, args.seed)
+    replay.save(args.path)
+    size = len(replay.to_bytes())
+    print(f"Recorded {replay.steps:,} steps ({replay.steps / SIM_HZ:,.0f} s of play), seed {replay.seed}, "
+          f"{size:,} bytes to {args.path}")
+    return 0
+
+def cmd_replay(args):
+    status = 0
+    results = []
+    for path in args.paths:
+        try:
+            result = run_replay(Replay.load(path))
+        except (OSError, ValueError) as error:
+            print(f"{path}: {error}")
+            status = 1
+            continue
+        result['path'] = path
+        results.append(result)
+        if not result['matches']:
+            status = 1
+        if not args.json:
+            print(f"{path}: {result['steps']:,} steps ({result['game_seconds']:,.0f} s of play) in "
+                  f"{result['seconds']:.2f} s, {result['frames_per_sec']:,.0f} frames/s; score {result['score']:,}, "
+                  f"level {result['level']}, {result['state']}; "
+                  f"{'state matches' if result['matches'] else 'STATE DIVERGED'} ({result['digest']})")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m brickbreaker', description="Headless Brick Breaker simulation")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    bench = sub.add_parser('bench', help="run the simulation in turbo mode and report simulated frames per second")
+    bench.add_argument('--frames', type=int, default=20000)
+    bench.add_argument('--seed', type=int, default=0)
+    bench.add_argument('--repeat', type=int, default=3, help="runs to take the best of; their states must agree")
+    bench.add_argument('--json', action='store_true', help="print every run as JSON")
+    bench.set_defaults(handler=cmd_bench)
+
+    stress = sub.add_parser('stress', help="sweep many very fast balls with long steps and count tunnelling")
+    stress.add_argument('--balls', type=int, default=48)
+    stress.add_argument('--speed', type=float, default=4000.0, help="ball speed in px/s")
+    stress.add_argument('--dt', type=float, default=1 / 30, help="seconds per step")
+    stress.add_argument('--steps', type=int, default=1000)
+    stress.add_argument('--seed', type=int, default=0)
+    stress.add_argument('--json', action='store_true')
+    stress.set_defaults(handler=cmd_stress)
+
+    entities = sub.add_parser('entities', help="run full game steps with 50+ balls, lasers and power-ups at once")
+    entities.add_argument('--balls', type=int, default=60)
+    entities.add_argument('--steps', type=int, default=3000)
+    entities.add_argument('--seed', type=int, default=0)
+    entities.add_argument('--json', action='store_true')
+    entities.set_defaults(handler=cmd_entities)
+
+    record = sub.add_parser('record', help="record the autopilot playing one game, as a replay file")
+    record.add_argument('path')
+    record.add_argument('--frames', type=int, default=10 * 60 * SIM_HZ, help="most steps to record (default 10 min)")
+    record.add_argument('--seed', type=int, default=0)
+    record.set_defaults(handler=cmd_record)
+
+    replay = sub.add_parser('replay', help="re-run replay files headless at full speed and verify their end state")
+    replay.add_argument('paths', nargs='+')
+    replay.add_argument('--json', action='store_true')
+    replay.set_defaults(handler=cmd_replay)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,111 @@
+import math
+from typing import Optional, Tuple
+
+from .grid import Bounds
+
+# (time of impact as a fraction of the move, surface normal x, surface normal y)
+Impact = Tuple[float, float, float]
+
+def sweep_circle_box(x: float, y: float, dx: float, dy: float, radius: float, box: Bounds) -> Optional[Impact]:
+    """First contact of a circle moving by (dx, dy) with a box, or None
+
+    The box grown by the radius is a rounded rectangle: the circle's centre
+    is ray-cast against its four edges and, past their ends, against a
+    circle of the same radius around the nearest corner. A circle that
+    already overlaps the box hits at time 0 if it is moving further in.
+    """
+    left = box[0] - radius
+    top = box[1] - radius
+    right = box[2] + radius
+    bottom = box[3] + radius
+
+    if left < x < right and top < y < bottom:
+        if not (box[0] <= x <= box[2] or box[1] <= y <= box[3]):
+            # In a corner of the grown box, which only the rounded corner counts
+            return _sweep_corner(x, y, dx, dy, radius, box[0] if x < box[0] else box[2],
+                                 box[1] if y < box[1] else box[3])
+        # Already overlapping: push out along the axis of least penetration
+        pen_x = min(x - left, right - x)
+        pen_y = min(y - top, bottom - y)
+        if pen_x < pen_y:
+            nx = -1.0 if x - left < right - x else 1.0
+            return (0.0, nx, 0.0) if dx * nx < 0 else None
+        ny = -1.0 if y - top < bottom - y else 1.0
+        return (0.0, 0.0, ny) if dy * ny < 0 else None
+
+    # Slab test against the grown box
+    t_enter = -math.inf
+    t_exit = 1.0
+    nx = ny = 0.0
+    if dx == 0.0:
+        if not left <= x <= right:
+            return None
+    else:
+        t1 = (left - x) / dx
+        t2 = (right - x) / dx
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter = t1
+            nx, ny = (-1.0 if dx > 0 else 1.0), 0.0
+        t_exit = min(t_exit, t2)
+    if dy == 0.0:
+        if not top <= y <= bottom:
+            return None
+    else:
+        t1 = (top - y) / dy
+        t2 = (bottom - y) / dy
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter = t1
+            nx, ny = 0.0, (-1.0 if dy > 0 else 1.0)
+        t_exit = min(t_exit, t2)
+    if t_enter > t_exit or t_enter < 0.0:
+        return None
+
+    hit_x = x + dx * t_enter
+    hit_y = y + dy * t_enter
+    if box[0] <= hit_x <= box[2] or box[1] <= hit_y <= box[3]:
+        return (t_enter, nx, ny)
+
+    # Past the end of an edge: the rounded corner decides
+    return _sweep_corner(x, y, dx, dy, radius, box[0] if hit_x < box[0] else box[2],
+                         box[1] if hit_y < box[1] else box[3])
+
+def _sweep_corner(x, y, dx, dy, radius, corner_x, corner_y):
+    fx = x - corner_x
+    fy = y - corner_y
+    distance = math.hypot(fx, fy)
+    if distance < radius:
+        # Overlapping the corner: out along the line from it
+        if distance == 0.0 or dx * fx + dy * fy >= 0:
+            return None
+        return (0.0, fx / distance, fy / distance)
+    t = sweep_circle_point(x, y, dx, dy, radius, corner_x, corner_y)
+    if t is None:
+        return None
+    return (t, (x + dx * t - corner_x) / radius, (y + dy * t - corner_y) / radius)
+
+def sweep_circle_point(x: float, y: float, dx: float, dy: float, radius: float,
+                       px: float, py: float) -> Optional[float]:
+    """Fraction of the move at which a moving circle first touches a point, or None"""
+    fx = x - px
+    fy = y - py
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    c = fx * fx + fy * fy - radius * radius
+    if a == 0.0 or b >= 0.0:
+        return None
+    disc = b * b - a * c
+    if disc < 0.0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if 0.0 <= t <= 1.0 else None
+
+def reflect(vx: float, vy: float, nx: float, ny: float) -> Tuple[float, float]:
+    """Velocity bounced off a surface with unit normal (nx, ny)"""
+    dot = vx * nx + vy * ny
+    if dot >= 0.0:
+        return vx, vy
+    return vx - 2 * dot * nx, vy - 2 * dot * ny
@@ -0,0 +1,80 @@
+from enum import Enum
+from dataclasses import dataclass
+
+# Playfield size in pixels; the window matches it
+WORLD_WIDTH = 1200
+WORLD_HEIGHT = 800
+
+# Simulation rate: every step advances the world by exactly FIXED_DT seconds
+SIM_HZ = 120
+FIXED_DT = 1.0 / SIM_HZ
+
+# Modern Color Palette
+class Colors:
+    # Background gradients
+    BG_PRIMARY = (12, 15, 25)
+    BG_SECONDARY = (18, 22, 35)
+    BG_ACCENT = (25, 30, 45)
+
+    # UI Elements
+    UI_PRIMARY = (255, 255, 255)
+    UI_SECONDARY = (180, 190, 210)
+    UI_ACCENT = (120, 140, 180)
+    UI_MUTED = (80, 90, 110)
+
+    # Game Elements
+    PADDLE_PRIMARY = (64, 123, 255)
+    PADDLE_GLOW = (100, 150, 255)
+    BALL_PRIMARY = (255, 255, 255)
+    BALL_TRAIL = (180, 200, 255)
+
+    # Brick Colors (Modern flat design)
+    BRICK_TIER_1 = (46, 204, 113)    # Emerald
+    BRICK_TIER_2 = (52, 152, 219)    # Peter River
+    BRICK_TIER_3 = (155, 89, 182)    # Amethyst
+    BRICK_TIER_4 = (241, 196, 15)    # Sun Flower
+    BRICK_TIER_5 = (231, 76, 60)     # Alizarin
+    BRICK_SPECIAL = (230, 126, 34)   # Carrot
+
+    # Power-ups
+    POWERUP_SPEED = (231, 76, 60)
+    POWERUP_MULTI = (46, 204, 113)
+    POWERUP_PADDLE = (52, 152, 219)
+    POWERUP_LASER = (241, 196, 15)
+    POWERUP_SHIELD = (155, 89, 182)
+    POWERUP_LIFE = (26, 188, 156)
+
+    # Status colors
+    SUCCESS = (46, 204, 113)
+    WARNING = (241, 196, 15)
+    DANGER = (231, 76, 60)
+    INFO = (52, 152, 219)
+
+@dataclass
+class GameSettings:
+    """Game configuration settings"""
+    paddle_speed: float = 600.0
+    ball_speed: float = 400.0
+    brick_rows: int = 8
+    brick_cols: int = 12
+    powerup_chance: float = 0.2
+    lives: int = 3
+    enable_particles: bool = True
+    enable_sounds: bool = True
+    enable_screen_shake: bool = True
+
+class PowerUpType(Enum):
+    SPEED_BOOST = ("Speed Boost", "⚡", Colors.POWERUP_SPEED)
+    MULTI_BALL = ("Multi Ball", "●", Colors.POWERUP_MULTI)
+    WIDE_PADDLE = ("Wide Paddle", "━", Colors.POWERUP_PADDLE)
+    LASER_PADDLE = ("Laser Paddle", "▲", Colors.POWERUP_LASER)
+    SHIELD = ("Shield", "◐", Colors.POWERUP_SHIELD)
+    EXTRA_LIFE = ("Extra Life", "♥", Colors.POWERUP_LIFE)
+
+class GameState(Enum):
+    MENU = "menu"
+    PLAYING = "playing"
+    PAUSED = "paused"
+    GAME_OVER = "game_over"
+    LEVEL_COMPLETE = "level_complete"
+    SETTINGS = "settings"
@@ -0,0 +1,100 @@
+from typing import Callable, List, Optional
+
+from .config import PowerUpType
+
+class PowerUp:
+    """Capsule falling from a destroyed brick until the paddle catches it or it leaves the playfield"""
+
+    __slots__ = ('x', 'y', 'vy', 'width', 'height', 'kind', 'active')
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.vy = 150.0
+        self.width = 36
+        self.height = 18
+        self.kind: Optional[PowerUpType] = None
+        self.active = False
+
+    def launch(self, x: float, y: float, kind: PowerUpType):
+        """Centre the capsule on (x, y) and start it falling"""
+        self.x = x - self.width / 2
+        self.y = y - self.height / 2
+        self.kind = kind
+        self.active = True
+
+    def bounds(self):
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+class Laser:
+    """Bolt fired up from a laser paddle; (x, y) is the middle of its top edge"""
+
+    __slots__ = ('x', 'y', 'vy', 'width', 'height', 'active')
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.vy = -800.0
+        self.width = 4
+        self.height = 20
+        self.active = False
+
+    def launch(self, x: float, y: float):
+        self.x = x
+        self.y = y
+        self.active = True
+
+    def bounds(self):
+        half = self.width / 2
+        return (self.x - half, self.y, self.x + half, self.y + self.height)
+
+class Pool:
+    """Preallocated objects handed out by acquire() and returned by sweep()
+
+    `live` holds the objects in use, in the order they were acquired.
+    Objects mark themselves inactive when they are done; sweep() then
+    moves them back to the free list in one pass, so nothing is allocated
+    or searched for per spawn. An empty free list grows the pool by one
+    object; `created` counts every object ever made, so a steady count
+    after warm-up shows the pool is big enough.
+    """
+
+    def __init__(self, factory: Callable, capacity: int):
+        self.factory = factory
+        self.free: List = [factory() for _ in range(capacity)]
+        self.live: List = []
+        self.created = capacity
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def acquire(self):
+        if self.free:
+            item = self.free.pop()
+        else:
+            item = self.factory()
+            self.created += 1
+        self.live.append(item)
+        return item
+
+    def sweep(self):
+        """Return every inactive live object to the free list, keeping the order of the rest"""
+        live = self.live
+        free = self.free
+        kept = 0
+        for item in live:
+            if item.active:
+                live[kept] = item
+                kept += 1
+            else:
+                free.append(item)
+        del live[kept:]
+
+    def clear(self):
+        for item in self.live:
+            item.active = False
+        self.free.extend(self.live)
+        self.live.clear()
@@ -0,0 +1,74 @@
+from typing import List, Tuple
+
+Bounds = Tuple[float, float, float, float]
+
+class SpatialGrid:
+    """Uniform grid over a rectangle, mapping boxes to the items stored in the cells they touch
+
+    Bricks are laid out on a regular grid, so with one cell per brick slot
+    a ball only has to be tested against the handful of bricks in the cells
+    under its box, however many bricks the level has. Items outside the
+    grid are clamped into the border cells, so nothing is ever missed.
+    Items are kept with their insertion index, and query() returns them in
+    that order, which keeps "first brick hit" the same as a linear scan.
+    """
+
+    def __init__(self, origin_x: float, origin_y: float, cell_width: float, cell_height: float,
+                 cols: int, rows: int):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cols = max(1, cols)
+        self.rows = max(1, rows)
+        self.cells: List[list] = [[] for _ in range(self.cols * self.rows)]
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _span(self, box: Bounds) -> Tuple[int, int, int, int]:
+        """First and last column and row touched by box, clamped to the grid"""
+        last_col = self.cols - 1
+        last_row = self.rows - 1
+        col0 = min(last_col, max(0, int((box[0] - self.origin_x) // self.cell_width)))
+        col1 = min(last_col, max(0, int((box[2] - self.origin_x) // self.cell_width)))
+        row0 = min(last_row, max(0, int((box[1] - self.origin_y) // self.cell_height)))
+        row1 = min(last_row, max(0, int((box[3] - self.origin_y) // self.cell_height)))
+        return col0, col1, row0, row1
+
+    def insert(self, item, box: Bounds, index: int):
+        """Store item under every cell its box touches; index orders query results"""
+        col0, col1, row0, row1 = self._span(box)
+        cols = self.cols
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                self.cells[row * cols + col].append((index, item))
+        self.count += 1
+
+    def remove(self, item, box: Bounds):
+        """Take item out of the cells its box touches; box must be the one it was inserted with"""
+        col0, col1, row0, row1 = self._span(box)
+        cols = self.cols
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                cell = self.cells[row * cols + col]
+                for position, (_, stored) in enumerate(cell):
+                    if stored is item:
+                        del cell[position]
+                        break
+        self.count -= 1
+
+    def query(self, box: Bounds) -> list:
+        """Items in the cells box touches, in insertion order, without duplicates"""
+        col0, col1, row0, row1 = self._span(box)
+        cells = self.cells
+        cols = self.cols
+        if col0 == col1 and row0 == row1:
+            return [item for _, item in cells[row0 * cols + col0]]
+        found = {}
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                for index, item in cells[row * cols + col]:
+                    found[index] = item
+        return [found[index] for index in sorted(found)]
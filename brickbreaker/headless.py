@@ -0,0 +1,209 @@
+import math
+import random
+import time
+from typing import Callable, Optional
+
+from .config import WORLD_WIDTH, WORLD_HEIGHT, SIM_HZ, GameSettings, GameState
+from .grid import Bounds
+from .sim import BALL_POOL_SIZE, LASER_POOL_SIZE, POWERUP_POOL_SIZE, Ball, Controls, Simulation
+
+def autopilot(sim: Simulation) -> Controls:
+    """Chase the lowest ball, meeting it off-centre so that rebounds keep changing angle"""
+    paddle = sim.paddle
+    lowest = None
+    for ball in sim.balls:
+        if ball.active and (lowest is None or ball.y > lowest.y):
+            lowest = ball
+    target = lowest.x if lowest is not None else WORLD_WIDTH / 2
+    # Cycle through five contact points, a few seconds each
+    offset = ((sim.frame // 600) % 5 - 2) * 0.15 * paddle.width
+    centre = paddle.x + paddle.width / 2 + offset
+    dead_zone = paddle.speed / SIM_HZ
+    return Controls(left=centre > target + dead_zone, right=centre < target - dead_zone,
+                    fire=paddle.laser_timer > 0)
+
+def run_headless(frames: int, seed: int = 0, policy: Callable[[Simulation], Controls] = autopilot,
+                 settings: Optional[GameSettings] = None) -> dict:
+    """Step a simulation `frames` times as fast as possible ("turbo" mode)
+
+    Cleared levels roll straight into the next one and lost games restart,
+    so every frame is a playing frame. Returns what happened, the wall time
+    and the simulated frames per second.
+    """
+    sim = Simulation(seed, settings)
+    games = 0
+    levels = 0
+    best = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        sim.step(policy(sim))
+        if sim.state == GameState.LEVEL_COMPLETE:
+            levels += 1
+            sim.start_level()
+        elif sim.state == GameState.GAME_OVER:
+            games += 1
+            best = max(best, sim.score)
+            sim.new_game()
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': frames,
+        'seed': seed,
+        'seconds': elapsed,
+        'frames_per_sec': frames / elapsed if elapsed > 0 else float('inf'),
+        'realtime_factor': frames / elapsed / SIM_HZ if elapsed > 0 else float('inf'),
+        'games_over': games,
+        'levels_cleared': levels,
+        'best_score': max(best, sim.score),
+        'score': sim.score,
+        'level': sim.level,
+        'digest': sim.digest(),
+    }
+
+def penetration(ball: Ball, box: Bounds) -> float:
+    """How far a ball's circle reaches into a box (zero or less when apart)"""
+    nearest_x = min(max(ball.x, box[0]), box[2])
+    nearest_y = min(max(ball.y, box[1]), box[3])
+    return ball.radius - math.hypot(ball.x - nearest_x, ball.y - nearest_y)
+
+def run_stress(balls: int = 48, speed: float = 4000.0, dt: float = 1 / 30, steps: int = 1000,
+               seed: int = 0, level: int = 6) -> dict:
+    """Collision stress test: many very fast balls moved with long steps
+
+    At 4000 px/s and 1/30 s a ball covers about 130 px per step, more than
+    five brick heights, so any test of end positions alone would tunnel.
+    Balls are swept straight through Simulation.move_ball; lost balls are
+    served again and a cleared wall is rebuilt, so the load stays constant.
+    After every step each ball is checked to be inside the walls and clear
+    of every standing brick; violations are counted as tunnelled.
+    Power-up drops are off, as nothing here would ever catch them.
+    """
+    sim = Simulation(seed, GameSettings(powerup_chance=0.0))
+    sim.level = level
+    sim.start_level()
+    rng = random.Random(seed)
+
+    sim.ball_pool.clear()
+    _serve_balls(sim, rng, balls, speed)
+    tunnelled = 0
+    rebuilt = 0
+    destroyed = 0
+    elapsed = 0.0
+    tolerance = 1e-6
+    for _ in range(steps):
+        sim.events = []
+        start = time.perf_counter()
+        for ball in sim.balls:
+            sim.move_ball(ball, dt)
+        elapsed += time.perf_counter() - start
+        destroyed += sum(1 for event in sim.events if event[0] == 'brick_destroyed')
+
+        for ball in sim.balls:
+            if not ball.active:
+                continue
+            if (ball.x < ball.radius - tolerance or ball.x > WORLD_WIDTH - ball.radius + tolerance
+                    or ball.y < ball.radius - tolerance):
+                tunnelled += 1
+            elif any(penetration(ball, brick.box) > tolerance for brick in sim.grid.query(ball.bounds())):
+                tunnelled += 1
+        if not sim.grid:
+            _rebuild_wall(sim)
+            rebuilt += 1
+        sim.ball_pool.sweep()
+        _serve_balls(sim, rng, balls, speed)
+
+    ball_steps = balls * steps
+    return {
+        'balls': balls,
+        'speed': speed,
+        'dt': dt,
+        'steps': steps,
+        'seconds': elapsed,
+        'steps_per_sec': steps / elapsed if elapsed > 0 else float('inf'),
+        'ball_steps_per_sec': ball_steps / elapsed if elapsed > 0 else float('inf'),
+        'bricks_destroyed': destroyed,
+        'walls_rebuilt': rebuilt,
+        'tunnelled': tunnelled,
+    }
+
+def _serve_balls(sim: Simulation, rng: random.Random, count: int, speed: float):
+    """Serve balls from random points low in the playfield until `count` are in play"""
+    while len(sim.balls) < count:
+        ball = sim.new_ball()
+        angle = rng.uniform(-math.pi * 0.4, math.pi * 0.4)
+        ball.launch(rng.uniform(ball.radius, WORLD_WIDTH - ball.radius),
+                    rng.uniform(WORLD_HEIGHT * 0.6, WORLD_HEIGHT * 0.8),
+                    speed * math.sin(angle), -speed * math.cos(angle))
+
+def _rebuild_wall(sim: Simulation):
+    """Lay a fresh wall, taking out any ball it would be laid on top of"""
+    sim.reset_bricks()
+    for ball in sim.balls:
+        if any(penetration(ball, brick.box) > 0 for brick in sim.grid.query(ball.bounds())):
+            ball.active = False
+
+def run_entity_stress(balls: int = 60, steps: int = 3000, seed: int = 0, level: int = 6,
+                      powerup_chance: float = 0.3) -> dict:
+    """Entity stress test: a full game step with 50+ balls, lasers and power-ups at once
+
+    The paddle keeps its laser and shield for the whole run and fires on
+    every step, the autopilot steers it, and caught power-ups apply as in
+    play, so multiball pushes the count towards MAX_BALLS. Lost balls are
+    served again and a cleared wall is rebuilt, so the load stays high.
+    Reports the rate of whole Simulation.step calls, the peak number of
+    each entity, and how far each pool grew past its preallocated size.
+    """
+    sim = Simulation(seed, GameSettings(powerup_chance=powerup_chance))
+    sim.level = level
+    sim.start_level()
+    rng = random.Random(seed)
+    paddle = sim.paddle
+    counts = dict.fromkeys(('brick_destroyed', 'powerup_spawned', 'powerup_collected', 'laser_fired'), 0)
+    peak = {'balls': 0, 'lasers': 0, 'powerups': 0}
+    rebuilt = 0
+    elapsed = 0.0
+    _serve_balls(sim, rng, balls, sim.settings.ball_speed)
+    for _ in range(steps):
+        paddle.laser_timer = paddle.shield_timer = math.inf
+        controls = autopilot(sim)
+        start = time.perf_counter()
+        events = sim.step(controls)
+        elapsed += time.perf_counter() - start
+        for event in events:
+            if event[0] == 'laser_fired':
+                counts['laser_fired'] += event[1]
+            elif event[0] in counts:
+                counts[event[0]] += 1
+        peak['balls'] = max(peak['balls'], len(sim.balls))
+        peak['lasers'] = max(peak['lasers'], len(sim.lasers))
+        peak['powerups'] = max(peak['powerups'], len(sim.powerups))
+
+        if sim.state == GameState.LEVEL_COMPLETE:
+            sim.state = GameState.PLAYING
+            sim.level = level
+            _rebuild_wall(sim)
+            sim.ball_pool.sweep()
+            rebuilt += 1
+        _serve_balls(sim, rng, balls, sim.settings.ball_speed)
+
+    return {
+        'balls': balls,
+        'steps': steps,
+        'seed': seed,
+        'seconds': elapsed,
+        'steps_per_sec': steps / elapsed if elapsed > 0 else float('inf'),
+        'realtime_factor': steps / elapsed / SIM_HZ if elapsed > 0 else float('inf'),
+        'peak_balls': peak['balls'],
+        'peak_lasers': peak['lasers'],
+        'peak_powerups': peak['powerups'],
+        'lasers_fired': counts['laser_fired'],
+        'powerups_spawned': counts['powerup_spawned'],
+        'powerups_collected': counts['powerup_collected'],
+        'bricks_destroyed': counts['brick_destroyed'],
+        'walls_rebuilt': rebuilt,
+        'pool_growth': {
+            'balls': sim.ball_pool.created - BALL_POOL_SIZE,
+            'lasers': sim.laser_pool.created - LASER_POOL_SIZE,
+            'powerups': sim.powerup_pool.created - POWERUP_POOL_SIZE,
+        },
+        'digest': sim.digest(),
+    }
@@ -0,0 +1,119 @@
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # Only the particle pool needs NumPy
+    np = None
+
+from .config import Colors
+
+# Colours particles can take; particles store an index into this tuple
+PALETTE = (Colors.BRICK_TIER_1, Colors.BRICK_TIER_2, Colors.BRICK_TIER_3, Colors.BALL_TRAIL, Colors.UI_PRIMARY)
+
+# kind -> (vx range, vy range, size range, palette indices to pick from, lifetime in seconds)
+PARTICLE_KINDS = {
+    'explosion': ((-300, 300), (-400, -100), (3, 8), (0, 1, 2), 1.5),
+    'trail': ((-50, 50), (-100, 100), (1, 3), (3,), 0.5),
+    'sparkle': ((-100, 100), (-200, -50), (2, 5), (4,), 1.0),
+}
+
+GRAVITY = 500.0
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The particle pool requires NumPy")
+
+class ParticlePool:
+    """Fixed-capacity particle system stored as a structure of NumPy arrays
+
+    Rows [0, count) are the live particles. update() moves them all in one
+    vectorized step and fills the holes left by dead particles with rows
+    from the end (swap-remove), so live particles stay packed without
+    shifting the rest. When an emit() would overflow the capacity, the
+    oldest particles make room.
+    """
+
+    def __init__(self, capacity: int = 4096, seed: Optional[int] = None):
+        _require_numpy()
+        self.capacity = capacity
+        self.count = 0
+        self.emitted = 0
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.size = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.born = np.zeros(capacity, dtype=np.int64)
+        self._columns = (self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.size,
+                         self.color, self.born)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self, seed: Optional[int] = None):
+        """Drop every particle; a seed also restarts the random stream, for repeatable effects"""
+        self.count = 0
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+    def emit(self, kind: str, x: float, y: float, count: int):
+        """Spawn count particles of a kind from PARTICLE_KINDS at (x, y)"""
+        (vx_low, vx_high), (vy_low, vy_high), (size_low, size_high), colors, lifetime = PARTICLE_KINDS[kind]
+        count = min(count, self.capacity)
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            self._evict_oldest(overflow)
+        start = self.count
+        end = start + count
+        rng = self.rng
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = rng.uniform(vx_low, vx_high, count)
+        self.vy[start:end] = rng.uniform(vy_low, vy_high, count)
+        self.size[start:end] = rng.uniform(size_low, size_high, count)
+        self.color[start:end] = rng.choice(colors, count) if len(colors) > 1 else colors[0]
+        self.life[start:end] = lifetime
+        self.max_life[start:end] = lifetime
+        self.born[start:end] = np.arange(self.emitted, self.emitted + count)
+        self.emitted += count
+        self.count = end
+
+    def update(self, dt: float):
+        """Move, pull down and age every live particle, then drop the dead ones"""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.vy[:n] += GRAVITY * dt
+        self.life[:n] -= dt
+        self._remove(np.flatnonzero(self.life[:n] <= 0))
+
+    def current_size(self) -> 'np.ndarray':
+        """Sizes of the live particles, shrinking with the life they have left"""
+        n = self.count
+        return self.size[:n] * (self.life[:n] / self.max_life[:n])
+
+    def _evict_oldest(self, number: int):
+        if number >= self.count:
+            self.count = 0
+            return
+        self._remove(np.argpartition(self.born[:self.count], number - 1)[:number])
+
+    def _remove(self, rows: 'np.ndarray'):
+        """Swap-remove rows: live rows from the tail move into the holes below the new count"""
+        if not rows.size:
+            return
+        n = self.count
+        keep = n - rows.size
+        doomed = np.zeros(n, dtype=bool)
+        doomed[rows] = True
+        holes = np.flatnonzero(doomed[:keep])
+        movers = keep + np.flatnonzero(~doomed[keep:])
+        for column in self._columns:
+            column[holes] = column[movers]
+        self.count = keep
@@ -0,0 +1,121 @@
+import csv
+import time
+import tracemalloc
+from collections import deque
+from typing import Dict, List, Optional
+
+# Phases of one frame; time inside a frame outside all of them counts as 'other'
+PHASES = ('events', 'sim', 'collisions', 'particles', 'animation', 'draw', 'overlay', 'present')
+
+PERCENTILES = (50, 95, 99)
+
+# Most frames kept for to_csv() when a full history is asked for: over four hours at 60 FPS
+FULL_HISTORY = 1 << 20
+
+class FrameProfiler:
+    """Per-frame, per-phase timings of the game loop
+
+    Wrap each frame in begin_frame() / end_frame() and each phase in
+    enter() / leave(phase, started). Phases nest and are exclusive: time
+    spent in 'collisions' inside 'sim' only counts as collisions. The last
+    `window` frames feed the rolling percentiles; only the first `history`
+    frames are kept for to_csv(), none by default, so a profiler that only
+    feeds the overlay stays the size of its window. One frame in every `memory_every` runs under tracemalloc
+    and records how many blocks it allocated that were still alive at its
+    end, and its peak traced bytes. Those frames are slower, so they are
+    left out of the percentiles. Nothing here runs unless a profiler is
+    attached, so the game pays only `is None` checks without one.
+    """
+
+    def __init__(self, window: int = 600, memory_every: int = 60, history: int = 0):
+        self.window = deque(maxlen=window)
+        self.memory_every = memory_every
+        self.frames: List[dict] = []
+        self.history = history
+        self.origin = time.perf_counter_ns()
+        self.frame = None
+        self.count = 0
+        self.last_memory = None
+        # Nested phase time of the callers still running, innermost last
+        self._stack = [0]
+        self._memory_frame = False
+
+    def begin_frame(self):
+        self.count += 1
+        self._stack = [0]
+        self._memory_frame = (self.memory_every > 0 and self.count % self.memory_every == 0
+                              and not tracemalloc.is_tracing())
+        if self._memory_frame:
+            tracemalloc.start()
+        self.frame = {'frame': self.count, 'start_ns': time.perf_counter_ns() - self.origin,
+                      'total_ns': 0, 'phases': dict.fromkeys(PHASES, 0),
+                      'memory_sampled': self._memory_frame, 'alloc_blocks': None, 'alloc_peak_bytes': None}
+
+    def end_frame(self):
+        frame = self.frame
+        if frame is None:
+            return None
+        frame['total_ns'] = time.perf_counter_ns() - self.origin - frame['start_ns']
+        if self._memory_frame:
+            snapshot = tracemalloc.take_snapshot()
+            frame['alloc_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            frame['alloc_blocks'] = sum(stat.count for stat in snapshot.statistics('filename'))
+            self.last_memory = frame
+        else:
+            self.window.append(frame)
+        if len(self.frames) < self.history:
+            self.frames.append(frame)
+        self.frame = None
+        return frame
+
+    def enter(self) -> int:
+        """Open a phase measured by leave(); phases nest"""
+        self._stack.append(0)
+        return time.perf_counter_ns()
+
+    def leave(self, phase: str, started: int):
+        """Close the innermost phase opened by enter()"""
+        elapsed = time.perf_counter_ns() - started
+        nested = self._stack.pop()
+        self._stack[-1] += elapsed
+        if self.frame is not None:
+            self.frame['phases'][phase] += elapsed - nested
+
+    def percentiles(self) -> Dict[str, Dict[int, float]]:
+        """p50 / p95 / p99 in ms of every phase, 'other' and 'frame' over the rolling window"""
+        frames = list(self.window)
+        if not frames:
+            return {}
+        series = {phase: [frame['phases'][phase] for frame in frames] for phase in PHASES}
+        series['other'] = [frame['total_ns'] - sum(frame['phases'].values()) for frame in frames]
+        series['frame'] = [frame['total_ns'] for frame in frames]
+        result = {}
+        for name, values in series.items():
+            values.sort()
+            last = len(values) - 1
+            result[name] = {p: values[min(last, last * p // 100)] / 1e6 for p in PERCENTILES}
+        return result
+
+    def recent(self, count: int) -> List[dict]:
+        """The last count frames of the rolling window, oldest first"""
+        frames = list(self.window)
+        return frames[-count:]
+
+    def last_memory_frame(self) -> Optional[dict]:
+        return self.last_memory
+
+    def to_csv(self, path: str):
+        """Every frame kept in the history as one CSV row, times in milliseconds"""
+        with open(path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['frame', 'start_ms', 'total_ms'] + [f"{phase}_ms" for phase in PHASES]
+                            + ['other_ms', 'memory_sampled', 'alloc_blocks', 'alloc_peak_bytes'])
+            for frame in self.frames:
+                phases = frame['phases']
+                writer.writerow([frame['frame'], f"{frame['start_ns'] / 1e6:.3f}", f"{frame['total_ns'] / 1e6:.3f}"]
+                                + [f"{phases[phase] / 1e6:.3f}" for phase in PHASES]
+                                + [f"{(frame['total_ns'] - sum(phases.values())) / 1e6:.3f}",
+                                   int(frame['memory_sampled']),
+                                   '' if frame['alloc_blocks'] is None else frame['alloc_blocks'],
+                                   '' if frame['alloc_peak_bytes'] is None else frame['alloc_peak_bytes']])
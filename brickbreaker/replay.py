@@ -0,0 +1,170 @@
+import struct
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .config import SIM_HZ, GameSettings, GameState
+from .headless import autopilot
+from .sim import Controls, Simulation
+
+REPLAY_MAGIC = b'BBRP'
+REPLAY_VERSION = 1
+
+# magic, version, simulation rate, seed, step count, digest of the final state
+_HEADER = struct.Struct('<4sBHQI8s')
+
+def controls_bits(controls: Controls) -> int:
+    return controls.left | controls.right << 1 | controls.fire << 2
+
+# Every Controls value, indexed by its bits
+_CONTROLS = tuple(Controls(left=bool(bits & 1), right=bool(bits & 2), fire=bool(bits & 4)) for bits in range(8))
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+class Replay:
+    """One game's seed and per-step input, as recorded by InputRecorder
+
+    The simulation is deterministic, so the seed and the Controls of every
+    step are the whole game. Input is stored as runs of identical Controls,
+    each a varint of (run length << 3 | left, right, fire bits), which
+    takes a few bytes per second of play. digest is Simulation.digest()
+    after the last step, so a replay can check it ended in the same state.
+    """
+
+    def __init__(self, seed: int, runs: Optional[List[Tuple[int, int]]] = None, digest: str = '',
+                 sim_hz: int = SIM_HZ):
+        self.seed = seed
+        self.runs = runs if runs is not None else []
+        self.digest = digest
+        self.sim_hz = sim_hz
+
+    @property
+    def steps(self) -> int:
+        return sum(length for _, length in self.runs)
+
+    def record(self, controls: Controls):
+        bits = controls_bits(controls)
+        runs = self.runs
+        if runs and runs[-1][0] == bits:
+            runs[-1] = (bits, runs[-1][1] + 1)
+        else:
+            runs.append((bits, 1))
+
+    def controls(self) -> Iterator[Controls]:
+        """The Controls of every step, in order"""
+        for bits, length in self.runs:
+            controls = _CONTROLS[bits]
+            for _ in range(length):
+                yield controls
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.sim_hz, self.seed, self.steps,
+                                     bytes.fromhex(self.digest or '00' * 8)))
+        for bits, length in self.runs:
+            _write_varint(out, length << 3 | bits)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        if len(data) < _HEADER.size:
+            raise ValueError("Replay data is truncated")
+        magic, version, sim_hz, seed, steps, digest = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not a Brick Breaker replay")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        runs = []
+        position = _HEADER.size
+        while position < len(data):
+            value, position = _read_varint(data, position)
+            runs.append((value & 7, value >> 3))
+        replay = cls(seed, runs, digest.hex(), sim_hz)
+        if replay.steps != steps:
+            raise ValueError(f"Replay holds {replay.steps} steps, its header says {steps}")
+        return replay
+
+    def save(self, path: str):
+        with open(path, 'wb') as handle:
+            handle.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as handle:
+            return cls.from_bytes(handle.read())
+
+class InputRecorder:
+    """Records the Controls fed to one Simulation, for saving as a Replay"""
+
+    def __init__(self, sim: Simulation):
+        if sim.seed is None or not 0 <= sim.seed < 1 << 64:
+            raise ValueError("Only a simulation with a seed in [0, 2**64) can be replayed")
+        self.sim = sim
+        self.replay = Replay(sim.seed)
+
+    def record(self, controls: Controls):
+        self.replay.record(controls)
+
+    def finish(self) -> Replay:
+        """The replay so far, stamped with the simulation's current digest"""
+        self.replay.digest = self.sim.digest()
+        return self.replay
+
+def advance(sim: Simulation, controls: Controls) -> list:
+    """One game step as the front end takes it: a cleared level rolls straight into the next"""
+    events = sim.step(controls)
+    if sim.state == GameState.LEVEL_COMPLETE:
+        sim.start_level()
+    return events
+
+def run_replay(replay: Replay, settings: Optional[GameSettings] = None, sim_class=Simulation) -> dict:
+    """Re-run a recorded game headless at full speed and check it ends in the recorded state"""
+    if replay.sim_hz != SIM_HZ:
+        raise ValueError(f"Replay was recorded at {replay.sim_hz} Hz, the simulation runs at {SIM_HZ} Hz")
+    sim = sim_class(replay.seed, settings)
+    steps = 0
+    start = time.perf_counter()
+    for controls in replay.controls():
+        advance(sim, controls)
+        steps += 1
+    elapsed = time.perf_counter() - start
+    digest = sim.digest()
+    return {
+        'seed': replay.seed,
+        'steps': steps,
+        'game_seconds': steps / SIM_HZ,
+        'seconds': elapsed,
+        'frames_per_sec': steps / elapsed if elapsed > 0 else float('inf'),
+        'score': sim.score,
+        'level': sim.level,
+        'state': sim.state.value,
+        'digest': digest,
+        'expected_digest': replay.digest,
+        'matches': digest == replay.digest,
+    }
+
+def record_session(frames: int, seed: int = 0, policy: Callable[[Simulation], Controls] = autopilot,
+                   settings: Optional[GameSettings] = None) -> Replay:
+    """Record a policy playing one game for up to `frames` steps, as a repeatable load scenario"""
+    sim = Simulation(seed, settings)
+    recorder = InputRecorder(sim)
+    for _ in range(frames):
+        if sim.state == GameState.GAME_OVER:
+            break
+        controls = policy(sim)
+        recorder.record(controls)
+        advance(sim, controls)
+    return recorder.finish()
@@ -0,0 +1,509 @@
+import hashlib
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .config import WORLD_WIDTH, WORLD_HEIGHT, FIXED_DT, GameSettings, GameState, PowerUpType
+from .collide import reflect, sweep_circle_box
+from .entities import Laser, Pool, PowerUp
+from .grid import Bounds, SpatialGrid
+
+# Brick layout: every brick sits in a slot of a regular grid starting at BRICK_TOP
+BRICK_WIDTH = 80
+BRICK_HEIGHT = 25
+BRICK_MARGIN = 8
+BRICK_TOP = 120
+
+# Most surfaces a ball may bounce off within one step; any time left after that is dropped
+MAX_BOUNCES = 8
+
+# Power-ups and projectiles
+POWERUP_KINDS = tuple(PowerUpType)
+MAX_BALLS = 96
+MULTIBALL_SPREAD = math.radians(20)
+SPEED_BOOST_FACTOR = 1.4
+SPEED_BOOST_TIME = 8.0
+LASER_COOLDOWN = 0.15
+
+# Objects preallocated per pool; a pool grows past this only when a burst needs it
+BALL_POOL_SIZE = MAX_BALLS
+LASER_POOL_SIZE = 64
+POWERUP_POOL_SIZE = 32
+
+@dataclass(frozen=True)
+class Controls:
+    """Player input for one simulation step"""
+    left: bool = False
+    right: bool = False
+    fire: bool = False
+
+NO_INPUT = Controls()
+
+def boxes_overlap(a: Bounds, b: Bounds) -> bool:
+    """True when two (left, top, right, bottom) boxes share interior area"""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+class Ball:
+    """Ball state; Simulation.move_ball sweeps it along its path
+
+    Balls are pooled, so a new one is inactive until launch() puts it in play.
+    """
+
+    __slots__ = ('x', 'y', 'radius', 'vx', 'vy', 'active')
+
+    def __init__(self, radius: float = 10):
+        self.x = 0.0
+        self.y = 0.0
+        self.radius = radius
+        self.vx = 0.0
+        self.vy = 0.0
+        self.active = False
+
+    def launch(self, x: float, y: float, vx: float, vy: float):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.active = True
+
+    def bounds(self) -> Bounds:
+        return (self.x - self.radius, self.y - self.radius, self.x + self.radius, self.y + self.radius)
+
+class Paddle:
+    """Paddle movement and power-up timers"""
+
+    def __init__(self, x: float, y: float, speed: float = 600):
+        self.x = x
+        self.y = y
+        self.width = 120
+        self.height = 16
+        self.base_width = 120
+        self.speed = speed
+
+        # Power-ups
+        self.wide_paddle_timer = 0
+        self.laser_timer = 0
+        self.shield_timer = 0
+
+    def update(self, dt: float, controls: Controls):
+        """Move by the controls and run down the power-up timers"""
+        if controls.left:
+            self.x -= self.speed * dt
+        if controls.right:
+            self.x += self.speed * dt
+
+        # Keep on screen
+        self.x = max(0, min(WORLD_WIDTH - self.width, self.x))
+
+        if self.wide_paddle_timer > 0:
+            self.wide_paddle_timer -= dt
+            self.width = self.base_width * 1.6
+        else:
+            self.width = self.base_width
+
+        if self.laser_timer > 0:
+            self.laser_timer -= dt
+
+        if self.shield_timer > 0:
+            self.shield_timer -= dt
+
+    def apply_powerup(self, powerup_type: PowerUpType):
+        """Apply power-up effect"""
+        if powerup_type == PowerUpType.WIDE_PADDLE:
+            self.wide_paddle_timer = 12.0
+        elif powerup_type == PowerUpType.LASER_PADDLE:
+            self.laser_timer = 15.0
+        elif powerup_type == PowerUpType.SHIELD:
+            self.shield_timer = 20.0
+
+    def bounds(self) -> Bounds:
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+class Brick:
+    """Brick with tiered health"""
+
+    def __init__(self, x: float, y: float, width: float, height: float, tier: int):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.tier = tier
+        self.max_health = tier
+        self.health = tier
+        self.destroyed = False
+        # Bricks never move, so their box is computed once
+        self.box = (x, y, x + width, y + height)
+
+    def hit(self) -> bool:
+        """Take one hit; True when it destroys the brick"""
+        self.health -= 1
+        if self.health <= 0:
+            self.destroyed = True
+            return True
+        return False
+
+    def bounds(self) -> Bounds:
+        return self.box
+
+class Simulation:
+    """Deterministic Brick Breaker world, free of pygame, advanced in fixed steps
+
+    step(controls) moves everything by FIXED_DT seconds and returns the
+    events of that step. All randomness comes from one random.Random(seed),
+    so a seed and a sequence of Controls always replay the same game, at
+    any speed and without a display. The ball, paddle and brick classes are
+    injectable; the pygame front end passes subclasses that draw and animate.
+
+    Balls, lasers and falling power-ups are drawn from preallocated Pools
+    and listed in `balls`, `lasers` and `powerups`, which stay the same
+    list objects for the life of the simulation.
+
+    Events are tuples named by their first item: ('paddle_hit', x, y),
+    ('brick_hit', brick), ('brick_destroyed', brick, points),
+    ('powerup_spawned', powerup), ('powerup_collected', kind, x, y),
+    ('laser_fired', count), ('life_lost', lives), ('game_over', score)
+    and ('level_complete', level).
+    """
+
+    def __init__(self, seed: Optional[int] = None, settings: Optional[GameSettings] = None,
+                 ball_class=Ball, paddle_class=Paddle, brick_class=Brick):
+        self.seed = seed
+        self.settings = settings or GameSettings()
+        self.ball_class = ball_class
+        self.paddle_class = paddle_class
+        self.brick_class = brick_class
+        self.rng = random.Random(seed)
+        self.events = []
+        # Optional FrameProfiler; ball movement is timed as its 'collisions' phase
+        self.profiler = None
+        self.ball_pool = Pool(ball_class, BALL_POOL_SIZE)
+        self.laser_pool = Pool(Laser, LASER_POOL_SIZE)
+        self.powerup_pool = Pool(PowerUp, POWERUP_POOL_SIZE)
+        self.balls = self.ball_pool.live
+        self.lasers = self.laser_pool.live
+        self.powerups = self.powerup_pool.live
+        self.new_game()
+
+    def new_game(self):
+        """Start over at level 1 with full lives"""
+        self.state = GameState.PLAYING
+        self.frame = 0
+        self.score = 0
+        self.lives = self.settings.lives
+        self.level = 1
+        self.speed_boost_timer = 0
+        self.laser_cooldown = 0
+        self.paddle = self.paddle_class(WORLD_WIDTH // 2 - 60, WORLD_HEIGHT - 80, self.settings.paddle_speed)
+        self.start_level()
+
+    def start_level(self):
+        """Lay out the bricks of the current level and serve a new ball"""
+        self.state = GameState.PLAYING
+        self.ball_pool.clear()
+        self.laser_pool.clear()
+        self.powerup_pool.clear()
+        self.new_ball()
+        self.combo_multiplier = 1.0
+        self.combo_timer = 0
+        self.reset_bricks()
+
+    def reset_bricks(self):
+        """Lay out a fresh wall of bricks for the current level"""
+        self.bricks = self.create_brick_layout()
+        self.grid = self.index_bricks(self.bricks)
+
+    def new_ball(self) -> Ball:
+        """Serve a ball from above the paddle"""
+        ball = self.ball_pool.acquire()
+        ball.launch(WORLD_WIDTH // 2, WORLD_HEIGHT - 150, self.rng.choice([-300, 300]), -400)
+        return ball
+
+    def create_brick_layout(self) -> List[Brick]:
+        """Brick grid for the current level, with a few gaps in the lower rows"""
+        bricks = []
+        brick_width = BRICK_WIDTH
+        brick_height = BRICK_HEIGHT
+        margin = BRICK_MARGIN
+        start_y = BRICK_TOP
+
+        total_width = WORLD_WIDTH - 2 * margin
+        cols = (total_width + margin) // (brick_width + margin)
+        start_x = (WORLD_WIDTH - (cols * (brick_width + margin) - margin)) // 2
+
+        rows = min(10, 4 + self.level)
+
+        for row in range(rows):
+            for col in range(cols):
+                x = start_x + col * (brick_width + margin)
+                y = start_y + row * (brick_height + margin)
+
+                # Create tier pattern
+                tier = min(5, (row // 2) + 1)
+
+                # Skip some bricks for interesting patterns
+                if self.rng.random() < 0.05 and row > 2:
+                    continue
+
+                bricks.append(self.brick_class(x, y, brick_width, brick_height, tier))
+        return bricks
+
+    def index_bricks(self, bricks: List[Brick]) -> SpatialGrid:
+        """Spatial grid with one cell per brick slot, holding the bricks still standing"""
+        pitch_x = BRICK_WIDTH + BRICK_MARGIN
+        pitch_y = BRICK_HEIGHT + BRICK_MARGIN
+        left = min((brick.x for brick in bricks), default=0)
+        top = min((brick.y for brick in bricks), default=BRICK_TOP)
+        right = max((brick.x + brick.width for brick in bricks), default=left)
+        bottom = max((brick.y + brick.height for brick in bricks), default=top)
+        grid = SpatialGrid(left, top, pitch_x, pitch_y,
+                           int((right - left) // pitch_x) + 1, int((bottom - top) // pitch_y) + 1)
+        for index, brick in enumerate(bricks):
+            if not brick.destroyed:
+                grid.insert(brick, brick.box, index)
+        return grid
+
+    def step(self, controls: Controls = NO_INPUT, dt: float = FIXED_DT) -> list:
+        """Advance the world by dt (FIXED_DT unless stress testing) and return this step's events"""
+        events = self.events = []
+        if self.state != GameState.PLAYING:
+            return events
+        self.frame += 1
+
+        # Update combo timer
+        if self.combo_timer > 0:
+            self.combo_timer -= dt
+        else:
+            self.combo_multiplier = max(1.0, self.combo_multiplier - dt * 0.5)
+
+        if self.speed_boost_timer > 0:
+            self.speed_boost_timer -= dt
+        if self.laser_cooldown > 0:
+            self.laser_cooldown -= dt
+        if controls.fire:
+            self.fire_laser()
+        self.paddle.update(dt, controls)
+
+        profiler = self.profiler
+        if profiler is not None:
+            started = profiler.enter()
+        for ball in self.balls:
+            self.move_ball(ball, dt)
+        self.move_lasers(dt)
+        if profiler is not None:
+            profiler.leave('collisions', started)
+        self.move_powerups(dt)
+
+        self.ball_pool.sweep()
+        self.laser_pool.sweep()
+        self.powerup_pool.sweep()
+
+        if not self.balls:
+            self.lives -= 1
+            events.append(('life_lost', self.lives))
+            if self.lives <= 0:
+                self.state = GameState.GAME_OVER
+                events.append(('game_over', self.score))
+            else:
+                self.new_ball()
+
+        if self.state == GameState.PLAYING and not self.grid:
+            self.level += 1
+            self.state = GameState.LEVEL_COMPLETE
+            events.append(('level_complete', self.level))
+        return events
+
+    def move_ball(self, ball: Ball, dt: float):
+        """Sweep a ball along its path for dt, bouncing at each time of impact
+
+        Walls, the paddle and the bricks are all tested against the ball's
+        whole path rather than its end position, so fast balls and long
+        steps cannot tunnel through anything. The ball moves to the earliest
+        contact, bounces and carries on with the time left, up to
+        MAX_BOUNCES times. Only bricks in the grid cells under the path
+        are tested. A running shield closes the bottom of the playfield and
+        a speed boost stretches the time the ball travels.
+        """
+        if not ball.active:
+            return
+        paddle = self.paddle
+        grid = self.grid
+        radius = ball.radius
+        floor = WORLD_HEIGHT - radius if paddle.shield_timer > 0 else None
+        time_left = dt * SPEED_BOOST_FACTOR if self.speed_boost_timer > 0 else dt
+        for _ in range(MAX_BOUNCES):
+            x = ball.x
+            y = ball.y
+            dx = ball.vx * time_left
+            dy = ball.vy * time_left
+
+            # Earliest impact: (fraction of the move, normal x, normal y, what was hit)
+            impact = None
+            if dx < 0:
+                impact = (max(0.0, (radius - x) / dx), 1.0, 0.0, None) if x + dx < radius else None
+            elif dx > 0 and x + dx > WORLD_WIDTH - radius:
+                impact = (max(0.0, (WORLD_WIDTH - radius - x) / dx), -1.0, 0.0, None)
+            if dy < 0 and y + dy < radius:
+                t = max(0.0, (radius - y) / dy)
+                if impact is None or t < impact[0]:
+                    impact = (t, 0.0, 1.0, None)
+            elif dy > 0 and floor is not None and y + dy > floor:
+                t = max(0.0, (floor - y) / dy)
+                if impact is None or t < impact[0]:
+                    impact = (t, 0.0, -1.0, None)
+
+            # The paddle only catches balls on their way down
+            if dy > 0:
+                hit = sweep_circle_box(x, y, dx, dy, radius, paddle.bounds())
+                if hit is not None and (impact is None or hit[0] < impact[0]):
+                    impact = (hit[0], hit[1], hit[2], paddle)
+
+            path = (min(x, x + dx) - radius, min(y, y + dy) - radius,
+                    max(x, x + dx) + radius, max(y, y + dy) + radius)
+            for brick in grid.query(path):
+                hit = sweep_circle_box(x, y, dx, dy, radius, brick.box)
+                if hit is not None and (impact is None or hit[0] < impact[0]):
+                    impact = (hit[0], hit[1], hit[2], brick)
+
+            if impact is None:
+                ball.x = x + dx
+                ball.y = y + dy
+                break
+
+            t, nx, ny, target = impact
+            ball.x = x + dx * t
+            ball.y = y + dy * t
+            time_left *= 1.0 - t
+            if target is paddle:
+                self.bounce_off_paddle(ball)
+            else:
+                ball.vx, ball.vy = reflect(ball.vx, ball.vy, nx, ny)
+                if target is not None:
+                    self.hit_brick(target)
+
+        if ball.y > WORLD_HEIGHT + 50:
+            ball.active = False
+
+    def bounce_off_paddle(self, ball: Ball):
+        """The hit position along the paddle sets the rebound angle"""
+        paddle = self.paddle
+        hit_pos = (ball.x - paddle.x) / paddle.width
+        hit_pos = max(0, min(1, hit_pos))
+
+        # Convert to angle (-60 to 60 degrees)
+        angle = (hit_pos - 0.5) * 120 * math.pi / 180
+        speed = math.sqrt(ball.vx**2 + ball.vy**2)
+
+        ball.vx = speed * math.sin(angle)
+        ball.vy = -abs(speed * math.cos(angle))
+
+        # Ensure minimum upward velocity
+        if ball.vy > -200:
+            ball.vy = -200
+
+        self.events.append(('paddle_hit', ball.x, ball.y))
+
+    def fire_laser(self):
+        """Shoot a laser from each end of the paddle while the laser power-up runs"""
+        paddle = self.paddle
+        if paddle.laser_timer <= 0 or self.laser_cooldown > 0:
+            return
+        for offset in (8, paddle.width - 8):
+            laser = self.laser_pool.acquire()
+            laser.launch(paddle.x + offset, paddle.y - laser.height)
+        self.laser_cooldown = LASER_COOLDOWN
+        self.events.append(('laser_fired', 2))
+
+    def move_lasers(self, dt: float):
+        """Move lasers up, each hitting the lowest brick in the grid cells under its path"""
+        grid = self.grid
+        for laser in self.lasers:
+            if not laser.active:
+                continue
+            dy = laser.vy * dt
+            half = laser.width / 2
+            path = (laser.x - half, laser.y + dy, laser.x + half, laser.y + laser.height)
+            target = None
+            for brick in grid.query(path):
+                if boxes_overlap(path, brick.box) and (target is None or brick.box[3] > target.box[3]):
+                    target = brick
+            if target is not None:
+                laser.active = False
+                self.hit_brick(target)
+            else:
+                laser.y += dy
+                if laser.y + laser.height < 0:
+                    laser.active = False
+
+    def move_powerups(self, dt: float):
+        """Drop power-ups, applying those the paddle catches"""
+        paddle_box = self.paddle.bounds()
+        for powerup in self.powerups:
+            if not powerup.active:
+                continue
+            powerup.y += powerup.vy * dt
+            if boxes_overlap(powerup.bounds(), paddle_box):
+                powerup.active = False
+                self.collect_powerup(powerup)
+            elif powerup.y > WORLD_HEIGHT:
+                powerup.active = False
+
+    def collect_powerup(self, powerup: PowerUp):
+        kind = powerup.kind
+        if kind == PowerUpType.MULTI_BALL:
+            self.split_balls()
+        elif kind == PowerUpType.SPEED_BOOST:
+            self.speed_boost_timer = SPEED_BOOST_TIME
+        elif kind == PowerUpType.EXTRA_LIFE:
+            self.lives += 1
+        else:
+            self.paddle.apply_powerup(kind)
+        self.events.append(('powerup_collected', kind, powerup.x + powerup.width / 2, powerup.y))
+
+    def split_balls(self):
+        """Add two balls beside every ball in play, turned MULTIBALL_SPREAD either way, up to MAX_BALLS"""
+        balls = self.balls
+        cos = math.cos(MULTIBALL_SPREAD)
+        sin = math.sin(MULTIBALL_SPREAD)
+        # New balls go on the end of the list, so only the balls already in play are split
+        for index in range(len(balls)):
+            ball = balls[index]
+            if not ball.active:
+                continue
+            for turn in (sin, -sin):
+                if len(balls) >= MAX_BALLS:
+                    return
+                self.ball_pool.acquire().launch(ball.x, ball.y, ball.vx * cos - ball.vy * turn,
+                                                ball.vx * turn + ball.vy * cos)
+
+    def hit_brick(self, brick: Brick):
+        """Damage a brick, scoring it and taking it out of the grid once destroyed
+
+        A destroyed brick drops a power-up with the settings' powerup_chance.
+        """
+        if brick.hit():
+            self.grid.remove(brick, brick.box)
+            points = brick.tier * 50 * int(self.combo_multiplier)
+            self.score += points
+            self.combo_multiplier = min(5.0, self.combo_multiplier + 0.2)
+            self.combo_timer = 3.0
+            self.events.append(('brick_destroyed', brick, points))
+            if self.rng.random() < self.settings.powerup_chance:
+                powerup = self.powerup_pool.acquire()
+                powerup.launch(brick.x + brick.width / 2, brick.y + brick.height / 2,
+                               POWERUP_KINDS[self.rng.randrange(len(POWERUP_KINDS))])
+                self.events.append(('powerup_spawned', powerup))
+        else:
+            self.events.append(('brick_hit', brick))
+
+    def digest(self) -> str:
+        """Short hash of the game state, equal for runs that played out identically"""
+        state = (self.state.value, self.frame, self.score, self.lives, self.level,
+                 round(self.combo_multiplier, 9), round(self.paddle.x, 6), round(self.paddle.width, 6),
+                 round(self.speed_boost_timer, 6), round(self.paddle.laser_timer, 6),
+                 round(self.paddle.shield_timer, 6),
+                 tuple((round(b.x, 6), round(b.y, 6), round(b.vx, 6), round(b.vy, 6)) for b in self.balls),
+                 tuple((round(laser.x, 6), round(laser.y, 6)) for laser in self.lasers),
+                 tuple((p.kind.name, round(p.x, 6), round(p.y, 6)) for p in self.powerups),
+                 tuple(brick.health for brick in self.bricks))
+        return hashlib.sha1(repr(state).encode()).hexdigest()[:16]
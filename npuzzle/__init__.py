@@ -0,0 +1,15 @@
+from .state import (PuzzleSize, PuzzleContext, NPuzzleState, encode_board, decode_board, goal_board, goal_key,
+                    puzzle_context, count_inversions, walk_path, apply_path, invert_path)
+from .engine import SearchAlgorithm, OPTIMAL_ALGORITHMS, STREAMING_ALGORITHMS, AdvancedAIEngine
+from .reduction import reduction_solve, shorten_path
+from .pdb import PatternDatabase, build_pattern_databases, get_pattern_database
+from .generate import (EXACT_DEPTH_SIZES, depth_layers, depth_distribution, random_solvable_board,
+                       random_board_at_distance, random_walk_board)
+from .cache import SolutionCache, canonical_key
+from .jobs import SolverJob, CancelToken
+from .trace import SearchTrace
+from .nodes import NodeStore, BucketQueue
+from .solutions import (encode_moves, decode_moves, write_solutions, load_solutions, find_solution,
+                        validate_solutions)
+from .batch import BATCH_HEURISTICS, batch_heuristics, boards_array, keys_array
+from .evaluate import solved_corpus, evaluate_heuristics
@@ -0,0 +1,153 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Only the batch heuristics need NumPy
+    np = None
+
+from .state import NPuzzleState, puzzle_context
+
+# Batch heuristic name -> NPuzzleState method it must agree with
+REFERENCE_METHODS = {
+    'manhattan': NPuzzleState.manhattan_distance,
+    'euclidean': NPuzzleState.euclidean_distance,
+    'misplaced': NPuzzleState.misplaced_tiles,
+    'linear_conflict': NPuzzleState.linear_conflict,
+}
+BATCH_HEURISTICS = tuple(REFERENCE_METHODS)
+
+# Rows per block, so the (rows, pairs) temporaries of linear conflict stay small
+CHUNK_ROWS = 1 << 15
+
+_TABLES = {}
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Batch heuristics require NumPy")
+
+class BatchTables:
+    """NumPy lookup tables for one board size, indexed [tile, cell] or by tile"""
+
+    def __init__(self, size):
+        ctx = puzzle_context(size)
+        cells = ctx.cells
+        self.size = size
+        self.cells = cells
+        self.goal = np.array(list(range(1, cells)) + [0], dtype=np.uint8)
+        self.manhattan = np.array(ctx.manhattan, dtype=np.int32)
+        euclidean = np.zeros((cells, cells), dtype=np.float64)
+        for tile in range(1, cells):
+            for cell in range(cells):
+                euclidean[tile, cell] = math.sqrt((cell // size - ctx.target_row[tile]) ** 2
+                                                  + (cell % size - ctx.target_col[tile]) ** 2)
+        self.euclidean = euclidean
+        # Goal row and column per tile, -1 for the blank so it never matches a line
+        self.target_row = np.array(ctx.target_row, dtype=np.int16)
+        self.target_col = np.array(ctx.target_col, dtype=np.int16)
+        # Every ordered pair of cells sharing a row (first, second, row) and a column (first, second, col)
+        row_pairs = [(row * size + j, row * size + k, row)
+                     for row in range(size) for j in range(size) for k in range(j + 1, size)]
+        col_pairs = [(i * size + col, k * size + col, col)
+                     for col in range(size) for i in range(size) for k in range(i + 1, size)]
+        self.row_pairs = np.array(row_pairs, dtype=np.intp).T.copy()
+        self.col_pairs = np.array(col_pairs, dtype=np.intp).T.copy()
+
+def batch_tables(size):
+    """Shared BatchTables for a board size"""
+    _require_numpy()
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = _TABLES[size] = BatchTables(size)
+    return tables
+
+def boards_array(boards, size):
+    """(N, size*size) uint8 array from NPuzzleStates, flat tile lists or list-of-lists boards"""
+    _require_numpy()
+    cells = size * size
+    if isinstance(boards, np.ndarray):
+        array = boards.astype(np.uint8, copy=False)
+    else:
+        rows = []
+        for board in boards:
+            if isinstance(board, NPuzzleState):
+                rows.append(board.tiles())
+            elif board and isinstance(board[0], (list, tuple)):
+                rows.append([tile for row in board for tile in row])
+            else:
+                rows.append(list(board))
+        array = np.array(rows, dtype=np.uint8).reshape(-1, cells)
+    if array.ndim != 2 or array.shape[1] != cells:
+        raise ValueError(f"Expected an (N, {cells}) array of boards, got shape {array.shape}")
+    return array
+
+def keys_array(keys, size):
+    """(N, size*size) uint8 array from packed keys, decoded in bulk"""
+    _require_numpy()
+    ctx = puzzle_context(size)
+    width = (ctx.cells * ctx.bits + 7) // 8
+    raw = np.frombuffer(b''.join(key.to_bytes(width, 'little') for key in keys), dtype=np.uint8)
+    raw = raw.reshape(-1, width)
+    if ctx.bits == 8:
+        return raw[:, :ctx.cells].copy()
+    # Two 4-bit cells per byte, the lower cell in the low nibble
+    tiles = np.empty((raw.shape[0], width * 2), dtype=np.uint8)
+    tiles[:, 0::2] = raw & 0x0F
+    tiles[:, 1::2] = raw >> 4
+    return tiles[:, :ctx.cells].copy()
+
+def batch_manhattan(boards, size):
+    """Manhattan distance of every board, as an int32 vector"""
+    tables = batch_tables(size)
+    boards = boards_array(boards, size)
+    return tables.manhattan[boards, np.arange(tables.cells)].sum(axis=1, dtype=np.int32)
+
+def batch_euclidean(boards, size):
+    """Summed straight-line distance of every tile to its goal cell, as a float64 vector"""
+    tables = batch_tables(size)
+    boards = boards_array(boards, size)
+    return tables.euclidean[boards, np.arange(tables.cells)].sum(axis=1)
+
+def batch_misplaced(boards, size):
+    """Number of non-blank tiles off their goal cell, as an int32 vector"""
+    tables = batch_tables(size)
+    boards = boards_array(boards, size)
+    return ((boards != tables.goal) & (boards != 0)).sum(axis=1, dtype=np.int32)
+
+def _line_conflicts(boards, tables):
+    """Pairs of tiles in their goal row (column) but in reversed order, per board"""
+    conflicts = np.zeros(boards.shape[0], dtype=np.int32)
+    for (first, second, line), home, order in ((tables.row_pairs, tables.target_row, tables.target_col),
+                                               (tables.col_pairs, tables.target_col, tables.target_row)):
+        a = boards[:, first]
+        b = boards[:, second]
+        in_line = (home[a] == line) & (home[b] == line)
+        conflicts += (in_line & (order[a] > order[b])).sum(axis=1, dtype=np.int32)
+    return conflicts
+
+def batch_linear_conflict(boards, size):
+    """Manhattan distance plus two moves per conflicting pair, as an int32 vector"""
+    tables = batch_tables(size)
+    boards = boards_array(boards, size)
+    result = np.empty(boards.shape[0], dtype=np.int32)
+    manhattan = tables.manhattan
+    cells = np.arange(tables.cells)
+    for start in range(0, boards.shape[0], CHUNK_ROWS):
+        block = boards[start:start + CHUNK_ROWS]
+        result[start:start + CHUNK_ROWS] = (manhattan[block, cells].sum(axis=1, dtype=np.int32)
+                                            + 2 * _line_conflicts(block, tables))
+    return result
+
+BATCH_FUNCTIONS = {
+    'manhattan': batch_manhattan,
+    'euclidean': batch_euclidean,
+    'misplaced': batch_misplaced,
+    'linear_conflict': batch_linear_conflict,
+}
+
+def batch_heuristics(boards, size, names=BATCH_HEURISTICS):
+    """Dict of heuristic name -> vector of values, one entry per board"""
+    boards = boards_array(boards, size)
+    unknown = set(names) - set(BATCH_FUNCTIONS)
+    if unknown:
+        raise ValueError(f"Unknown heuristics {sorted(unknown)}, expected some of {BATCH_HEURISTICS}")
+    return {name: BATCH_FUNCTIONS[name](boards, size) for name in names}
@@ -0,0 +1,157 @@
+import argparse
+import heapq
+import random
+import time
+import tracemalloc
+
+from .state import MOVES, NPuzzleState, goal_board
+from .engine import AdvancedAIEngine
+from .generate import random_walk_board
+
+class ListPuzzleState:
+    """Original list-of-lists state, kept as the 'before' side of the benchmark"""
+
+    def __init__(self, board, size, parent=None, move=None, depth=0):
+        self.board = [row[:] for row in board]  # Deep copy
+        self.size = size
+        self.parent = parent
+        self.move = move
+        self.depth = depth
+        self.empty_pos = self.find_empty()
+        self.hash_value = hash(tuple(tuple(row) for row in self.board))
+
+    def find_empty(self):
+        """Find the position of the empty tile (0)"""
+        for i in range(self.size):
+            for j in range(self.size):
+                if self.board[i][j] == 0:
+                    return (i, j)
+        return None
+
+    def __hash__(self):
+        return self.hash_value
+
+    def __eq__(self, other):
+        return isinstance(other, ListPuzzleState) and self.board == other.board
+
+    def __lt__(self, other):
+        return False
+
+    def is_goal(self):
+        """Check if this is the goal state"""
+        return self.board == goal_board(self.size)
+
+    def manhattan_distance(self):
+        """Calculate Manhattan distance heuristic"""
+        distance = 0
+        for i in range(self.size):
+            for j in range(self.size):
+                if self.board[i][j] != 0:
+                    value = self.board[i][j]
+                    target_row = (value - 1) // self.size
+                    target_col = (value - 1) % self.size
+                    distance += abs(i - target_row) + abs(j - target_col)
+        return distance
+
+    def get_neighbors(self):
+        """Get all possible neighbor states"""
+        neighbors = []
+        row, col = self.empty_pos
+        for move_name, dr, dc in MOVES:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < self.size and 0 <= new_col < self.size:
+                new_board = [r[:] for r in self.board]
+                new_board[row][col], new_board[new_row][new_col] = \
+                    new_board[new_row][new_col], new_board[row][col]
+                neighbors.append(ListPuzzleState(new_board, self.size, self, move_name, self.depth + 1))
+        return neighbors
+
+    def get_path(self):
+        """Get the path from start to this state"""
+        path = []
+        current = self
+        while current.parent is not None:
+            path.append(current.move)
+            current = current.parent
+        return path[::-1]
+
+def object_a_star(initial_state, heuristic_func, max_nodes, stats):
+    """The engine's original A*: state objects on a heapq, with a g_score dict and a visited set"""
+    if initial_state.is_goal():
+        return initial_state.get_path()
+    open_set = [(heuristic_func(initial_state), 0, initial_state)]
+    g_score = {initial_state: 0}
+    visited = set()
+    while open_set and len(visited) < max_nodes:
+        _, current_g, current = heapq.heappop(open_set)
+        if current in visited:
+            continue
+        visited.add(current)
+        stats['nodes_explored'] += 1
+        if current.is_goal():
+            return current.get_path()
+        for neighbor in current.get_neighbors():
+            if neighbor in visited:
+                continue
+            tentative_g = current_g + 1
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                g_score[neighbor] = tentative_g
+                heapq.heappush(open_set, (tentative_g + heuristic_func(neighbor), tentative_g, neighbor))
+    return None
+
+def run_state_benchmark(state_class, boards, size, max_nodes, node_store=False):
+    """Run A* (Manhattan) over the boards and return (nodes, seconds, solution lengths, peak bytes)
+
+    node_store runs the engine's A* instead of object_a_star.
+    """
+    engine = AdvancedAIEngine()
+    nodes = 0
+    elapsed = 0.0
+    lengths = []
+    peak = 0
+    tracemalloc.start()
+    for board in boards:
+        state = state_class(board, size)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        if node_store:
+            path = engine.a_star_search(state, state_class.manhattan_distance, max_nodes=max_nodes)
+            searched = engine.stats['nodes_explored']
+        else:
+            stats = {'nodes_explored': 0}
+            path = object_a_star(state, state_class.manhattan_distance, max_nodes, stats)
+            searched = stats['nodes_explored']
+        elapsed += time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+        nodes += searched
+        lengths.append(len(path) if path is not None else None)
+    tracemalloc.stop()
+    return nodes, elapsed, lengths, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare node throughput and memory of the puzzle states and A* node stores")
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--instances', type=int, default=10)
+    parser.add_argument('--walk', type=int, default=40, help="random-walk length used to scramble each board")
+    parser.add_argument('--max-nodes', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    boards = [random_walk_board(args.size, args.walk, rng) for _ in range(args.instances)]
+
+    results = {}
+    for label, state_class, node_store in (('list board', ListPuzzleState, False),
+                                           ('packed int', NPuzzleState, False),
+                                           ('node store', NPuzzleState, True)):
+        nodes, elapsed, lengths, peak = run_state_benchmark(state_class, boards, args.size, args.max_nodes, node_store)
+        results[label] = lengths
+        print(f"{label:12} nodes={nodes:>9,} time={elapsed:8.3f}s nodes/sec={int(nodes / max(elapsed, 1e-9)):>10,}"
+              f" peak={peak / 2 ** 20:8.1f} MiB")
+
+    if len(set(map(tuple, results.values()))) > 1:
+        print("WARNING: solution lengths differ between implementations")
+
+if __name__ == "__main__":
+    main()
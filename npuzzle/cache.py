@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .state import MOVE_INDEX, MOVES, TRANSPOSED_MOVE, transpose_key
+
+DEFAULT_CACHE_PATH = os.environ.get('NPUZZLE_CACHE',
+                                    os.path.join(os.path.dirname(__file__), 'cache_data', 'solutions.sqlite'))
+
+def canonical_key(key, size):
+    """(canonical key, transposed): the smaller of a key and its transpose"""
+    mirrored = transpose_key(key, size)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+class SolutionCache:
+    """Optimal next moves for boards seen on earlier solutions, in an LRU dict backed by SQLite
+
+    Every board along a stored optimal path gets an entry of (next move,
+    remaining distance), keyed by its canonical form under the transpose
+    symmetry, so a lookup can start anywhere on an old path (or its mirror
+    image) and chain entries to the goal. Only store paths that are known
+    to be optimal, otherwise chained moves may not reach the goal.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_entries=100000):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'disk_hits': 0, 'stored': 0}
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS solutions (size INTEGER, key TEXT, move INTEGER, "
+                                 "distance INTEGER, PRIMARY KEY (size, key))")
+                self._db.commit()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Solution cache {path} unavailable, keeping it in memory only: {e}")
+                self._db = None
+                self.path = None
+
+    def _remember(self, entry_key, entry):
+        self.memory[entry_key] = entry
+        self.memory.move_to_end(entry_key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _entry(self, size, key):
+        """(move index, distance) for a canonical key, from memory or disk"""
+        entry_key = (size, key)
+        entry = self.memory.get(entry_key)
+        if entry is not None:
+            self.memory.move_to_end(entry_key)
+            return entry, 'memory_hits'
+        if self._db is not None:
+            row = self._db.execute("SELECT move, distance FROM solutions WHERE size = ? AND key = ?",
+                                   (size, format(key, 'x'))).fetchone()
+            if row is not None:
+                entry = (row[0], row[1])
+                self._remember(entry_key, entry)
+                return entry, 'disk_hits'
+        return None, None
+
+    def lookup(self, state):
+        """Cached optimal move list for a state, or None"""
+        size = state.size
+        ctx = state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        key, blank = state.key, state.blank
+        path = []
+        limit = None
+        with self._lock:
+            while key != ctx.goal_key:
+                canonical, transposed = canonical_key(key, size)
+                entry, tier = self._entry(size, canonical)
+                if entry is None or (limit is not None and len(path) >= limit):
+                    if path:
+                        # A broken chain means the disk tier was changed underneath us
+                        break
+                    self.stats['misses'] += 1
+                    return None
+                move, distance = entry
+                if limit is None:
+                    limit = distance
+                    self.stats[tier] += 1
+                if transposed:
+                    move = TRANSPOSED_MOVE[move]
+                _, dr, dc = MOVES[move]
+                target = blank + dr * size + dc
+                tile = (key >> (target * bits)) & mask
+                key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                blank = target
+                path.append(MOVES[move][0])
+            else:
+                self.stats['hits'] += 1
+                return path
+            self.stats['misses'] += 1
+            return None
+
+    def store(self, state, path):
+        """Record an optimal move list from state, one entry per board along it"""
+        size = state.size
+        ctx = state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        key, blank = state.key, state.blank
+        entries = []
+        for step, name in enumerate(path):
+            move = MOVE_INDEX[name]
+            canonical, transposed = canonical_key(key, size)
+            entries.append(((size, canonical), (TRANSPOSED_MOVE[move] if transposed else move, len(path) - step)))
+            _, dr, dc = MOVES[move]
+            target = blank + dr * size + dc
+            tile = (key >> (target * bits)) & mask
+            key = key - (tile << (target * bits)) + (tile << (blank * bits))
+            blank = target
+        if key != ctx.goal_key:
+            raise ValueError("Path does not lead to the goal")
+        with self._lock:
+            for entry_key, entry in entries:
+                self._remember(entry_key, entry)
+            if self._db is not None and entries:
+                self._db.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                                     [(size, format(canonical, 'x')) + entry for (_, canonical), entry in entries])
+                self._db.commit()
+            self.stats['stored'] += len(entries)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,236 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from .state import NPuzzleState
+from .engine import AdvancedAIEngine, OPTIMAL_ALGORITHMS, SearchAlgorithm
+from .cache import SolutionCache
+from .solutions import load_solutions, validate_solutions, write_solutions
+from .trace import SearchTrace
+from .parallel import to_rows
+from . import generate, suite
+
+ALGORITHM_NAMES = tuple(algorithm.name.lower() for algorithm in SearchAlgorithm)
+
+def parse_algorithm(name):
+    try:
+        return SearchAlgorithm[name.upper().replace('-', '_')]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"unknown algorithm '{name}', expected one of: {', '.join(ALGORITHM_NAMES)}")
+
+def parse_algorithms(name):
+    """One algorithm as a list, or every SearchAlgorithm for 'all'"""
+    if name.lower() == 'all':
+        return list(SearchAlgorithm)
+    return [parse_algorithm(name)]
+
+def cmd_solve(args):
+    rows = to_rows(args.tiles)
+    state = NPuzzleState(rows, len(rows))
+    if not state.is_solvable():
+        print(json.dumps({'solvable': False}))
+        return 1
+    trace = SearchTrace(histograms=not args.no_histograms) if args.trace or args.chrome_trace else None
+    engine = AdvancedAIEngine(trace=trace)
+    cache = SolutionCache(args.cache) if args.cache else None
+    start = time.perf_counter()
+    path = cache.lookup(state) if cache else None
+    if path is None:
+        path = engine.solve(state, args.algorithm, args.weight)
+        if cache and path and (args.algorithm in OPTIMAL_ALGORITHMS or engine.stats.get('optimal', False)):
+            cache.store(state, path)
+    stats = dict(engine.stats, time_elapsed=time.perf_counter() - start)
+    if cache:
+        stats['cache'] = cache.stats
+        cache.close()
+    result = {'algorithm': args.algorithm.name, 'path': path, 'stats': stats}
+    if trace is not None:
+        result['trace'] = trace.summary()
+        if args.trace:
+            trace.to_json(args.trace)
+        if args.chrome_trace:
+            trace.to_chrome_trace(args.chrome_trace)
+    print(json.dumps(result))
+    return 0 if path is not None else 1
+
+def cmd_bench(args):
+    instances = []
+    for name in args.set or (() if args.korf else ('eight-easy',)):
+        instances.extend(suite.generated_instances(name, args.seed))
+    if args.korf:
+        korf = suite.load_korf_instances(args.korf)
+        instances.extend(korf[:args.korf_limit] if args.korf_limit else korf)
+    algorithms = args.algorithm or [SearchAlgorithm.A_STAR_MANHATTAN, SearchAlgorithm.IDA_STAR]
+
+    def progress(record):
+        if args.quiet:
+            return
+        length = record['solution_length'] if record['solution_length'] is not None else '-'
+        wall = record['wall_time'] or 0.0
+        print(f"{record['instance']:18} {record['algorithm']:24} {record['status']:8} len={length!s:>3} "
+              f"nodes={record['nodes'] or 0:>9,} time={wall:7.3f}s rss={record['peak_rss_kb'] or 0:>8,}KB",
+              file=sys.stderr)
+
+    records = suite.run_suite(instances, algorithms, args.time_limit, progress)
+    if not args.no_validate:
+        report = suite.validate_records(instances, records)
+        print(f"validated {report['solutions']} solutions: {report['valid']} reach the goal", file=sys.stderr)
+    if args.solutions:
+        write_solutions(args.solutions, ((tiles, moves) for _, tiles, moves in suite.solution_records(instances, records)))
+    if args.json:
+        suite.write_json(args.json, records, suite.suite_metadata(args.time_limit))
+    if args.csv:
+        suite.write_csv(args.csv, records)
+    if not args.json and not args.csv:
+        json.dump(records, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        return report_regressions(suite.compare_results(suite.load_results(args.baseline), records, args.tolerance))
+    return 0
+
+def report_regressions(regressions):
+    for regression in regressions:
+        print(f"REGRESSION {regression['instance']} {regression['algorithm']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']}")
+    if not regressions:
+        print("no regressions")
+    return 1 if regressions else 0
+
+def cmd_compare(args):
+    regressions = suite.compare_results(suite.load_results(args.baseline), suite.load_results(args.current),
+                                        args.tolerance)
+    return report_regressions(regressions)
+
+def cmd_generate(args):
+    rng = random.Random(args.seed)
+    out = sys.stdout if args.out == '-' else open(args.out, 'w')
+    try:
+        for _ in range(args.count):
+            if args.distance is not None:
+                tiles = generate.random_tiles_at_distance(args.size, args.distance, rng)
+            elif args.walk is not None:
+                tiles = generate.random_walk_tiles(args.size, args.walk, rng)
+            else:
+                tiles = generate.random_solvable_tiles(args.size, rng)
+            out.write(' '.join(map(str, tiles)) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+def cmd_heuristics(args):
+    from . import evaluate
+    if args.corpus:
+        size, boards, distances = evaluate.load_corpus(args.corpus)
+    else:
+        size = args.size
+        boards, distances = evaluate.solved_corpus(size, args.count, args.seed)
+    if args.save_corpus:
+        evaluate.write_corpus(args.save_corpus, boards, distances)
+    report = evaluate.evaluate_heuristics(boards, distances, size, args.heuristic or evaluate.BATCH_HEURISTICS)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'size': size, 'heuristics': report}, handle, indent=2)
+    print(f"{boards.shape[0]:,} solved {size}x{size} boards")
+    print(evaluate.format_report(report))
+    return 1 if any(row['mismatches'] for row in report.values()) else 0
+
+def cmd_validate(args):
+    records = []
+    for path in args.files:
+        records.extend(load_solutions(path))
+    report = validate_solutions(records)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"{report['solutions']:,} solutions, {report['moves']:,} moves replayed in {report['seconds']:.3f}s "
+              f"({report['moves_per_sec']:,.0f} moves/s)")
+        print(f"valid {report['valid']:,}  illegal move {report['illegal_move']:,}  not at goal {report['not_goal']:,}")
+        for index in report['failures'][:20]:
+            size, tiles, moves = records[index]
+            print(f"FAILED #{index}: {size}x{size} {' '.join(map(str, tiles))} ({len(moves)} moves)")
+    return 1 if report['failures'] else 0
+
+def cmd_states(args):
+    from .bench import main as bench_main
+    bench_main(args.rest)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m npuzzle', description="Headless N-puzzle solver and benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    solve = sub.add_parser('solve', help="solve one board given as flat tiles (0 is the blank)")
+    solve.add_argument('tiles', nargs='+', type=int)
+    solve.add_argument('--algorithm', type=parse_algorithm, default=SearchAlgorithm.A_STAR_MANHATTAN,
+                       help=f"one of: {', '.join(ALGORITHM_NAMES)}")
+    solve.add_argument('--cache', help="SQLite solution cache to consult and fill")
+    solve.add_argument('--weight', type=float, help="heuristic weight for weighted_a_star and anytime_ara_star")
+    solve.add_argument('--trace', help="write per-phase timings, peak sizes and IDA* iterations as JSON")
+    solve.add_argument('--chrome-trace', help="write the trace in Chrome trace-event format (chrome://tracing, Perfetto)")
+    solve.add_argument('--no-histograms', action='store_true', help="skip the IDA* per-iteration f histograms")
+    solve.set_defaults(handler=cmd_solve)
+
+    bench = sub.add_parser('bench', help="run algorithms over benchmark sets and record results")
+    bench.add_argument('--set', action='append', choices=sorted(suite.GENERATED_SETS),
+                       help="generated instance set (repeatable, default eight-easy)")
+    bench.add_argument('--korf', help="file with Korf 100 15-puzzle instances")
+    bench.add_argument('--korf-limit', type=int, default=None, help="only run the first N Korf instances")
+    bench.add_argument('--algorithm', type=parse_algorithms, action='extend',
+                       help="algorithm to run, or 'all' for every one (repeatable, "
+                            "default a_star_manhattan and ida_star)")
+    bench.add_argument('--time-limit', type=float, default=10.0, help="seconds per instance and algorithm")
+    bench.add_argument('--seed', type=int, default=2024)
+    bench.add_argument('--json', help="write results as JSON")
+    bench.add_argument('--csv', help="write results as CSV")
+    bench.add_argument('--baseline', help="JSON results to check this run against")
+    bench.add_argument('--tolerance', type=float, default=0.15)
+    bench.add_argument('--quiet', action='store_true')
+    bench.add_argument('--solutions', help="write the solved boards and their moves in the solutions format")
+    bench.add_argument('--no-validate', action='store_true',
+                       help="skip replaying the solutions (the replay needs NumPy)")
+    bench.set_defaults(handler=cmd_bench)
+
+    compare = sub.add_parser('compare', help="flag regressions between two JSON result files")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--tolerance', type=float, default=0.15)
+    compare.set_defaults(handler=cmd_compare)
+
+    gen = sub.add_parser('generate', help="write random solvable boards, one per line")
+    gen.add_argument('--size', type=int, default=3)
+    gen.add_argument('--count', type=int, default=100)
+    mode = gen.add_mutually_exclusive_group()
+    mode.add_argument('--distance', type=int, help="exact optimal solution length of every board")
+    mode.add_argument('--walk', type=int, help="random-walk scramble length instead of uniform boards")
+    gen.add_argument('--seed', type=int, default=None)
+    gen.add_argument('--out', default='-', help="output file (default stdout)")
+    gen.set_defaults(handler=cmd_generate)
+
+    heuristics = sub.add_parser('heuristics', help="accuracy and throughput of the batch heuristics on a solved corpus")
+    heuristics.add_argument('--size', type=int, default=3)
+    heuristics.add_argument('--count', type=int, default=None,
+                            help="boards in the corpus (default every 8-puzzle board, or 100 walks)")
+    heuristics.add_argument('--corpus', help="read the corpus from a file written by --save-corpus")
+    heuristics.add_argument('--save-corpus', help="write the corpus as 'distance tiles...' lines")
+    heuristics.add_argument('--heuristic', action='append', choices=('manhattan', 'euclidean', 'misplaced',
+                                                                     'linear_conflict'))
+    heuristics.add_argument('--seed', type=int, default=2024)
+    heuristics.add_argument('--json', help="write the report as JSON")
+    heuristics.set_defaults(handler=cmd_heuristics)
+
+    validate = sub.add_parser('validate', help="replay saved solutions and check that they reach the goal")
+    validate.add_argument('files', nargs='+', help="files in the solutions format (see bench --solutions)")
+    validate.add_argument('--json', action='store_true', help="print the report as JSON")
+    validate.set_defaults(handler=cmd_validate)
+
+    states = sub.add_parser('states', help="list-vs-packed state throughput benchmark (options pass through)")
+    states.set_defaults(handler=cmd_states)
+
+    args, rest = parser.parse_known_args(argv)
+    if rest and args.command != 'states':
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.rest = rest
+    return args.handler(args)
@@ -0,0 +1,1056 @@
+import heapq
+import sys
+import time
+from collections import deque
+from enum import Enum
+
+from .state import INVERSE_MOVE, MOVES, NPuzzleState, StateHeuristic, incremental_heuristic, puzzle_context
+from .nodes import BucketQueue, NodeStore
+from .reduction import reduction_solve, shorten_path
+from .trace import TracedEvaluator
+
+class SearchAlgorithm(Enum):
+    BFS = "Breadth-First Search"
+    DFS = "Depth-First Search"
+    A_STAR_MANHATTAN = "A* (Manhattan Distance)"
+    A_STAR_EUCLIDEAN = "A* (Euclidean Distance)"
+    A_STAR_LINEAR_CONFLICT = "A* (Linear Conflict)"
+    GREEDY_MANHATTAN = "Greedy (Manhattan)"
+    IDA_STAR = "IDA* (Iterative Deepening A*)"
+    A_STAR_PDB = "A* (Pattern Database)"
+    IDA_STAR_PDB = "IDA* (Pattern Database)"
+    PARALLEL_IDA_STAR = "Parallel IDA* (multi-core)"
+    BIDIRECTIONAL_BFS = "Bidirectional BFS"
+    MEMORY_BOUNDED_A_STAR = "Memory-Bounded A* (frontier-limited)"
+    WEIGHTED_A_STAR = "Weighted A* (bounded suboptimal)"
+    ANYTIME_ARA_STAR = "Anytime ARA* (improving)"
+    REAL_TIME_LRTA_STAR = "Real-Time LRTA* (move by move)"
+
+# Algorithms whose solutions are always shortest; MEMORY_BOUNDED_A_STAR also
+# qualifies when it reports stats['optimal']
+OPTIMAL_ALGORITHMS = frozenset((
+    SearchAlgorithm.BFS, SearchAlgorithm.A_STAR_MANHATTAN, SearchAlgorithm.A_STAR_EUCLIDEAN,
+    SearchAlgorithm.IDA_STAR, SearchAlgorithm.A_STAR_PDB, SearchAlgorithm.IDA_STAR_PDB,
+    SearchAlgorithm.PARALLEL_IDA_STAR, SearchAlgorithm.BIDIRECTIONAL_BFS,
+))
+
+# Algorithms that report partial results while they run: improved solutions
+# through on_solution(path, bound), committed moves through on_move(name)
+STREAMING_ALGORITHMS = frozenset((SearchAlgorithm.ANYTIME_ARA_STAR, SearchAlgorithm.REAL_TIME_LRTA_STAR))
+
+# Heuristic inflation for WEIGHTED_A_STAR, and the starting inflation of ANYTIME_ARA_STAR
+DEFAULT_WEIGHT = 2.0
+DEFAULT_ANYTIME_WEIGHT = 3.0
+
+def _slide(key, blank, target, bits, mask):
+    """Packed key after the tile at target slides into the blank"""
+    tile = (key >> (target * bits)) & mask
+    return key - (tile << (target * bits)) + (tile << (blank * bits))
+
+def _walk_back(visited, key, blank, size):
+    """Follow stored parent moves from key back to the root of `visited`
+
+    Returns the move indices in root-to-key order.
+    """
+    ctx = puzzle_context(size)
+    bits = ctx.bits
+    mask = ctx.mask
+    moves = []
+    move = visited[key]
+    while move >= 0:
+        moves.append(move)
+        # The blank reached `blank` by `move`, so undo it by moving the blank back
+        _, dr, dc = MOVES[move]
+        previous = blank - dr * size - dc
+        key = _slide(key, blank, previous, bits, mask)
+        blank = previous
+        move = visited[key]
+    moves.reverse()
+    return moves
+
+def _visited_bytes(*maps):
+    """Rough size of key -> move dicts: the table itself plus one packed key per entry"""
+    total = 0
+    for visited in maps:
+        if visited:
+            total += sys.getsizeof(visited) + len(visited) * sys.getsizeof(next(iter(visited)))
+    return total
+
+class SearchCancelled(Exception):
+    """Raised inside a search when its should_stop callback asks it to give up"""
+
+def threshold_search(tiles, key, blank, size, h, g, last_move, threshold, evaluator, stats,
+                     transposition_size=0, should_stop=None, histogram=None, trace=None):
+    """Depth-first search of every path whose f stays within threshold
+
+    Slides tiles in place on the flat `tiles` list starting from cost g, never
+    undoing last_move. Returns (moves, next_threshold): the move indices that
+    reach the goal (or None) and the smallest f that exceeded the threshold.
+    The board is restored unless a path is returned. A histogram dict, when
+    given, counts the pruned nodes by their f value. A SearchTrace, when
+    given, times the whole pass as the expand phase (less the heuristic calls
+    nested in it) and reports the DFS stack depth as the frontier: sampled
+    every 1024 nodes, and its peak, the deepest g reached, at the end.
+    """
+    base = g
+    if trace is not None:
+        started = trace.enter()
+    try:
+        ctx = puzzle_context(size)
+        bits = ctx.bits
+        goal = ctx.goal_key
+        move_table = ctx.moves
+        table = {} if transposition_size else None
+        next_threshold = float('inf')
+        root_undo = INVERSE_MOVE[last_move] if last_move is not None else None
+        nodes = 0
+
+        # One entry per level: next move to try, heuristic, and how we got here
+        cursors = [0]
+        h_values = [h]
+        moves = []
+        blanks = []
+
+        while cursors:
+            options = move_table[blank]
+            cursor = cursors[-1]
+
+            if cursor == len(options):
+                # Backtrack: slide the tile back into the cell it came from
+                cursors.pop()
+                h_values.pop()
+                if moves:
+                    moves.pop()
+                    previous = blanks.pop()
+                    tile = tiles[previous]
+                    tiles[blank] = tile
+                    tiles[previous] = 0
+                    key = key - (tile << (previous * bits)) + (tile << (blank * bits))
+                    evaluator.pop(tile, blank, previous)
+                    blank = previous
+                continue
+
+            cursors[-1] = cursor + 1
+            move, target = options[cursor]
+            if move == (INVERSE_MOVE[moves[-1]] if moves else root_undo):
+                continue
+
+            nodes += 1
+            if not nodes & 1023:
+                if trace is not None:
+                    trace.frontier(len(cursors))
+                if should_stop is not None:
+                    # Publish the count so far, so whoever decides can report progress
+                    stats['nodes_explored'] += nodes
+                    nodes = 0
+                    if should_stop():
+                        raise SearchCancelled()
+
+            tile = tiles[target]
+            new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+            h = evaluator.delta(h_values[-1], tile, target, blank, key, new_key)
+            g = base + len(moves) + 1
+            f = g + h
+            if f > threshold:
+                if f < next_threshold:
+                    next_threshold = f
+                if histogram is not None:
+                    histogram[f] = histogram.get(f, 0) + 1
+                continue
+
+            if new_key == goal:
+                moves.append(move)
+                stats['nodes_explored'] += nodes
+                stats['max_depth'] = max(stats['max_depth'], g)
+                return moves, next_threshold
+
+            if table is not None:
+                seen = table.get(new_key)
+                if seen is not None and seen <= g:
+                    continue
+                if seen is not None or len(table) < transposition_size:
+                    table[new_key] = g
+
+            # Descend: the tile slides into the blank and the blank takes its cell
+            evaluator.push(tile, target, blank)
+            tiles[blank] = tile
+            tiles[target] = 0
+            moves.append(move)
+            blanks.append(blank)
+            blank = target
+            key = new_key
+            cursors.append(0)
+            h_values.append(h)
+            if g > stats['max_depth']:
+                stats['max_depth'] = g
+
+        stats['nodes_explored'] += nodes
+        return None, next_threshold
+    finally:
+        if trace is not None:
+            trace.frontier(stats['max_depth'] - base)
+            trace.leave('expand', started)
+
+class AdvancedAIEngine:
+    """Advanced AI Engine with multiple search algorithms"""
+
+    def __init__(self, monitor=None, trace=None):
+        self.stats = {
+            'nodes_explored': 0,
+            'max_depth': 0,
+            'time_elapsed': 0,
+            'memory_used': 0,
+            'solution_length': 0,
+            'suboptimality_bound': None
+        }
+        # Optional object with poll(stats, bound, frontier) -> bool, consulted
+        # every 1024 expansions; returning True cancels the running search
+        self.monitor = monitor
+        # Optional SearchTrace: each solve() becomes a traced run, and the
+        # searches take their heap, heuristic, successor and visited-set
+        # primitives from the helpers below so the trace can time them
+        self.trace = trace
+
+    def checkpoint(self, bound=None, frontier=0):
+        """Report progress to the monitor; raises SearchCancelled when it asks to stop"""
+        if self.monitor is not None and self.monitor.poll(self.stats, bound, frontier):
+            raise SearchCancelled()
+
+    def _heap_ops(self):
+        """(push, pop) for an open list"""
+        if self.trace is None:
+            return heapq.heappush, heapq.heappop
+        return self.trace.heap_ops(heapq.heappush, heapq.heappop)
+
+    def _timed(self, phase, func):
+        return func if self.trace is None else self.trace.timed(phase, func)
+
+    def _visited(self, container):
+        """A visited set or dict, traced when a trace is attached"""
+        if self.trace is None:
+            return container
+        if isinstance(container, dict):
+            return self.trace.visited_dict(container)
+        return self.trace.visited_set(container)
+
+    def _evaluator(self, evaluator):
+        return evaluator if self.trace is None else TracedEvaluator(evaluator, self.trace)
+
+    def reset_stats(self):
+        """Reset search statistics"""
+        self.stats = {
+            'nodes_explored': 0,
+            'max_depth': 0,
+            'time_elapsed': 0,
+            'memory_used': 0,
+            'solution_length': 0,
+            'suboptimality_bound': None
+        }
+
+    def solve(self, initial_state, algorithm, weight=None, on_solution=None, on_move=None):
+        """Run one SearchAlgorithm on a state and return its move list (or None)
+
+        weight overrides the heuristic inflation of the weighted and anytime
+        searches; on_solution and on_move receive the partial results of the
+        STREAMING_ALGORITHMS. Every solution comes with
+        stats['suboptimality_bound'], a proven limit on its length divided by
+        the optimal length.
+        """
+        if self.trace is not None:
+            self.trace.begin(algorithm.name, initial_state)
+        path = None
+        try:
+            path = self._dispatch(initial_state, algorithm, weight, on_solution, on_move)
+            if path is not None and self.stats.get('suboptimality_bound') is None:
+                if algorithm in OPTIMAL_ALGORITHMS or self.stats.get('optimal', False):
+                    self.stats['suboptimality_bound'] = 1.0
+                else:
+                    # Manhattan distance never overestimates, so it bounds any path
+                    self.stats['suboptimality_bound'] = len(path) / max(initial_state.manhattan_distance(), 1)
+        finally:
+            if self.trace is not None:
+                self.trace.end(self.stats)
+        return path
+
+    def _dispatch(self, initial_state, algorithm, weight, on_solution, on_move):
+        if algorithm == SearchAlgorithm.BFS:
+            return self.breadth_first_search(initial_state)
+        if algorithm == SearchAlgorithm.DFS:
+            return self.depth_first_search(initial_state)
+        if algorithm == SearchAlgorithm.A_STAR_MANHATTAN:
+            return self.a_star_search(initial_state, NPuzzleState.manhattan_distance)
+        if algorithm == SearchAlgorithm.A_STAR_EUCLIDEAN:
+            return self.a_star_search(initial_state, NPuzzleState.euclidean_distance)
+        if algorithm == SearchAlgorithm.A_STAR_LINEAR_CONFLICT:
+            return self.a_star_search(initial_state, NPuzzleState.linear_conflict)
+        if algorithm == SearchAlgorithm.GREEDY_MANHATTAN:
+            return self.greedy_search(initial_state, NPuzzleState.manhattan_distance)
+        if algorithm == SearchAlgorithm.IDA_STAR:
+            return self.ida_star_search(initial_state, NPuzzleState.manhattan_distance)
+        if algorithm in (SearchAlgorithm.A_STAR_PDB, SearchAlgorithm.IDA_STAR_PDB):
+            from .pdb import get_pattern_database
+            database = get_pattern_database(initial_state.size)
+            if algorithm == SearchAlgorithm.A_STAR_PDB:
+                return self.a_star_search(initial_state, database.heuristic, max_nodes=500000)
+            return self.ida_star_search(initial_state, database.heuristic)
+        if algorithm == SearchAlgorithm.PARALLEL_IDA_STAR:
+            from .parallel import ParallelIDAStar
+            solver = ParallelIDAStar()
+            solution = solver.solve(initial_state, monitor=self.monitor)
+            self.stats = solver.stats
+            return solution
+        if algorithm == SearchAlgorithm.BIDIRECTIONAL_BFS:
+            return self.bidirectional_search(initial_state)
+        if algorithm == SearchAlgorithm.MEMORY_BOUNDED_A_STAR:
+            return self.memory_bounded_a_star(initial_state, NPuzzleState.manhattan_distance)
+        if algorithm == SearchAlgorithm.WEIGHTED_A_STAR:
+            return self.weighted_a_star_search(initial_state, NPuzzleState.manhattan_distance,
+                                               weight or DEFAULT_WEIGHT)
+        if algorithm == SearchAlgorithm.ANYTIME_ARA_STAR:
+            return self.anytime_search(initial_state, NPuzzleState.manhattan_distance,
+                                       weight or DEFAULT_ANYTIME_WEIGHT, on_solution=on_solution)
+        if algorithm == SearchAlgorithm.REAL_TIME_LRTA_STAR:
+            return self.real_time_search(initial_state, NPuzzleState.manhattan_distance, on_move=on_move)
+        raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+    def breadth_first_search(self, initial_state, max_nodes=100000):
+        """BFS with memory limit"""
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        if initial_state.is_goal():
+            return initial_state.get_path()
+
+        queue = deque([initial_state])
+        visited = self._visited({initial_state})
+        expand = self._timed('expand', NPuzzleState.get_neighbors)
+        trace = self.trace
+
+        while queue and len(visited) < max_nodes:
+            if trace is not None:
+                trace.frontier(len(queue))
+            current = queue.popleft()
+            self.stats['nodes_explored'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], current.depth)
+            if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                self.checkpoint(current.depth, len(queue))
+
+            for neighbor in expand(current):
+                if neighbor not in visited:
+                    if neighbor.is_goal():
+                        self.stats['time_elapsed'] = time.perf_counter() - start_time
+                        self.stats['solution_length'] = len(neighbor.get_path())
+                        return neighbor.get_path()
+
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def depth_first_search(self, initial_state, max_depth=50, max_nodes=100000):
+        """Depth-limited DFS; finds a path, not necessarily the shortest one"""
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        if initial_state.is_goal():
+            return initial_state.get_path()
+
+        stack = [initial_state]
+        visited = self._visited({initial_state: 0})
+        expand = self._timed('expand', NPuzzleState.get_neighbors)
+        trace = self.trace
+
+        while stack and self.stats['nodes_explored'] < max_nodes:
+            if trace is not None:
+                trace.frontier(len(stack))
+            current = stack.pop()
+            self.stats['nodes_explored'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], current.depth)
+            if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                self.checkpoint(max_depth, len(stack))
+            if current.depth >= max_depth:
+                continue
+
+            # Reversed so that moves are tried in MOVES order
+            for neighbor in reversed(expand(current)):
+                if neighbor.is_goal():
+                    self.stats['time_elapsed'] = time.perf_counter() - start_time
+                    self.stats['solution_length'] = len(neighbor.get_path())
+                    return neighbor.get_path()
+
+                seen = visited.get(neighbor)
+                if seen is None or neighbor.depth < seen:
+                    visited[neighbor] = neighbor.depth
+                    stack.append(neighbor)
+
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def greedy_search(self, initial_state, heuristic_func, max_nodes=50000):
+        """Greedy best-first search ordered by the heuristic alone"""
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        if initial_state.is_goal():
+            return initial_state.get_path()
+
+        heuristic_func = self._timed('heuristic', heuristic_func)
+        push, pop = self._heap_ops()
+        expand = self._timed('expand', NPuzzleState.get_neighbors)
+        open_set = [(heuristic_func(initial_state), initial_state)]
+        visited = self._visited({initial_state})
+
+        while open_set and len(visited) < max_nodes:
+            h, current = pop(open_set)
+            self.stats['nodes_explored'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], current.depth)
+            if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                self.checkpoint(h, len(open_set))
+
+            for neighbor in expand(current):
+                if neighbor in visited:
+                    continue
+                if neighbor.is_goal():
+                    self.stats['time_elapsed'] = time.perf_counter() - start_time
+                    self.stats['solution_length'] = len(neighbor.get_path())
+                    return neighbor.get_path()
+                visited.add(neighbor)
+                push(open_set, (heuristic_func(neighbor), neighbor))
+
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def a_star_search(self, initial_state, heuristic_func, max_nodes=2000000):
+        """A* over packed keys, stopping after max_nodes expansions
+
+        Generated states live in a NodeStore (parallel arrays indexed through
+        an open-addressing table) and the open list is a BucketQueue keyed by
+        integer f with ties going to the largest g, newest first. A state
+        whose g improves gets a fresh queue entry and its old one is skipped
+        when popped. Fractional heuristics are bucketed by floor(f), which
+        keeps the search optimal since path lengths are whole numbers.
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        if initial_state.is_goal():
+            return []
+
+        ctx = initial_state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        move_table = ctx.moves
+        goal = ctx.goal_key
+        evaluator = self._stateless_evaluator(heuristic_func, initial_state)
+        delta = evaluator.delta
+        root_h = evaluator.initial(initial_state)
+        trace = self.trace
+
+        store = NodeStore(ctx, integral=isinstance(root_h, int))
+        queue = BucketQueue()
+        find = self._timed('visited', store.find)
+        add = store.add
+        push = self._timed('heap', queue.push)
+        pop = self._timed('heap', queue.pop)
+        g_of = store.g
+        h_of = store.h
+        blank_of = store.blank
+        move_of = store.move
+        keys = store.keys
+
+        push(int(root_h), 0, add(initial_state.key, find(initial_state.key) ^ -1, 0, root_h, -1, -1,
+                                 initial_state.blank))
+        expanded = 0
+
+        while queue and expanded < max_nodes:
+            f, g, row = pop()
+            if g != g_of[row]:
+                continue
+            key = keys[row]
+            expanded += 1
+            self.stats['nodes_explored'] = expanded
+            if g > self.stats['max_depth']:
+                self.stats['max_depth'] = g
+            if self.monitor is not None and not expanded & 1023:
+                self.checkpoint(f, len(queue))
+
+            if key == goal:
+                path = [MOVES[m][0] for m in store.path(row)]
+                self.stats['memory_used'] = store.nbytes() + queue.nbytes()
+                self.stats['time_elapsed'] = time.perf_counter() - start_time
+                self.stats['solution_length'] = len(path)
+                return path
+
+            blank = blank_of[row]
+            move = move_of[row]
+            h = h_of[row]
+            child_g = g + 1
+            if trace is not None:
+                trace.frontier(len(queue))
+                started = trace.enter()
+            for child_move, target in move_table[blank]:
+                if move >= 0 and child_move == INVERSE_MOVE[move]:
+                    continue
+                tile = (key >> (target * bits)) & mask
+                new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                found = find(new_key)
+                if found >= 0:
+                    if child_g >= g_of[found]:
+                        continue
+                    # Shorter path to a known state: update it in place and queue it again
+                    g_of[found] = child_g
+                    store.parent[found] = row
+                    move_of[found] = child_move
+                    push(int(child_g + h_of[found]), child_g, found)
+                    continue
+                child_h = delta(h, tile, target, blank, key, new_key)
+                push(int(child_g + child_h), child_g, add(new_key, found ^ -1, child_g, child_h, row, child_move, target))
+            if trace is not None:
+                trace.leave('expand', started)
+                trace.visited_size(len(store))
+
+        self.stats['memory_used'] = store.nbytes() + queue.nbytes()
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def ida_star_search(self, initial_state, heuristic_func, max_iterations=100, transposition_size=0):
+        """IDA* Search implementation
+
+        Runs without recursion: one flat board is mutated in place and an
+        explicit stack holds the moves, so deep instances need neither Python
+        frames nor a state object per node. Moves that undo the previous move
+        are skipped. With transposition_size > 0, up to that many states keep
+        the lowest g they were searched at in the current iteration, and
+        repeats reached at an equal or higher g are pruned.
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        evaluator = self._evaluator(incremental_heuristic(heuristic_func, initial_state))
+        root_h = evaluator.initial(initial_state)
+        threshold = root_h
+        trace = self.trace
+
+        if initial_state.is_goal():
+            self.stats['time_elapsed'] = time.perf_counter() - start_time
+            return []
+
+        should_stop = None
+        if self.monitor is not None:
+            # Reads the current threshold each time it is called
+            should_stop = lambda: self.monitor.poll(self.stats, threshold, 0)
+
+        for iteration in range(max_iterations):
+            histogram = {} if trace is not None and trace.histograms else None
+            if trace is not None:
+                started = time.perf_counter_ns()
+                nodes_before = self.stats['nodes_explored']
+            moves, next_threshold = threshold_search(
+                initial_state.tiles(), initial_state.key, initial_state.blank, initial_state.size,
+                root_h, 0, None, threshold, evaluator, self.stats, transposition_size, should_stop, histogram,
+                trace)
+            if trace is not None:
+                trace.iteration(threshold, self.stats['nodes_explored'] - nodes_before, started, histogram)
+            if moves is not None:
+                path = [MOVES[m][0] for m in moves]
+                self.stats['time_elapsed'] = time.perf_counter() - start_time
+                self.stats['solution_length'] = len(path)
+                return path
+            if next_threshold == float('inf'):
+                break
+            threshold = next_threshold
+
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def bidirectional_search(self, initial_state, max_nodes=2000000):
+        """Bidirectional BFS meeting in the middle between the start and the goal
+
+        Each side keeps only a dict from packed key to the index of the move
+        that reached it (-1 at its root). Whole levels are expanded on the
+        smaller side, so the first meeting found is already a shortest path,
+        which is rebuilt by undoing the stored moves from the meeting state.
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        size = initial_state.size
+        ctx = initial_state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        move_table = ctx.moves
+
+        if initial_state.key == ctx.goal_key:
+            return []
+        if not initial_state.is_solvable():
+            self.stats['time_elapsed'] = time.perf_counter() - start_time
+            return None
+
+        visited = (self._visited({initial_state.key: -1}), self._visited({ctx.goal_key: -1}))
+        frontiers = ([(initial_state.key, initial_state.blank)], [(ctx.goal_key, ctx.goal_blank)])
+        depths = [0, 0]
+        trace = self.trace
+
+        while frontiers[0] and frontiers[1] and len(visited[0]) + len(visited[1]) < max_nodes:
+            if trace is not None:
+                trace.frontier(len(frontiers[0]) + len(frontiers[1]))
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = visited[side], visited[1 - side]
+            next_frontier = []
+            meeting = None
+
+            for key, blank in frontiers[side]:
+                self.stats['nodes_explored'] += 1
+                if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                    self.checkpoint(depths[0] + depths[1], len(frontiers[0]) + len(frontiers[1]))
+                parent_move = seen[key]
+                if trace is not None:
+                    started = trace.enter()
+                for move, target in move_table[blank]:
+                    if parent_move >= 0 and move == INVERSE_MOVE[parent_move]:
+                        continue
+                    new_key = _slide(key, blank, target, bits, mask)
+                    if new_key in seen:
+                        continue
+                    seen[new_key] = move
+                    if new_key in other:
+                        meeting = (new_key, target)
+                        break
+                    next_frontier.append((new_key, target))
+                if trace is not None:
+                    trace.leave('expand', started)
+                if meeting:
+                    break
+
+            depths[side] += 1
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+            self.stats['max_depth'] = depths[0] + depths[1]
+
+            if meeting:
+                key, blank = meeting
+                forward = _walk_back(visited[0], key, blank, size)
+                backward = _walk_back(visited[1], key, blank, size)
+                path = [MOVES[m][0] for m in forward]
+                path.extend(MOVES[INVERSE_MOVE[m]][0] for m in reversed(backward))
+                self.stats['memory_used'] = _visited_bytes(*visited)
+                self.stats['time_elapsed'] = time.perf_counter() - start_time
+                self.stats['solution_length'] = len(path)
+                return path
+
+        self.stats['memory_used'] = _visited_bytes(*visited)
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def memory_bounded_a_star(self, initial_state, heuristic_func, memory_limit=64 * 1024 * 1024):
+        """A* limited by an estimated byte budget instead of a node count
+
+        Closed states are stored as packed key -> parent move only, and open
+        entries carry just (f, -g, key, blank, move). Whenever the estimate
+        goes over memory_limit the worse half of the open list is dropped and
+        the smallest dropped f is remembered: a path no longer than that is
+        still optimal, reported as stats['optimal'].
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        size = initial_state.size
+        ctx = initial_state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        move_table = ctx.moves
+        goal = ctx.goal_key
+        evaluator = self._stateless_evaluator(heuristic_func, initial_state)
+        push, pop = self._heap_ops()
+        trace = self.trace
+
+        # Per-entry estimates: a heap slot holding a 5-tuple, a dict slot, and the key itself
+        key_bytes = sys.getsizeof(goal)
+        open_entry = sys.getsizeof((0, 0, 0, 0, 0)) + 8 + key_bytes
+        closed_entry = 3 * 8 * 3 // 2 + key_bytes
+
+        closed = self._visited({})
+        open_list = [(evaluator.initial(initial_state), 0, initial_state.key, initial_state.blank, -1)]
+        dropped_f = float('inf')
+        pushes = 0
+
+        while open_list:
+            f, neg_g, key, blank, move = pop(open_list)
+            if key in closed:
+                continue
+            closed[key] = move
+            g = -neg_g
+            self.stats['nodes_explored'] += 1
+            if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                self.checkpoint(f, len(open_list))
+            if g > self.stats['max_depth']:
+                self.stats['max_depth'] = g
+
+            if key == goal:
+                path = [MOVES[m][0] for m in _walk_back(closed, key, blank, size)]
+                self.stats['optimal'] = g <= dropped_f
+                self.stats['memory_used'] = len(closed) * closed_entry + len(open_list) * open_entry
+                self.stats['time_elapsed'] = time.perf_counter() - start_time
+                self.stats['solution_length'] = len(path)
+                return path
+
+            h = f - g
+            if trace is not None:
+                started = trace.enter()
+            for child_move, target in move_table[blank]:
+                if move >= 0 and child_move == INVERSE_MOVE[move]:
+                    continue
+                tile = (key >> (target * bits)) & mask
+                new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                if new_key in closed:
+                    continue
+                child_h = evaluator.delta(h, tile, target, blank, key, new_key)
+                push(open_list, (g + 1 + child_h, neg_g - 1, new_key, target, child_move))
+                pushes += 1
+            if trace is not None:
+                trace.leave('expand', started)
+
+            if pushes >= 1024:
+                pushes = 0
+                used = len(closed) * closed_entry + len(open_list) * open_entry
+                self.stats['memory_used'] = max(self.stats['memory_used'], used)
+                if used > memory_limit:
+                    if len(closed) * closed_entry > memory_limit or len(open_list) < 2:
+                        break
+                    # Keep the better half of the frontier; the heap order survives a sort
+                    open_list.sort()
+                    half = len(open_list) // 2
+                    dropped_f = min(dropped_f, open_list[half][0])
+                    del open_list[half:]
+
+        self.stats['optimal'] = False
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def _stateless_evaluator(self, heuristic_func, initial_state):
+        evaluator = incremental_heuristic(heuristic_func, initial_state)
+        if not evaluator.stateless:
+            evaluator = StateHeuristic(heuristic_func, initial_state.size)
+        return self._evaluator(evaluator)
+
+    def weighted_a_star_search(self, initial_state, heuristic_func, weight=DEFAULT_WEIGHT, max_nodes=2000000):
+        """A* ordered by g + weight * h
+
+        Inflating the heuristic makes the search dive towards the goal and
+        expand far fewer states; with an admissible heuristic the path is at
+        most `weight` times longer than optimal, which is reported (tightened
+        by the root heuristic when possible) as stats['suboptimality_bound'].
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        size = initial_state.size
+        ctx = initial_state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        move_table = ctx.moves
+        goal = ctx.goal_key
+        evaluator = self._stateless_evaluator(heuristic_func, initial_state)
+        root_h = evaluator.initial(initial_state)
+
+        push, pop = self._heap_ops()
+        trace = self.trace
+
+        closed = self._visited({})
+        open_list = [(weight * root_h, 0, initial_state.key, initial_state.blank, -1, root_h)]
+        while open_list and len(closed) < max_nodes:
+            f, neg_g, key, blank, move, h = pop(open_list)
+            if key in closed:
+                continue
+            closed[key] = move
+            g = -neg_g
+            self.stats['nodes_explored'] += 1
+            if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                self.checkpoint(f, len(open_list))
+            if g > self.stats['max_depth']:
+                self.stats['max_depth'] = g
+
+            if key == goal:
+                path = [MOVES[m][0] for m in _walk_back(closed, key, blank, size)]
+                self.stats['suboptimality_bound'] = max(1.0, min(weight, len(path) / max(root_h, 1)))
+                self.stats['time_elapsed'] = time.perf_counter() - start_time
+                self.stats['solution_length'] = len(path)
+                return path
+
+            if trace is not None:
+                started = trace.enter()
+            for child_move, target in move_table[blank]:
+                if move >= 0 and child_move == INVERSE_MOVE[move]:
+                    continue
+                tile = (key >> (target * bits)) & mask
+                new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                if new_key in closed:
+                    continue
+                child_h = evaluator.delta(h, tile, target, blank, key, new_key)
+                push(open_list, (g + 1 + weight * child_h, neg_g - 1, new_key, target, child_move, child_h))
+            if trace is not None:
+                trace.leave('expand', started)
+
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+    def anytime_search(self, initial_state, heuristic_func, weight=DEFAULT_ANYTIME_WEIGHT, weight_step=0.5,
+                       on_solution=None, max_nodes=2000000):
+        """Anytime Repairing A* (ARA*): a solution at once, then shorter ones with tighter bounds
+
+        The first solution is the constructive one from reduction_solve,
+        published before any search and again whenever the column-first
+        variant or shorten_path improves on it. Then weighted
+        A* passes run with the weight lowered by weight_step each time: a pass
+        keeps the g values of the previous ones, prunes every state whose
+        g + h cannot beat the best solution, and only re-expands states whose
+        g improved (ARA*'s INCONS list). Each improvement, and each tighter
+        bound, goes to on_solution(path, bound), where bound limits
+        len(path) / optimal length. Returns the best path when the passes end
+        (optimal once a pass at weight 1 completes) or max_nodes runs out.
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        size = initial_state.size
+        ctx = initial_state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        move_table = ctx.moves
+        goal = ctx.goal_key
+        evaluator = self._stateless_evaluator(heuristic_func, initial_state)
+        root_h = evaluator.initial(initial_state)
+
+        if initial_state.is_goal():
+            self.stats['suboptimality_bound'] = 1.0
+            self.stats['time_elapsed'] = time.perf_counter() - start_time
+            return []
+        incumbent = reduction_solve(initial_state)
+        if incumbent is None:
+            self.stats['time_elapsed'] = time.perf_counter() - start_time
+            return None
+
+        published = [None, None]
+
+        def publish(path, lower_bound):
+            bound = len(path) / max(min(lower_bound, len(path)), 1)
+            self.stats['suboptimality_bound'] = bound
+            self.stats['solution_length'] = len(path)
+            if published != [len(path), bound]:
+                published[:] = [len(path), bound]
+                if on_solution is not None:
+                    on_solution(list(path), bound)
+
+        publish(incumbent, root_h)
+        mirrored = reduction_solve(initial_state, transpose=True)
+        if len(mirrored) < len(incumbent):
+            incumbent = mirrored
+            publish(incumbent, root_h)
+        shortened = shorten_path(initial_state, incumbent)
+        if len(shortened) < len(incumbent):
+            incumbent = shortened
+            publish(incumbent, root_h)
+        self.checkpoint(weight, 0)
+
+        push, pop = self._heap_ops()
+        trace = self.trace
+        start = initial_state.key
+        g_of = self._visited({start: 0})
+        parents = {start: -1}
+        open_list = [(weight * root_h, 0, start, initial_state.blank, root_h)]
+        lower_bound = root_h
+        exhausted = False
+        while True:
+            closed = self._visited(set())
+            incons = {}
+            while open_list and open_list[0][0] < len(incumbent):
+                # Stop before popping, so every state not expanded stays in open_list for the lower bound
+                if self.stats['nodes_explored'] >= max_nodes:
+                    exhausted = True
+                    break
+                _, neg_g, key, blank, h = pop(open_list)
+                g = -neg_g
+                if g != g_of[key] or key in closed:
+                    continue
+                closed.add(key)
+                self.stats['nodes_explored'] += 1
+                if self.monitor is not None and not self.stats['nodes_explored'] & 1023:
+                    self.checkpoint(weight, len(open_list))
+                if g > self.stats['max_depth']:
+                    self.stats['max_depth'] = g
+
+                if key == goal:
+                    # Popped with g + weight * h = g < len(incumbent)
+                    incumbent = [MOVES[m][0] for m in _walk_back(parents, key, blank, size)]
+                    publish(incumbent, self._open_lower_bound(open_list, incons, g_of, len(incumbent)))
+                    continue
+
+                move = parents[key]
+                best = len(incumbent)
+                if trace is not None:
+                    started = trace.enter()
+                for child_move, target in move_table[blank]:
+                    if move >= 0 and child_move == INVERSE_MOVE[move]:
+                        continue
+                    child_g = g + 1
+                    tile = (key >> (target * bits)) & mask
+                    new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                    if child_g >= g_of.get(new_key, best):
+                        continue
+                    child_h = evaluator.delta(h, tile, target, blank, key, new_key)
+                    if child_g + child_h >= best:
+                        continue
+                    g_of[new_key] = child_g
+                    parents[new_key] = child_move
+                    if new_key in closed:
+                        incons[new_key] = (target, child_h)
+                    else:
+                        push(open_list, (child_g + weight * child_h, -child_g, new_key, target, child_h))
+                if trace is not None:
+                    trace.leave('expand', started)
+
+            lower_bound = self._open_lower_bound(open_list, incons, g_of, len(incumbent))
+            if exhausted or weight <= 1.0 or lower_bound >= len(incumbent):
+                break
+            publish(incumbent, lower_bound)
+            weight = max(1.0, weight - weight_step)
+            # Next pass: the states left open plus the ones whose g improved after expansion
+            entries = {}
+            for _, neg_g, key, blank, h in open_list:
+                if -neg_g == g_of[key] and key not in closed:
+                    entries[key] = (blank, h)
+            entries.update(incons)
+            open_list = [(g_of[key] + weight * h, -g_of[key], key, blank, h) for key, (blank, h) in entries.items()]
+            heapq.heapify(open_list)
+
+        self.stats['optimal'] = lower_bound >= len(incumbent)
+        publish(incumbent, lower_bound)
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return incumbent
+
+    @staticmethod
+    def _open_lower_bound(open_list, incons, g_of, best):
+        """Smallest g + h over the states ARA* still has to look at: no solution is shorter than this"""
+        lower = best
+        for _, neg_g, key, _, h in open_list:
+            if -neg_g == g_of[key] and -neg_g + h < lower:
+                lower = -neg_g + h
+        for key, (_, h) in incons.items():
+            if g_of[key] + h < lower:
+                lower = g_of[key] + h
+        return lower
+
+    def real_time_search(self, initial_state, heuristic_func, move_time=0.02, max_moves=None, on_move=None):
+        """Real-time search in the style of LRTA*: commit one move every move_time seconds
+
+        Before each move a depth-first lookahead deepens one level at a time
+        until the time budget is spent, backing up the smallest g + h found
+        below each move (with learned values in place of h where known). The
+        best move is committed at once and passed to on_move(name), and the
+        board's learned value is raised to the backed-up one so that loops
+        wear themselves out. Plain LRTA* wanders for a long time on the larger
+        boards, so after max_moves (default 4 per cell) without reaching the
+        goal the rest is finished by reduction_solve. Returns the
+        committed moves with loops cut out.
+        """
+        self.reset_stats()
+        start_time = time.perf_counter()
+
+        size = initial_state.size
+        ctx = initial_state.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        move_table = ctx.moves
+        goal = ctx.goal_key
+        evaluator = self._stateless_evaluator(heuristic_func, initial_state)
+        root_h = evaluator.initial(initial_state)
+        if max_moves is None:
+            max_moves = 4 * ctx.cells
+
+        learned = {}
+        stats = self.stats
+        timer = time.perf_counter
+
+        def lookahead(key, blank, h, g, depth, last, alpha, deadline):
+            """Smallest g + h on the frontier `depth` moves below key, or None when time ran out
+
+            h is the static heuristic of key; learned values only replace it
+            when a board is scored, never in the incremental updates.
+            """
+            stats['nodes_explored'] += 1
+            if not stats['nodes_explored'] & 255 and timer() > deadline:
+                return None
+            for move, target in move_table[blank]:
+                if last >= 0 and move == INVERSE_MOVE[last]:
+                    continue
+                tile = (key >> (target * bits)) & mask
+                new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                child_h = evaluator.delta(h, tile, target, blank, key, new_key)
+                score = g + 1 + learned.get(new_key, child_h)
+                if score >= alpha:
+                    continue
+                if new_key == goal or depth == 1:
+                    alpha = score
+                    continue
+                value = lookahead(new_key, target, child_h, g + 1, depth - 1, move, alpha, deadline)
+                if value is None:
+                    return None
+                alpha = value
+            return alpha
+
+        key, blank, h = initial_state.key, initial_state.blank, root_h
+        committed = []
+        last = -1
+        while key != goal and len(committed) < max_moves:
+            deadline = timer() + move_time
+            choice = None
+            depth = 1
+            while True:
+                best_value = float('inf')
+                best = None
+                for move, target in move_table[blank]:
+                    tile = (key >> (target * bits)) & mask
+                    new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                    child_h = evaluator.delta(h, tile, target, blank, key, new_key)
+                    if new_key == goal or depth == 1:
+                        value = 1 + learned.get(new_key, child_h)
+                    else:
+                        value = lookahead(new_key, target, child_h, 1, depth - 1, move, best_value, deadline)
+                        if value is None:
+                            break
+                    # On a tie, replace a best move that undoes the last move with one that does not
+                    undoes_best = best is not None and last >= 0 and best[0] == INVERSE_MOVE[last]
+                    if value < best_value or (value == best_value and undoes_best and move != INVERSE_MOVE[last]):
+                        best_value = value
+                        best = (move, target, new_key, child_h)
+                else:
+                    # Only a fully searched depth replaces the previous choice
+                    choice = (best_value, best)
+                    if depth > stats['max_depth']:
+                        stats['max_depth'] = depth
+                    if timer() < deadline and depth < 64:
+                        depth += 1
+                        continue
+                break
+
+            best_value, (move, target, new_key, child_h) = choice
+            if best_value > learned.get(key, h):
+                learned[key] = best_value
+            key, blank, h, last = new_key, target, child_h, move
+            committed.append(MOVES[move][0])
+            if on_move is not None:
+                on_move(MOVES[move][0])
+            self.checkpoint(len(committed), len(learned))
+
+        if key != goal:
+            for name in reduction_solve(NPuzzleState.from_key(key, size, blank, ctx=ctx)):
+                committed.append(name)
+                if on_move is not None:
+                    on_move(name)
+
+        path = shorten_path(initial_state, committed)
+        self.stats['moves_committed'] = len(committed)
+        self.stats['suboptimality_bound'] = len(path) / max(root_h, 1)
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        self.stats['solution_length'] = len(path)
+        return path
@@ -0,0 +1,111 @@
+import random
+import time
+
+from .state import NPuzzleState
+from .generate import EXACT_DEPTH_SIZES, _default_heuristic, depth_layers, random_walk_tiles
+from .engine import AdvancedAIEngine
+from .batch import BATCH_HEURISTICS, REFERENCE_METHODS, _require_numpy, batch_heuristics, boards_array, keys_array, np
+
+def solved_corpus(size, count=None, seed=2024, walk=(10, 50)):
+    """(boards, distances): an (N, size*size) uint8 array and the optimal distance of every board
+
+    Sizes in EXACT_DEPTH_SIZES take every board from the depth layers, or a
+    uniform sample of `count` of them. Larger sizes scramble `count`
+    (default 100) boards with random walks of walk[0]..walk[1] moves and
+    solve each optimally with IDA*, so keep walks short without a PDB.
+    """
+    _require_numpy()
+    rng = random.Random(seed)
+    if size in EXACT_DEPTH_SIZES:
+        keyed = [(key, distance) for distance, layer in enumerate(depth_layers(size)) for key in layer]
+        if count is not None:
+            keyed = rng.sample(keyed, min(count, len(keyed)))
+        return (keys_array([key for key, _ in keyed], size),
+                np.array([distance for _, distance in keyed], dtype=np.int32))
+
+    heuristic_func = _default_heuristic(size)
+    engine = AdvancedAIEngine()
+    boards = []
+    distances = []
+    for _ in range(count or 100):
+        tiles = random_walk_tiles(size, rng.randint(*walk), rng)
+        state = NPuzzleState([tiles[i * size:(i + 1) * size] for i in range(size)], size)
+        path = engine.ida_star_search(state, heuristic_func)
+        boards.append(tiles)
+        distances.append(len(path))
+    return boards_array(boards, size), np.array(distances, dtype=np.int32)
+
+def write_corpus(path, boards, distances):
+    """One board per line: optimal distance, then the flat tiles"""
+    with open(path, 'w') as handle:
+        for tiles, distance in zip(boards.tolist(), distances.tolist()):
+            handle.write(f"{distance} " + ' '.join(map(str, tiles)) + '\n')
+
+def load_corpus(path):
+    """(size, boards, distances) read back from write_corpus"""
+    _require_numpy()
+    rows = []
+    with open(path) as handle:
+        for line in handle:
+            if line.strip():
+                rows.append([int(value) for value in line.split()])
+    if not rows:
+        raise ValueError(f"Corpus {path} is empty")
+    size = int(round((len(rows[0]) - 1) ** 0.5))
+    if size * size != len(rows[0]) - 1:
+        raise ValueError(f"Corpus {path} does not hold square boards")
+    data = np.array(rows, dtype=np.int32)
+    return size, boards_array(data[:, 1:], size), data[:, 0].copy()
+
+def evaluate_heuristics(boards, distances, size, names=BATCH_HEURISTICS, reference_sample=200, repeat=3):
+    """Accuracy and speed of each batch heuristic on a solved corpus
+
+    For every name returns mean / min / max of h / optimal distance (goal
+    boards excluded), the share of boards where h does not overestimate
+    (admissible, with the count of those that do) or is exact, batch throughput in boards per second (best
+    of `repeat` runs), the throughput of the NPuzzleState reference method
+    on a sample, and how many sampled boards the two disagree on.
+    """
+    boards = boards_array(boards, size)
+    distances = np.asarray(distances)
+    solved = distances > 0
+    sample = boards[:reference_sample]
+    states = [NPuzzleState([row[i * size:(i + 1) * size] for i in range(size)], size) for row in sample.tolist()]
+
+    report = {}
+    for name in names:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            values = batch_heuristics(boards, size, (name,))[name]
+            best = min(best, time.perf_counter() - start)
+
+        reference = REFERENCE_METHODS[name]
+        start = time.perf_counter()
+        expected = [reference(state) for state in states]
+        reference_time = time.perf_counter() - start
+
+        ratios = values[solved] / distances[solved]
+        report[name] = {
+            'boards': int(boards.shape[0]),
+            'mean_ratio': float(ratios.mean()) if ratios.size else None,
+            'min_ratio': float(ratios.min()) if ratios.size else None,
+            'max_ratio': float(ratios.max()) if ratios.size else None,
+            'admissible': float((values <= distances + 1e-9).mean()),
+            'overestimates': int((values > distances + 1e-9).sum()),
+            'exact': float(np.isclose(values, distances).mean()),
+            'boards_per_sec': boards.shape[0] / best if best > 0 else float('inf'),
+            'reference_per_sec': len(states) / reference_time if reference_time > 0 else float('inf'),
+            'mismatches': int((~np.isclose(values[:len(states)], expected)).sum()),
+        }
+    return report
+
+def format_report(report):
+    """Plain-text table of an evaluate_heuristics report"""
+    lines = [f"{'heuristic':<16}{'mean h/d':>9}{'min':>7}{'max':>7}{'over':>7}{'exact':>7}"
+             f"{'batch/s':>14}{'per-state/s':>13}{'diff':>6}"]
+    for name, row in report.items():
+        lines.append(f"{name:<16}{row['mean_ratio'] or 0:>9.3f}{row['min_ratio'] or 0:>7.2f}{row['max_ratio'] or 0:>7.2f}"
+                     f"{row['overestimates']:>7}{row['exact']:>7.1%}{row['boards_per_sec']:>14,.0f}"
+                     f"{row['reference_per_sec']:>13,.0f}{row['mismatches']:>6}")
+    return '\n'.join(lines)
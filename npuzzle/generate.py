@@ -0,0 +1,118 @@
+import random
+
+from .state import NPuzzleState, decode_board, puzzle_context, tiles_solvable
+from .engine import AdvancedAIEngine
+
+_DEPTH_LAYERS = {}
+
+# Sizes small enough to enumerate every reachable board breadth-first
+EXACT_DEPTH_SIZES = (2, 3)
+
+def random_solvable_tiles(size, rng=random):
+    """Uniformly random solvable board as a flat row-major tile list
+
+    Swapping two fixed non-blank tiles flips solvability and is its own
+    inverse, so it pairs every unsolvable permutation with exactly one
+    solvable one and the result stays uniform.
+    """
+    tiles = list(range(size * size))
+    rng.shuffle(tiles)
+    if not tiles_solvable(tiles, size):
+        first, second = [index for index, value in enumerate(tiles) if value in (1, 2)]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tiles
+
+def random_solvable_board(size, rng=random):
+    """Uniformly random solvable list-of-lists board"""
+    tiles = random_solvable_tiles(size, rng)
+    return [tiles[i * size:(i + 1) * size] for i in range(size)]
+
+def depth_layers(size):
+    """Every reachable packed key grouped by optimal distance from the goal
+
+    Built once per size by a breadth-first sweep from the goal; only
+    practical for EXACT_DEPTH_SIZES (181,440 boards for the 8-puzzle).
+    """
+    layers = _DEPTH_LAYERS.get(size)
+    if layers is None:
+        if size not in EXACT_DEPTH_SIZES:
+            raise ValueError(f"No exact depth table for size {size}, only {EXACT_DEPTH_SIZES}")
+        ctx = puzzle_context(size)
+        bits = ctx.bits
+        mask = ctx.mask
+        seen = {ctx.goal_key}
+        frontier = [(ctx.goal_key, ctx.goal_blank)]
+        layers = []
+        while frontier:
+            layers.append([key for key, _ in frontier])
+            next_frontier = []
+            for key, blank in frontier:
+                for _, target in ctx.moves[blank]:
+                    tile = (key >> (target * bits)) & mask
+                    new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                    if new_key not in seen:
+                        seen.add(new_key)
+                        next_frontier.append((new_key, target))
+            frontier = next_frontier
+        layers = _DEPTH_LAYERS[size] = layers
+    return layers
+
+def depth_distribution(size):
+    """Number of boards at each optimal distance, index = distance"""
+    return [len(layer) for layer in depth_layers(size)]
+
+def random_walk_tiles(size, steps, rng=random):
+    """Flat board after a non-backtracking random walk of the blank from the goal"""
+    ctx = puzzle_context(size)
+    key, blank, previous = ctx.goal_key, ctx.goal_blank, -1
+    for _ in range(steps):
+        options = [target for _, target in ctx.moves[blank] if target != previous]
+        target = rng.choice(options)
+        tile = (key >> (target * ctx.bits)) & ctx.mask
+        key = key - (tile << (target * ctx.bits)) + (tile << (blank * ctx.bits))
+        previous, blank = blank, target
+    return [tile for row in decode_board(key, size) for tile in row]
+
+def random_walk_board(size, steps, rng=random):
+    """Scramble the goal board with a non-backtracking random walk"""
+    tiles = random_walk_tiles(size, steps, rng)
+    return [tiles[i * size:(i + 1) * size] for i in range(size)]
+
+def _default_heuristic(size):
+    from .pdb import get_pattern_database
+    try:
+        return get_pattern_database(size).heuristic
+    except (FileNotFoundError, ValueError):
+        return NPuzzleState.manhattan_distance
+
+def random_tiles_at_distance(size, distance, rng=random, max_attempts=1000, heuristic_func=None):
+    """Random solvable flat board whose optimal solution is exactly `distance` moves
+
+    Small sizes sample uniformly from the exact depth layers. Larger boards
+    are proposed by random walks of distance, distance + 2, ... moves (the
+    parity always matches) and accepted once IDA* confirms the optimal
+    length, which is only quick for moderate distances.
+    """
+    if size in EXACT_DEPTH_SIZES:
+        layers = depth_layers(size)
+        if not 0 <= distance < len(layers):
+            raise ValueError(f"No {size}x{size} board is {distance} moves from the goal (max {len(layers) - 1})")
+        key = rng.choice(layers[distance])
+        return [tile for row in decode_board(key, size) for tile in row]
+
+    heuristic_func = heuristic_func or _default_heuristic(size)
+    engine = AdvancedAIEngine()
+    for attempt in range(max_attempts):
+        tiles = random_walk_tiles(size, distance + 2 * (attempt % 4), rng)
+        state = NPuzzleState([tiles[i * size:(i + 1) * size] for i in range(size)], size)
+        if heuristic_func(state) > distance:
+            continue
+        path = engine.ida_star_search(state, heuristic_func)
+        if path is not None and len(path) == distance:
+            return tiles
+    raise ValueError(f"No {size}x{size} board at distance {distance} found in {max_attempts} attempts")
+
+def random_board_at_distance(size, distance, rng=random, max_attempts=1000, heuristic_func=None):
+    """List-of-lists version of random_tiles_at_distance"""
+    tiles = random_tiles_at_distance(size, distance, rng, max_attempts, heuristic_func)
+    return [tiles[i * size:(i + 1) * size] for i in range(size)]
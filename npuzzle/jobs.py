@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+
+from .engine import AdvancedAIEngine, SearchCancelled
+
+def current_rss():
+    """Resident set size of this process in bytes, or None where /proc/self/statm is unavailable"""
+    try:
+        import resource
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * resource.getpagesize()
+    except (ImportError, OSError, IndexError, ValueError):
+        return None
+
+class CancelToken:
+    """Cooperative cancellation flag shared between a job and its owner"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason='cancelled'):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+class SolverJob:
+    """One solve running on a background thread, with a cancel token, budgets and progress reports
+
+    The engine polls the job every 1024 expansions. The job stops the search
+    when the token is cancelled or the wall-clock (seconds) or memory (bytes
+    of RSS growth since the start) budget runs out, and otherwise puts a
+    progress snapshot on `progress` at most every `progress_interval`
+    seconds. The memory budget needs /proc/self/statm and is not enforced
+    without it. Snapshots are dicts with nodes, bound, frontier,
+    nodes_per_sec, max_depth, elapsed and rss (None where unknown). Streaming algorithms also put
+    ('solution', path, bound) and ('move', name) tuples on `partial` as
+    they find better solutions or commit moves.
+
+    status moves from 'pending' to 'running' and finally to one of 'solved',
+    'unsolved', 'cancelled', 'timeout', 'memory' or 'error'.
+    """
+
+    def __init__(self, state, algorithm, time_limit=None, memory_limit=None, progress_interval=0.1, weight=None):
+        self.state = state
+        self.algorithm = algorithm
+        self.weight = weight
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.progress_interval = progress_interval
+        self.token = CancelToken()
+        self.progress = queue.Queue()
+        self.partial = queue.Queue()
+        self.engine = AdvancedAIEngine(monitor=self)
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.stats = self.engine.stats
+        self._thread = None
+        self._done = threading.Event()
+        self._start_time = None
+        self._start_rss = None
+        self._last_report = 0.0
+
+    def start(self):
+        """Run the job on a daemon thread and return self"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self, reason='cancelled'):
+        self.token.cancel(reason)
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns done()"""
+        return self._done.wait(timeout)
+
+    def snapshots(self):
+        """Drain and return every progress snapshot published so far"""
+        return self._drain(self.progress)
+
+    def partial_results(self):
+        """Drain and return every ('solution', path, bound) and ('move', name) published so far"""
+        return self._drain(self.partial)
+
+    @staticmethod
+    def _drain(source):
+        items = []
+        while True:
+            try:
+                items.append(source.get_nowait())
+            except queue.Empty:
+                return items
+
+    def run(self):
+        """Run the search in the calling thread"""
+        self._start_time = time.perf_counter()
+        self._start_rss = current_rss() if self.memory_limit is not None else None
+        self.status = 'running'
+        try:
+            if self.token.cancelled:
+                raise SearchCancelled()
+            self.result = self.engine.solve(
+                self.state, self.algorithm, self.weight,
+                on_solution=lambda path, bound: self.partial.put(('solution', path, bound)),
+                on_move=lambda name: self.partial.put(('move', name)))
+            self.status = 'solved' if self.result is not None else 'unsolved'
+        except SearchCancelled:
+            self.status = self.token.reason or 'cancelled'
+        except Exception as e:
+            self.status = 'error'
+            self.error = e
+        finally:
+            self.stats = self.engine.stats
+            if self.status not in ('solved', 'unsolved'):
+                self.stats['time_elapsed'] = time.perf_counter() - self._start_time
+            self.progress.put(self._snapshot(self.stats, None, 0))
+            self._done.set()
+
+    def _snapshot(self, stats, bound, frontier):
+        elapsed = time.perf_counter() - self._start_time
+        nodes = stats['nodes_explored']
+        return {'nodes': nodes, 'bound': bound, 'frontier': frontier, 'max_depth': stats['max_depth'],
+                'nodes_per_sec': nodes / elapsed if elapsed > 0 else 0.0, 'elapsed': elapsed,
+                'rss': current_rss(), 'status': self.status}
+
+    def poll(self, stats, bound, frontier):
+        """Engine monitor hook: returns True when the search must stop"""
+        if self.token.cancelled:
+            return True
+        now = time.perf_counter()
+        if self.time_limit is not None and now - self._start_time > self.time_limit:
+            self.token.cancel('timeout')
+            return True
+        if self._start_rss is not None:
+            rss = current_rss()
+            if rss is not None and rss - self._start_rss > self.memory_limit:
+                self.token.cancel('memory')
+                return True
+        if now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            self.progress.put(self._snapshot(stats, bound, frontier))
+        return False
@@ -0,0 +1,141 @@
+import sys
+from array import array
+
+# Fibonacci hashing: spreads hash(key) over the table, whose size is a power of two
+_MIX = 0x9E3779B97F4A7C15
+_WORD = (1 << 64) - 1
+
+class NodeStore:
+    """Every state generated by a best-first search, one row per state in parallel arrays
+
+    A row holds the packed key, g, h, the row of the parent (-1 at the
+    root), the index of the move that reached it and the blank cell. Keys
+    are found through an open-addressing table of row numbers, so a state
+    costs a few dozen bytes instead of a state object, a heap tuple and
+    entries in several dicts. Keys of boards up to 4x4 fit in 64 bits and
+    are stored unboxed; larger boards keep a list of ints.
+    """
+
+    def __init__(self, ctx, integral=True, capacity=1 << 12):
+        wide = ctx.cells * ctx.bits > 64
+        self.keys = [] if wide else array('Q')
+        self.g = array('H')
+        self.h = array('H' if integral else 'd')
+        self.parent = array('i')
+        self.move = array('b')
+        self.blank = array('B')
+        self._resize(capacity)
+
+    def __len__(self):
+        return len(self.g)
+
+    def _resize(self, capacity):
+        # Slots hold row + 1, so zero marks an empty slot
+        self.slots = array('i', bytes(4 * capacity))
+        self.mask = capacity - 1
+        self.shift = 64 - capacity.bit_length() + 1
+        slots = self.slots
+        mask = self.mask
+        shift = self.shift
+        for row, key in enumerate(self.keys):
+            slot = (hash(key) * _MIX & _WORD) >> shift
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = row + 1
+
+    def find(self, key):
+        """Row of key, or -1 - slot for the empty slot add() should fill"""
+        slots = self.slots
+        keys = self.keys
+        mask = self.mask
+        slot = (hash(key) * _MIX & _WORD) >> self.shift
+        while True:
+            row = slots[slot]
+            if not row:
+                return -1 - slot
+            if keys[row - 1] == key:
+                return row - 1
+            slot = (slot + 1) & mask
+
+    def add(self, key, slot, g, h, parent, move, blank):
+        """Store a new state in the slot returned by find(); returns its row"""
+        row = len(self.g)
+        self.slots[slot] = row + 1
+        self.keys.append(key)
+        self.g.append(g)
+        self.h.append(h)
+        self.parent.append(parent)
+        self.move.append(move)
+        self.blank.append(blank)
+        if 2 * (row + 1) > len(self.slots):
+            self._resize(2 * len(self.slots))
+        return row
+
+    def path(self, row):
+        """Move indices from the root to row"""
+        moves = []
+        parent = self.parent
+        move = self.move
+        while parent[row] >= 0:
+            moves.append(move[row])
+            row = parent[row]
+        moves.reverse()
+        return moves
+
+    def nbytes(self):
+        """Bytes held by the arrays, plus the boxed keys of large boards"""
+        total = sum(column.itemsize * len(column)
+                    for column in (self.g, self.h, self.parent, self.move, self.blank, self.slots))
+        if isinstance(self.keys, array):
+            return total + self.keys.itemsize * len(self.keys)
+        return total + sum(8 + sys.getsizeof(key) for key in self.keys)
+
+class BucketQueue:
+    """Open list for integer f: one bucket per f, holding a LIFO stack of rows per g
+
+    pop() returns the most recently pushed row with the smallest f and,
+    among those, the largest g, so ties go to the deepest and newest node.
+    Stacks are int arrays, four bytes per entry. Entries are never removed
+    on decrease-key; callers skip the ones whose g no longer matches.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.min_f = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, f, g, row):
+        buckets = self.buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        stacks = buckets[f]
+        while len(stacks) <= g:
+            stacks.append(array('i'))
+        stacks[g].append(row)
+        if f < self.min_f:
+            self.min_f = f
+        self.count += 1
+
+    def pop(self):
+        """(f, g, row) of the next entry; raises IndexError when empty"""
+        if not self.count:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self.buckets
+        f = self.min_f
+        while True:
+            stacks = buckets[f]
+            while stacks and not stacks[-1]:
+                stacks.pop()
+            if stacks:
+                break
+            f += 1
+        self.min_f = f
+        self.count -= 1
+        g = len(stacks) - 1
+        return f, g, stacks[g].pop()
+
+    def nbytes(self):
+        return sum(4 * len(stack) for stacks in self.buckets for stack in stacks)
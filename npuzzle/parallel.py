@@ -0,0 +1,264 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .state import MOVES, NPuzzleState, incremental_heuristic
+from .engine import AdvancedAIEngine, SearchCancelled, threshold_search, INVERSE_MOVE
+
+HEURISTIC_NAMES = ('manhattan', 'linear_conflict', 'pdb')
+
+_stop_event = None
+
+def resolve_heuristic(name, size):
+    """Turn a picklable heuristic name into an engine heuristic_func"""
+    if name == 'manhattan':
+        return NPuzzleState.manhattan_distance
+    if name == 'linear_conflict':
+        return NPuzzleState.linear_conflict
+    if name == 'pdb':
+        from .pdb import get_pattern_database
+        return get_pattern_database(size).heuristic
+    raise ValueError(f"Unknown heuristic '{name}', expected one of {HEURISTIC_NAMES}")
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+def _search_subtree(key, blank, size, g, last_move, threshold, heuristic_name):
+    """Worker: bounded DFS below one split node; returns (moves, next_threshold, stats)"""
+    state = NPuzzleState.from_key(key, size, blank)
+    evaluator = incremental_heuristic(resolve_heuristic(heuristic_name, size), state)
+    stats = {'nodes_explored': 0, 'max_depth': 0}
+    try:
+        moves, next_threshold = threshold_search(
+            state.tiles(), key, blank, size, evaluator.initial(state), g, last_move,
+            threshold, evaluator, stats, should_stop=_stop_event.is_set)
+    except SearchCancelled:
+        return None, float('inf'), stats
+    if moves is not None:
+        _stop_event.set()
+    return moves, next_threshold, stats
+
+def _solve_one(index, board, size, heuristic_name):
+    """Worker: solve a whole board with the sequential iterative IDA*"""
+    engine = AdvancedAIEngine()
+    state = NPuzzleState(board, size)
+    if not state.is_solvable():
+        return index, board, None, dict(engine.stats, solvable=False)
+    path = engine.ida_star_search(state, resolve_heuristic(heuristic_name, size))
+    return index, board, path, engine.stats
+
+def split_frontier(initial_state, depth, stats=None):
+    """Expand the root breadth-first to a fixed depth without undo moves
+
+    Returns (goal_moves, frontier): goal_moves is an optimal path if the goal
+    is that close, otherwise None; frontier holds (key, blank, moves) for the
+    distinct states exactly `depth` moves away.
+    """
+    ctx = initial_state.ctx
+    move_table = ctx.moves
+    bits = ctx.bits
+    mask = ctx.mask
+    goal = ctx.goal_key
+    if initial_state.key == goal:
+        return [], []
+    layer = [(initial_state.key, initial_state.blank, [])]
+    for _ in range(depth):
+        next_layer = []
+        seen = set()
+        for key, blank, moves in layer:
+            for move, target in move_table[blank]:
+                if moves and move == INVERSE_MOVE[moves[-1]]:
+                    continue
+                if stats is not None:
+                    stats['nodes_explored'] += 1
+                tile = (key >> (target * bits)) & mask
+                new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                if new_key in seen:
+                    continue
+                seen.add(new_key)
+                if new_key == goal:
+                    return moves + [move], []
+                next_layer.append((new_key, target, moves + [move]))
+        layer = next_layer
+        if stats is not None:
+            stats['max_depth'] = max(stats['max_depth'], len(layer[0][2]) if layer else 0)
+    return None, layer
+
+class ParallelIDAStar:
+    """IDA* that farms the subtrees below a fixed split depth out to worker processes
+
+    All workers search the same f threshold per iteration; the next threshold
+    is the minimum any worker overshot by. The first worker to reach the goal
+    sets a shared event so the others abandon their subtrees.
+    """
+
+    def __init__(self, workers=None, split_depth=None, heuristic='manhattan', mp_context=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.split_depth = split_depth
+        self.heuristic = heuristic
+        self.mp_context = mp_context
+        self.stats = AdvancedAIEngine().stats
+
+    def _pick_split_depth(self, size):
+        """Shallowest depth that gives every worker a good handful of subtrees"""
+        if self.split_depth is not None:
+            return self.split_depth
+        # Non-undo branching factor is a little above 2 on every board size
+        return max(2, int(math.ceil(math.log(self.workers * 16, 2.1))))
+
+    def solve(self, initial_state, max_iterations=100, monitor=None):
+        """Return the optimal move list (or None) for initial_state
+
+        An optional monitor (see AdvancedAIEngine) is polled while waiting on
+        the workers; when it asks to stop, the workers are told to abandon
+        their subtrees and SearchCancelled is raised.
+        """
+        engine = AdvancedAIEngine()
+        self.stats = engine.stats
+        start_time = time.perf_counter()
+        size = initial_state.size
+        depth = self._pick_split_depth(size)
+
+        goal_moves, frontier = split_frontier(initial_state, depth, self.stats)
+        if goal_moves is not None:
+            path = [MOVES[m][0] for m in goal_moves]
+            self.stats.update(time_elapsed=time.perf_counter() - start_time, solution_length=len(path))
+            return path
+
+        heuristic_func = resolve_heuristic(self.heuristic, size)
+        threshold = heuristic_func(initial_state)
+        context = self.mp_context or multiprocessing.get_context()
+        stop_event = context.Event()
+
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(stop_event,)) as pool:
+            for iteration in range(max_iterations):
+                # A subtree whose root already overshoots needs no worker
+                pending = []
+                next_threshold = float('inf')
+                for key, blank, moves in frontier:
+                    f = depth + heuristic_func(NPuzzleState.from_key(key, size, blank))
+                    if f > threshold:
+                        next_threshold = min(next_threshold, f)
+                    else:
+                        pending.append((pool.submit(_search_subtree, key, blank, size, depth, moves[-1],
+                                                    threshold, self.heuristic), moves))
+
+                found = None
+                for future, prefix in pending:
+                    while monitor is not None and not future.done():
+                        wait([future], timeout=0.1)
+                        if monitor.poll(self.stats, threshold, len(pending)):
+                            stop_event.set()
+                            for queued, _ in pending:
+                                queued.cancel()
+                            raise SearchCancelled()
+                    moves, overshoot, stats = future.result()
+                    self.stats['nodes_explored'] += stats['nodes_explored']
+                    self.stats['max_depth'] = max(self.stats['max_depth'], stats['max_depth'])
+                    next_threshold = min(next_threshold, overshoot)
+                    if moves is not None and found is None:
+                        found = prefix + moves
+
+                if found is not None:
+                    path = [MOVES[m][0] for m in found]
+                    self.stats.update(time_elapsed=time.perf_counter() - start_time, solution_length=len(path))
+                    return path
+                if next_threshold == float('inf'):
+                    break
+                threshold = next_threshold
+
+        self.stats['time_elapsed'] = time.perf_counter() - start_time
+        return None
+
+def read_boards(path):
+    """Yield flat boards from a text file, one board per line (spaces or commas)"""
+    with open(path) as handle:
+        for line in handle:
+            line = line.split('#', 1)[0].replace(',', ' ').strip()
+            if line:
+                yield [int(token) for token in line.split()]
+
+def to_rows(flat):
+    """Flat tile list to a list-of-lists board"""
+    size = math.isqrt(len(flat))
+    if size * size != len(flat) or sorted(flat) != list(range(len(flat))):
+        raise ValueError(f"Not a valid square board: {flat}")
+    return [flat[i * size:(i + 1) * size] for i in range(size)]
+
+def solve_batch(boards, heuristic='manhattan', workers=None, mp_context=None, in_flight=None):
+    """Solve many boards in parallel, yielding results as they complete
+
+    `boards` is any iterable of flat or list-of-lists boards and is consumed
+    lazily, with at most `in_flight` boards queued at once. Each result is a
+    dict with the input index, the board, the move list (None if unsolved or
+    unsolvable) and the per-board engine stats.
+    """
+    workers = workers or os.cpu_count() or 1
+    in_flight = in_flight or workers * 4
+    context = mp_context or multiprocessing.get_context()
+    boards = iter(boards)
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        running = set()
+        index = 0
+        exhausted = False
+        while running or not exhausted:
+            while not exhausted and len(running) < in_flight:
+                board = next(boards, None)
+                if board is None:
+                    exhausted = True
+                    break
+                rows = board if isinstance(board[0], list) else to_rows(board)
+                running.add(pool.submit(_solve_one, index, rows, len(rows), heuristic))
+                index += 1
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                board_index, rows, path, stats = future.result()
+                yield {'index': board_index, 'board': [tile for row in rows for tile in row],
+                       'path': path, 'stats': stats}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel N-puzzle solving with worker processes")
+    sub = parser.add_subparsers(dest='command', required=True)
+    batch = sub.add_parser('batch', help="solve every board in a file, streaming JSON lines")
+    batch.add_argument('boards', help="text file with one board per line")
+    batch.add_argument('--workers', type=int, default=None)
+    batch.add_argument('--heuristic', choices=HEURISTIC_NAMES, default='manhattan')
+    batch.add_argument('--out', default='-', help="output JSON-lines file (default stdout)")
+    solve = sub.add_parser('solve', help="solve one board with parallel IDA*")
+    solve.add_argument('tiles', nargs='+', type=int)
+    solve.add_argument('--workers', type=int, default=None)
+    solve.add_argument('--split-depth', type=int, default=None)
+    solve.add_argument('--heuristic', choices=HEURISTIC_NAMES, default='manhattan')
+    args = parser.parse_args(argv)
+
+    if args.command == 'solve':
+        rows = to_rows(args.tiles)
+        solver = ParallelIDAStar(args.workers, args.split_depth, args.heuristic)
+        path = solver.solve(NPuzzleState(rows, len(rows)))
+        print(json.dumps({'path': path, 'stats': solver.stats}))
+        return
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w')
+    start = time.perf_counter()
+    solved = 0
+    try:
+        for result in solve_batch(read_boards(args.boards), args.heuristic, args.workers):
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            solved += result['path'] is not None
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"solved {solved} boards in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
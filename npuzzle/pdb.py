@@ -0,0 +1,362 @@
+import argparse
+import json
+import mmap
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:  # Only the table generator needs NumPy
+    np = None
+
+DEFAULT_PDB_DIR = os.environ.get('NPUZZLE_PDB_DIR', os.path.join(os.path.dirname(__file__), 'pdb_data'))
+
+# Disjoint tile groups per board size; every non-blank tile is in exactly one group
+PATTERNS = {
+    3: ((1, 2, 4, 5), (3, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 3, 6, 7, 8), (4, 5, 9, 10, 14, 15),
+        (11, 12, 16, 17, 21, 22), (13, 18, 19, 20, 23, 24)),
+}
+
+UNSEEN = 255
+CHUNK = 1 << 21
+
+# An interrupted build resumes from the last checkpoint, written every few levels or minutes
+CHECKPOINT_LEVELS = 4
+CHECKPOINT_SECONDS = 300.0
+CHECKPOINT_FORMAT = 2
+
+_LOADED = {}
+
+def table_name(size, pattern):
+    """File stem for one pattern table, e.g. pdb-4-1_5_6_9_10_13"""
+    return f"pdb-{size}-{'_'.join(str(tile) for tile in pattern)}"
+
+def table_entries(cells, k):
+    """Number of ways to place k distinct tiles on the board: cells! / (cells - k)!"""
+    entries = 1
+    for i in range(k):
+        entries *= cells - i
+    return entries
+
+def rank_positions(positions, cells):
+    """Rank one tuple of distinct cells in 0 .. table_entries(cells, len) - 1"""
+    rank = 0
+    for i, position in enumerate(positions):
+        digit = position
+        for j in range(i):
+            if positions[j] < position:
+                digit -= 1
+        rank = rank * (cells - i) + digit
+    return rank
+
+def _rank_array(positions, cells):
+    """Vectorised rank_positions over an (m, k) array"""
+    rank = np.zeros(positions.shape[0], dtype=np.int64)
+    for i in range(positions.shape[1]):
+        digit = positions[:, i].astype(np.int64)
+        for j in range(i):
+            digit -= positions[:, j] < positions[:, i]
+        rank = rank * (cells - i) + digit
+    return rank
+
+def _unrank_array(ranks, k, cells):
+    """Inverse of _rank_array: ranks back to an (m, k) array of cells"""
+    digits = np.empty((ranks.shape[0], k), dtype=np.int64)
+    remainder = ranks.copy()
+    for i in reversed(range(k)):
+        digits[:, i] = remainder % (cells - i)
+        remainder //= cells - i
+
+    positions = np.empty((ranks.shape[0], k), dtype=np.int8)
+    for i in range(k):
+        # Digit i picks the digit-th cell not already used by tiles 0 .. i-1
+        cell = digits[:, i]
+        if i:
+            used = np.sort(positions[:, :i], axis=1)
+            for j in range(i):
+                cell += cell >= used[:, j]
+        positions[:, i] = cell
+    return positions
+
+def _neighbor_table(size):
+    """(cells, 4) array of the cell reached by each blank move, -1 when off the board"""
+    table = np.full((size * size, 4), -1, dtype=np.int8)
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        for d, (dr, dc) in enumerate(((-1, 0), (1, 0), (0, -1), (0, 1))):
+            if 0 <= row + dr < size and 0 <= col + dc < size:
+                table[cell, d] = (row + dr) * size + col + dc
+    return table
+
+def _successors(positions, neighbors, cost):
+    """Ranks reached by one blank move that costs 0 (empty cell) or 1 (pattern tile)"""
+    k = positions.shape[1] - 1
+    cells = neighbors.shape[0]
+    blank = positions[:, k].astype(np.intp)
+    results = []
+    for d in range(4):
+        target = neighbors[blank, d]
+        hit = positions[:, :k] == target[:, None]
+        occupied = hit.any(axis=1)
+        keep = (target >= 0) & (occupied if cost else ~occupied)
+        if not keep.any():
+            continue
+        moved = positions[keep].copy()
+        if cost:
+            # The pattern tile slides into the old blank cell
+            moved[:, :k][hit[keep]] = moved[:, k]
+        moved[:, k] = target[keep]
+        results.append(_rank_array(moved, cells))
+    if not results:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(results))
+
+def _unseen(seen, ranks):
+    """Ranks whose bit is still clear in the packed bit array seen"""
+    bits = seen[ranks >> 3] >> (ranks & 7).astype(np.uint8)
+    return ranks[(bits & 1) == 0]
+
+def _mark(seen, ranks):
+    np.bitwise_or.at(seen, ranks >> 3, np.left_shift(1, ranks & 7).astype(np.uint8))
+
+def _expand(frontier, seen, depth, value, neighbors, k, cost):
+    """Mark unseen successors of the frontier as seen and return them
+
+    Successors are ranks over (pattern cells, blank cell), tracked one bit
+    each in seen. The blank cell is the last, fastest-varying digit of that
+    rank, so rank // (cells - k) is the rank of the pattern cells alone;
+    depth keeps one byte per pattern placement, set by the first level that
+    reaches it with any blank cell.
+    """
+    cells = neighbors.shape[0]
+    found = []
+    for start in range(0, frontier.shape[0], CHUNK):
+        positions = _unrank_array(frontier[start:start + CHUNK], k + 1, cells)
+        children = _unseen(seen, _successors(positions, neighbors, cost))
+        _mark(seen, children)
+        placements = children // (cells - k)
+        depth[placements[depth[placements] == UNSEEN]] = value
+        found.append(children)
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(found))
+
+def _save_checkpoint(work_dir, stem, depth, seen, frontier, level):
+    """Write the BFS state after a finished level; os.replace keeps it atomic"""
+    for suffix, array in (('depth', depth), ('seen', seen), ('frontier', frontier)):
+        path = os.path.join(work_dir, f"{stem}.{suffix}.npy")
+        with open(path + '.tmp', 'wb') as handle:
+            np.save(handle, array)
+        os.replace(path + '.tmp', path)
+    meta = os.path.join(work_dir, f"{stem}.checkpoint.json")
+    with open(meta + '.tmp', 'w') as handle:
+        json.dump({'level': level, 'format': CHECKPOINT_FORMAT}, handle)
+    os.replace(meta + '.tmp', meta)
+
+def _load_checkpoint(work_dir, stem):
+    meta = os.path.join(work_dir, f"{stem}.checkpoint.json")
+    if not os.path.exists(meta):
+        return None
+    with open(meta) as handle:
+        info = json.load(handle)
+    if info.get('format') != CHECKPOINT_FORMAT:
+        # Written by an older generator with a different layout; start over
+        _clear_checkpoint(work_dir, stem)
+        return None
+    depth = np.load(os.path.join(work_dir, f"{stem}.depth.npy"))
+    seen = np.load(os.path.join(work_dir, f"{stem}.seen.npy"))
+    frontier = np.load(os.path.join(work_dir, f"{stem}.frontier.npy"))
+    return depth, seen, frontier, info['level']
+
+def _clear_checkpoint(work_dir, stem):
+    for suffix in ('checkpoint.json', 'depth.npy', 'seen.npy', 'frontier.npy'):
+        path = os.path.join(work_dir, f"{stem}.{suffix}")
+        if os.path.exists(path):
+            os.remove(path)
+
+def build_pattern_table(size, pattern, directory=DEFAULT_PDB_DIR, verbose=False,
+                        checkpoint_levels=CHECKPOINT_LEVELS, checkpoint_seconds=CHECKPOINT_SECONDS):
+    """Build one pattern table by backward 0-1 BFS from the goal and write it to disk
+
+    The search runs over (pattern tile cells, blank cell) so that only moves of
+    pattern tiles cost 1; the stored table keeps the minimum over blank cells.
+    Visited search states take one bit each and the table one byte per pattern
+    placement, about a fifth of a byte per search state. Progress is
+    checkpointed every checkpoint_levels levels or checkpoint_seconds seconds,
+    whichever comes first, so an interrupted build resumes from there and
+    always produces the same bytes.
+    """
+    if np is None:
+        raise RuntimeError("Building pattern databases requires NumPy")
+
+    cells = size * size
+    k = len(pattern)
+    stem = table_name(size, pattern)
+    os.makedirs(directory, exist_ok=True)
+    out_path = os.path.join(directory, stem + '.bin')
+    if os.path.exists(out_path):
+        return out_path
+
+    neighbors = _neighbor_table(size)
+    checkpoint = _load_checkpoint(directory, stem)
+    if checkpoint is not None:
+        depth, seen, frontier, level = checkpoint
+    else:
+        depth = np.full(table_entries(cells, k), UNSEEN, dtype=np.uint8)
+        seen = np.zeros((table_entries(cells, k + 1) + 7) // 8, dtype=np.uint8)
+        goal = np.array([[tile - 1 for tile in pattern] + [cells - 1]], dtype=np.int8)
+        frontier = _rank_array(goal, cells)
+        _mark(seen, frontier)
+        depth[frontier // (cells - k)] = 0
+        level = 0
+
+    start = saved_at = time.time()
+    saved_level = level
+    while frontier.shape[0]:
+        # Close the level under free blank moves, then step every state once
+        layer = [frontier]
+        current = frontier
+        while current.shape[0]:
+            current = _expand(current, seen, depth, level, neighbors, k, cost=0)
+            layer.append(current)
+        frontier = _expand(np.concatenate(layer), seen, depth, level + 1, neighbors, k, cost=1)
+        level += 1
+        if verbose:
+            print(f"{stem}: level {level} frontier={frontier.shape[0]:,} ({time.time() - start:.1f}s)")
+        if frontier.shape[0] and (level - saved_level >= checkpoint_levels
+                                  or time.time() - saved_at >= checkpoint_seconds):
+            _save_checkpoint(directory, stem, depth, seen, frontier, level)
+            saved_at = time.time()
+            saved_level = level
+
+    with open(out_path + '.tmp', 'wb') as handle:
+        handle.write(depth.tobytes())
+    os.replace(out_path + '.tmp', out_path)
+    with open(os.path.join(directory, stem + '.json'), 'w') as handle:
+        json.dump({'size': size, 'pattern': list(pattern), 'entries': int(depth.shape[0]),
+                   'max_value': int(depth.max())}, handle)
+    _clear_checkpoint(directory, stem)
+    return out_path
+
+def build_pattern_databases(size, directory=DEFAULT_PDB_DIR, verbose=False):
+    """Build every pattern table for a board size"""
+    if size not in PATTERNS:
+        raise ValueError(f"No pattern partition defined for a {size}x{size} board")
+    return [build_pattern_table(size, pattern, directory, verbose) for pattern in PATTERNS[size]]
+
+class PatternDatabase:
+    """Disjoint additive pattern database backed by memory-mapped tables"""
+
+    def __init__(self, size, directory=DEFAULT_PDB_DIR, patterns=None):
+        self.size = size
+        self.patterns = patterns or PATTERNS.get(size)
+        if not self.patterns:
+            raise ValueError(f"No pattern partition defined for a {size}x{size} board")
+        self.tables = []
+        self._maps = []
+        for pattern in self.patterns:
+            path = os.path.join(directory, table_name(size, pattern) + '.bin')
+            if not os.path.exists(path):
+                raise FileNotFoundError(
+                    f"Missing pattern table {path}; build it with "
+                    f"'python -m npuzzle.pdb build --size {size}'")
+            with open(path, 'rb') as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(mapped) != table_entries(size * size, len(pattern)):
+                raise ValueError(f"Pattern table {path} has the wrong length")
+            self._maps.append(mapped)
+            self.tables.append(memoryview(mapped))
+
+    def close(self):
+        """Release the memory maps"""
+        for view in self.tables:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self.tables = []
+        self._maps = []
+
+    def lookup(self, tiles):
+        """Heuristic for a flat row-major tile list"""
+        cells = self.size * self.size
+        where = [0] * cells
+        for cell, tile in enumerate(tiles):
+            where[tile] = cell
+        total = 0
+        for pattern, table in zip(self.patterns, self.tables):
+            total += table[rank_positions([where[tile] for tile in pattern], cells)]
+        return total
+
+    def heuristic(self, state):
+        """Heuristic for an NPuzzleState, usable as an engine heuristic_func"""
+        return self.lookup(state.tiles())
+
+    def incremental(self, state):
+        """In-place evaluator for the iterative IDA*, starting from state"""
+        return PatternDelta(self, state.tiles())
+
+class PatternDelta:
+    """Incremental pattern-database lookup: a move only changes its tile's group"""
+
+    stateless = False  # Tracks the current board through push/pop
+
+    def __init__(self, database, tiles):
+        self.database = database
+        self.cells = database.size * database.size
+        self.where = [0] * self.cells
+        for cell, tile in enumerate(tiles):
+            self.where[tile] = cell
+        self.group_of = {}
+        for group, pattern in enumerate(database.patterns):
+            for tile in pattern:
+                self.group_of[tile] = (pattern, database.tables[group])
+
+    def initial(self, state):
+        return self.database.heuristic(state)
+
+    def delta(self, h, tile, src, dst, key_before, key_after):
+        pattern, table = self.group_of[tile]
+        where = self.where
+        before = table[rank_positions([where[t] for t in pattern], self.cells)]
+        where[tile] = dst
+        after = table[rank_positions([where[t] for t in pattern], self.cells)]
+        where[tile] = src
+        return h + after - before
+
+    def push(self, tile, src, dst):
+        self.where[tile] = dst
+
+    def pop(self, tile, src, dst):
+        self.where[tile] = src
+
+def get_pattern_database(size, directory=DEFAULT_PDB_DIR):
+    """Load (once per process) the pattern database for a board size"""
+    database = _LOADED.get((size, directory))
+    if database is None:
+        database = _LOADED[(size, directory)] = PatternDatabase(size, directory)
+    return database
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect additive pattern databases")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="generate the tables for a board size (resumable)")
+    build.add_argument('--size', type=int, required=True, choices=sorted(PATTERNS))
+    build.add_argument('--dir', default=DEFAULT_PDB_DIR)
+    info = sub.add_parser('info', help="show which tables exist for a board size")
+    info.add_argument('--size', type=int, required=True, choices=sorted(PATTERNS))
+    info.add_argument('--dir', default=DEFAULT_PDB_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        for path in build_pattern_databases(args.size, args.dir, verbose=True):
+            print(path)
+    else:
+        for pattern in PATTERNS[args.size]:
+            path = os.path.join(args.dir, table_name(args.size, pattern) + '.bin')
+            status = f"{os.path.getsize(path):,} bytes" if os.path.exists(path) else "missing"
+            print(f"{table_name(args.size, pattern)}: {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import heapq
+
+from .state import INVERSE_MOVE, MOVE_INDEX, MOVES, TRANSPOSED_MOVE, NPuzzleState, puzzle_context, transpose_key
+
+_CELL_DISTANCES = {}
+
+def _cell_distances(size):
+    """Grid distance between every pair of cells"""
+    table = _CELL_DISTANCES.get(size)
+    if table is None:
+        cells = size * size
+        table = _CELL_DISTANCES[size] = [[abs(a // size - b // size) + abs(a % size - b % size)
+                                          for b in range(cells)] for a in range(cells)]
+    return table
+
+def _move_index(size, blank, target):
+    """Index into MOVES of the blank move from blank to the adjacent target cell"""
+    delta = target - blank
+    if delta == -size:
+        return 0
+    if delta == size:
+        return 1
+    return 2 if delta == -1 else 3
+
+def _place_group(size, tiles, blank, group, frozen, weight=3.0):
+    """Moves that bring every tile of `group` home without touching frozen cells
+
+    Only the blank and the group tiles matter for this sub-goal, so the
+    search runs over (blank, group positions) and ignores every other tile,
+    which keeps it to a few thousand states even on a 6x6 board. Weighted A*
+    is used because a short plan is all that is needed, not the shortest one.
+    """
+    cells = size * size
+    goals = tuple(tile - 1 for tile in group)
+    start = (blank,) + tuple(tiles.index(tile) for tile in group)
+    if start[1:] == goals:
+        return []
+    neighbors = []
+    for cell in range(cells):
+        row, col = divmod(cell, size)
+        options = []
+        for _, dr, dc in MOVES:
+            if 0 <= row + dr < size and 0 <= col + dc < size and not frozen[(row + dr) * size + col + dc]:
+                options.append((row + dr) * size + col + dc)
+        neighbors.append(options)
+
+    manhattan = _cell_distances(size)
+
+    def estimate(node):
+        # Tile distances plus the walk the blank needs to reach a misplaced tile
+        total = 0
+        reach = cells
+        near = manhattan[node[0]]
+        for position, goal in zip(node[1:], goals):
+            if position != goal:
+                total += manhattan[position][goal]
+                reach = min(reach, near[position] - 1)
+        return total + reach if total else 0
+
+    parents = {start: None}
+    g_of = {start: 0}
+    open_list = [(weight * estimate(start), 0, start)]
+    while open_list:
+        _, g, node = heapq.heappop(open_list)
+        if g != g_of[node]:
+            continue
+        if node[1:] == goals:
+            path = []
+            while parents[node] is not None:
+                node, move = parents[node]
+                path.append(move)
+            path.reverse()
+            return path
+        empty = node[0]
+        for target in neighbors[empty]:
+            # A group tile on the target cell slides into the blank's cell
+            positions = tuple(empty if position == target else position for position in node[1:])
+            child = (target,) + positions
+            if g + 1 < g_of.get(child, cells * cells):
+                g_of[child] = g + 1
+                parents[child] = (node, _move_index(size, empty, target))
+                heapq.heappush(open_list, (g + 1 + weight * estimate(child), g + 1, child))
+    raise ValueError(f"Tiles {group} cannot be placed with the current frozen cells")
+
+def reduction_plan(size):
+    """Groups of tiles placed together, in order: rows from the top, then the last two rows column by column"""
+    plan = []
+    for row in range(size - 2):
+        base = row * size
+        plan.extend((base + col + 1,) for col in range(size - 2))
+        # The last two tiles of a row can only be placed together
+        plan.append((base + size - 1, base + size))
+    for col in range(size - 2):
+        plan.append(((size - 2) * size + col + 1, (size - 1) * size + col + 1))
+    plan.append(((size - 2) * size + size - 1, (size - 1) * size + size - 1, (size - 2) * size + size))
+    return plan
+
+def reduction_solve(state, weight=3.0, transpose=False):
+    """Fast, far-from-optimal solution: fix the board group by group and never disturb fixed tiles
+
+    Returns the list of move names, in the same blank-move convention as the
+    engine, or None for an unsolvable board. Runs in milliseconds on every
+    supported size. With transpose=True the mirrored board is solved
+    instead, which fixes columns before rows and is often a little shorter.
+    """
+    if not state.is_solvable():
+        return None
+    size = state.size
+    if transpose:
+        row, col = state.empty_pos
+        mirrored = NPuzzleState.from_key(transpose_key(state.key, size), size, col * size + row)
+        path = reduction_solve(mirrored, weight)
+        return [MOVES[TRANSPOSED_MOVE[MOVE_INDEX[name]]][0] for name in path]
+    tiles = state.tiles()
+    blank = state.blank
+    frozen = [False] * (size * size)
+    path = []
+    for group in reduction_plan(size):
+        # Bringing the first tile of a pair home on its own first leaves the
+        # pair search only the short final manoeuvre
+        stages = [group[:1], group] if len(group) > 1 else [group]
+        for stage in stages:
+            moves = _place_group(size, tiles, blank, stage, frozen, weight)
+            for move in moves:
+                _, dr, dc = MOVES[move]
+                target = blank + dr * size + dc
+                tiles[blank], tiles[target] = tiles[target], 0
+                blank = target
+            path.extend(MOVES[move][0] for move in moves)
+        for tile in group:
+            frozen[tile - 1] = True
+    return path
+
+def _path_boards(state, moves):
+    """(key, blank) of every board along a list of move indices, start included"""
+    size = state.size
+    ctx = state.ctx
+    bits = ctx.bits
+    mask = ctx.mask
+    key, blank = state.key, state.blank
+    boards = [(key, blank)]
+    for move in moves:
+        _, dr, dc = MOVES[move]
+        target = blank + dr * size + dc
+        tile = (key >> (target * bits)) & mask
+        key = key - (tile << (target * bits)) + (tile << (blank * bits))
+        blank = target
+        boards.append((key, blank))
+    return boards
+
+def _remove_cycles(state, moves):
+    """Cut out every stretch of moves that comes back to a board already visited"""
+    result = []
+    seen = {}
+    boards = []
+    for index, (key, _) in enumerate(_path_boards(state, moves)):
+        earlier = seen.get(key)
+        if earlier is not None:
+            for dropped, _ in boards[earlier + 1:]:
+                del seen[dropped]
+            del boards[earlier + 1:]
+            del result[earlier:]
+            continue
+        seen[key] = len(boards)
+        boards.append((key, None))
+        if index:
+            result.append(moves[index - 1])
+    return result
+
+def _bridge(size, start, end, limit):
+    """Move indices joining two boards in fewer than `limit` moves, or None
+
+    Breadth-first from both ends, always growing the smaller frontier, so a
+    window of 12 moves costs two searches of depth 6 at most.
+    """
+    if start[0] == end[0]:
+        return []
+    ctx = puzzle_context(size)
+    bits = ctx.bits
+    mask = ctx.mask
+    sides = [{start[0]: ()}, {end[0]: ()}]
+    frontiers = [[start], [end]]
+    depth = 0
+    while depth < limit - 1 and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other = sides[side], sides[1 - side]
+        next_frontier = []
+        for key, blank in frontiers[side]:
+            path = seen[key]
+            last = path[-1] if path else -1
+            for move, target in ctx.moves[blank]:
+                if last >= 0 and move == INVERSE_MOVE[last]:
+                    continue
+                tile = (key >> (target * bits)) & mask
+                new_key = key - (tile << (target * bits)) + (tile << (blank * bits))
+                if new_key in seen:
+                    continue
+                new_path = path + (move,)
+                if new_key in other:
+                    forward, backward = (new_path, other[new_key]) if side == 0 else (other[new_key], new_path)
+                    return list(forward) + [INVERSE_MOVE[m] for m in reversed(backward)]
+                seen[new_key] = new_path
+                next_frontier.append((new_key, target))
+        frontiers[side] = next_frontier
+        depth += 1
+    return None
+
+def shorten_path(state, path, window=12):
+    """Shorter equivalent of a move-name list: loops removed, then every window replaced by its shortest bridge
+
+    Windows overlap by half, so a detour straddling one boundary is caught
+    by the next window. The result reaches the same board as path.
+    """
+    size = state.size
+    moves = _remove_cycles(state, [MOVE_INDEX[name] for name in path])
+    start = 0
+    while start < len(moves):
+        end = min(start + window, len(moves))
+        boards = _path_boards(state, moves)
+        shortcut = _bridge(size, boards[start], boards[end], end - start)
+        if shortcut is not None:
+            moves[start:end] = shortcut
+        start += window // 2
+    return [MOVES[move][0] for move in _remove_cycles(state, moves)]
@@ -0,0 +1,163 @@
+import os
+import time
+
+from .state import MOVE_INDEX, MOVES, NPuzzleState, apply_path
+from .batch import _require_numpy, np
+
+DEFAULT_SOLUTIONS_PATH = os.environ.get('NPUZZLE_SOLUTIONS',
+                                        os.path.join(os.path.dirname(__file__), 'cache_data', 'solutions.txt'))
+
+SOLUTIONS_HEADER = '# npuzzle solutions v1: size, tiles, move count, moves at 2 bits each in hex'
+
+# Blank row and column change for each 2-bit move code (the index into MOVES)
+_MOVE_ROWS = tuple(dr for _, dr, _ in MOVES)
+_MOVE_COLS = tuple(dc for _, _, dc in MOVES)
+
+def encode_moves(path):
+    """Pack move names at 2 bits each, four per byte with the first move in the low bits"""
+    data = bytearray((len(path) + 3) // 4)
+    for index, name in enumerate(path):
+        data[index >> 2] |= MOVE_INDEX[name] << ((index & 3) * 2)
+    return bytes(data)
+
+def decode_moves(data, count):
+    """Move names back from encode_moves; count is needed since a zero code is UP"""
+    if count > 4 * len(data):
+        raise ValueError(f"{len(data)} bytes cannot hold {count} moves")
+    return [MOVES[(data[index >> 2] >> ((index & 3) * 2)) & 3][0] for index in range(count)]
+
+def write_solutions(path, records, append=False):
+    """Write (board, moves) pairs, one line each
+
+    A board is an NPuzzleState, a flat tile list or a list-of-lists board;
+    moves are move names. Lines read `size tiles... count hex`, with '-'
+    for an empty solution, so files can be concatenated and grepped.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fresh = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a' if append else 'w') as handle:
+        if fresh:
+            handle.write(SOLUTIONS_HEADER + '\n')
+        for board, moves in records:
+            tiles = _flat_tiles(board)
+            size = int(round(len(tiles) ** 0.5))
+            handle.write(f"{size} {' '.join(map(str, tiles))} {len(moves)} {encode_moves(moves).hex() or '-'}\n")
+
+def load_solutions(path):
+    """(size, tiles, moves) for every line of a file from write_solutions"""
+    records = []
+    with open(path) as handle:
+        for number, line in enumerate(handle, 1):
+            tokens = line.split('#', 1)[0].split()
+            if not tokens:
+                continue
+            size = int(tokens[0])
+            cells = size * size
+            if len(tokens) != cells + 3:
+                raise ValueError(f"{path}:{number}: expected {cells} tiles, a move count and the moves")
+            tiles = [int(token) for token in tokens[1:cells + 1]]
+            data = bytes.fromhex(tokens[-1]) if tokens[-1] != '-' else b''
+            records.append((size, tiles, decode_moves(data, int(tokens[-2]))))
+    return records
+
+def find_solution(records, state):
+    """Saved moves that take state to the goal, or None; each candidate is replayed before it is trusted"""
+    tiles = state.tiles()
+    for size, saved_tiles, moves in records:
+        if size == state.size and saved_tiles == tiles:
+            try:
+                if apply_path(state, moves).is_goal():
+                    return moves
+            except ValueError:
+                pass
+    return None
+
+def _flat_tiles(board):
+    if isinstance(board, NPuzzleState):
+        return board.tiles()
+    if board and isinstance(board[0], (list, tuple)):
+        return [tile for row in board for tile in row]
+    return list(board)
+
+def moves_array(paths):
+    """(codes, lengths): an (N, longest) uint8 array of move codes, zero padded, and each path's length"""
+    _require_numpy()
+    lengths = np.array([len(path) for path in paths], dtype=np.int32)
+    codes = np.zeros((len(paths), int(lengths.max()) if len(paths) else 0), dtype=np.uint8)
+    for row, path in enumerate(paths):
+        codes[row, :len(path)] = [MOVE_INDEX[name] for name in path]
+    return codes, lengths
+
+def replay_solutions(boards, codes, lengths, size):
+    """Replay every solution on its board at once, one move per step across the whole batch
+
+    boards is an (N, size*size) uint8 array (not modified), codes and
+    lengths come from moves_array. Returns (final boards, first illegal
+    step): the step at which a path tried to move the blank off the
+    board, or -1. A path stops at its first illegal move.
+    """
+    _require_numpy()
+    boards = np.array(boards, dtype=np.uint8)
+    count = boards.shape[0]
+    rows = np.arange(count)
+    blank = np.argmax(boards == 0, axis=1)
+    failed = np.full(count, -1, dtype=np.int32)
+    move_rows = np.array(_MOVE_ROWS)
+    move_cols = np.array(_MOVE_COLS)
+    for step in range(codes.shape[1]):
+        active = rows[(lengths > step) & (failed < 0)]
+        if not active.size:
+            break
+        code = codes[active, step]
+        cells = blank[active]
+        row = cells // size + move_rows[code]
+        col = cells % size + move_cols[code]
+        legal = (row >= 0) & (row < size) & (col >= 0) & (col < size)
+        failed[active[~legal]] = step
+        active = active[legal]
+        cells = cells[legal]
+        targets = (row * size + col)[legal]
+        boards[active, cells] = boards[active, targets]
+        boards[active, targets] = 0
+        blank[active] = targets
+    return boards, failed
+
+def validate_solutions(records):
+    """Check that saved solutions reach the goal, replaying each board size as one batch
+
+    records are (size, tiles, moves) as from load_solutions. Returns a
+    report with counts of valid solutions, those with an illegal move and
+    those that end off the goal, the indices of the failures, and the
+    replay throughput in moves per second.
+    """
+    _require_numpy()
+    start = time.perf_counter()
+    by_size = {}
+    for index, (size, tiles, moves) in enumerate(records):
+        by_size.setdefault(size, []).append(index)
+
+    illegal = []
+    not_goal = []
+    total_moves = 0
+    for size, indices in by_size.items():
+        cells = size * size
+        boards = np.array([records[index][1] for index in indices], dtype=np.uint8).reshape(-1, cells)
+        codes, lengths = moves_array([records[index][2] for index in indices])
+        final, failed = replay_solutions(boards, codes, lengths, size)
+        goal = np.array(list(range(1, cells)) + [0], dtype=np.uint8)
+        reached = (final == goal).all(axis=1)
+        illegal.extend(indices[row] for row in np.flatnonzero(failed >= 0).tolist())
+        not_goal.extend(indices[row] for row in np.flatnonzero((failed < 0) & ~reached).tolist())
+        total_moves += int(lengths.sum())
+
+    elapsed = time.perf_counter() - start
+    return {
+        'solutions': len(records),
+        'valid': len(records) - len(illegal) - len(not_goal),
+        'illegal_move': len(illegal),
+        'not_goal': len(not_goal),
+        'failures': sorted(illegal + not_goal),
+        'moves': total_moves,
+        'seconds': elapsed,
+        'moves_per_sec': total_moves / elapsed if elapsed > 0 else float('inf'),
+    }
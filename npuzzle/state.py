@@ -0,0 +1,521 @@
+import math
+from enum import Enum
+
+class PuzzleSize(Enum):
+    EIGHT = (3, "8-Puzzle")
+    FIFTEEN = (4, "15-Puzzle")
+    TWENTY_FOUR = (5, "24-Puzzle")
+    THIRTY_FIVE = (6, "35-Puzzle")
+
+# Blank moves in expansion order, as (name, row delta, col delta)
+MOVES = (('UP', -1, 0), ('DOWN', 1, 0), ('LEFT', 0, -1), ('RIGHT', 0, 1))
+
+# Move name -> its index in MOVES
+MOVE_INDEX = {name: index for index, (name, _, _) in enumerate(MOVES)}
+
+# Index of the move that undoes each entry of MOVES
+INVERSE_MOVE = (1, 0, 3, 2)
+
+# Transposing the board swaps rows and columns, so a blank move UP becomes LEFT and DOWN becomes RIGHT
+TRANSPOSED_MOVE = (2, 3, 0, 1)
+
+_CONTEXTS = {}
+_TRANSPOSE_TABLES = {}
+
+def bits_per_tile(size):
+    """Bits used to store one tile: 4 up to 4x4, 8 for 5x5 and 6x6"""
+    return 4 if size <= 4 else 8
+
+def encode_board(board, size):
+    """Pack a list-of-lists board into a single integer, cell 0 in the low bits"""
+    bits = bits_per_tile(size)
+    key = 0
+    shift = 0
+    for row in board:
+        for value in row:
+            key |= value << shift
+            shift += bits
+    return key
+
+def decode_board(key, size):
+    """Unpack an integer key back into a list-of-lists board"""
+    bits = bits_per_tile(size)
+    mask = (1 << bits) - 1
+    return [[(key >> ((i * size + j) * bits)) & mask for j in range(size)]
+            for i in range(size)]
+
+def goal_board(size):
+    """Build the goal board with the empty space at bottom right"""
+    goal = []
+    num = 1
+    for i in range(size):
+        row = []
+        for j in range(size):
+            if i == size - 1 and j == size - 1:
+                row.append(0)  # Empty space at bottom right
+            else:
+                row.append(num)
+                num += 1
+        goal.append(row)
+    return goal
+
+def count_inversions(values):
+    """Number of pairs i < j with values[i] > values[j], via a Fenwick tree in O(n log n)
+
+    Values must be integers in 0 .. len(values).
+    """
+    limit = len(values) + 1
+    tree = [0] * (limit + 1)
+    inversions = 0
+    for seen, value in enumerate(values):
+        # Count earlier values <= value, the rest of them are inversions
+        index = value + 1
+        smaller = 0
+        while index:
+            smaller += tree[index]
+            index -= index & -index
+        inversions += seen - smaller
+        index = value + 1
+        while index <= limit:
+            tree[index] += 1
+            index += index & -index
+    return inversions
+
+def tiles_solvable(tiles, size):
+    """Solvability of a flat row-major board (0 is the blank)"""
+    inversions = count_inversions([value for value in tiles if value != 0])
+    if size % 2 == 1:  # Odd size
+        return inversions % 2 == 0
+    empty_row = tiles.index(0) // size
+    return (inversions + empty_row) % 2 == 1
+
+class PuzzleContext:
+    """Lookup tables for one board size, built once and shared by every state of that size"""
+
+    __slots__ = ('size', 'cells', 'bits', 'mask', 'goal_key', 'goal_blank', 'target_row', 'target_col',
+                 'manhattan', 'moves', 'slides', 'cell_low_bits')
+
+    def __init__(self, size):
+        cells = size * size
+        self.size = size
+        self.cells = cells
+        self.bits = bits_per_tile(size)
+        self.mask = (1 << self.bits) - 1
+        self.goal_key = encode_board(goal_board(size), size)
+        self.goal_blank = cells - 1
+        # Tile -> goal row/col; index 0 is the blank and never counts
+        self.target_row = tuple([-1] + [(tile - 1) // size for tile in range(1, cells)])
+        self.target_col = tuple([-1] + [(tile - 1) % size for tile in range(1, cells)])
+        manhattan = [(0,) * cells]
+        for tile in range(1, cells):
+            manhattan.append(tuple(abs(cell // size - self.target_row[tile]) + abs(cell % size - self.target_col[tile])
+                                   for cell in range(cells)))
+        self.manhattan = tuple(manhattan)
+        # Blank cell -> legal (move index, target cell) in MOVES order, and the
+        # same moves as (name, target cell, target bit shift) for get_neighbors
+        moves = []
+        slides = []
+        for blank in range(cells):
+            row, col = divmod(blank, size)
+            options = []
+            for index, (_, dr, dc) in enumerate(MOVES):
+                if 0 <= row + dr < size and 0 <= col + dc < size:
+                    options.append((index, (row + dr) * size + col + dc))
+            moves.append(tuple(options))
+            slides.append(tuple((MOVES[index][0], target, target * self.bits) for index, target in options))
+        self.moves = tuple(moves)
+        self.slides = tuple(slides)
+        # Lowest bit of every cell, for counting non-zero cells of a packed key
+        self.cell_low_bits = sum(1 << (cell * self.bits) for cell in range(cells))
+
+    def occupied_cells(self, key):
+        """Number of cells holding a non-zero value in a packed key"""
+        folded = 0
+        for shift in range(self.bits):
+            folded |= key >> shift
+        return bin(folded & self.cell_low_bits).count('1')
+
+def puzzle_context(size):
+    """Shared PuzzleContext for a board size"""
+    context = _CONTEXTS.get(size)
+    if context is None:
+        context = _CONTEXTS[size] = PuzzleContext(size)
+    return context
+
+def _transpose_table(size):
+    """For each cell, (mirrored cell, tile relabelling) under the main-diagonal reflection"""
+    table = _TRANSPOSE_TABLES.get(size)
+    if table is None:
+        cells = size * size
+        mirror = [(cell % size) * size + cell // size for cell in range(cells)]
+        # Tile t belongs at cell t - 1; its image belongs at the mirrored cell
+        relabel = [0] + [mirror[tile - 1] + 1 for tile in range(1, cells)]
+        table = _TRANSPOSE_TABLES[size] = (mirror, relabel)
+    return table
+
+def transpose_key(key, size):
+    """Packed key of the board reflected in its main diagonal, tiles renamed so the goal maps to itself"""
+    ctx = puzzle_context(size)
+    mirror, relabel = _transpose_table(size)
+    bits = ctx.bits
+    mask = ctx.mask
+    result = 0
+    for cell in range(ctx.cells):
+        result |= relabel[(key >> (cell * bits)) & mask] << (mirror[cell] * bits)
+    return result
+
+def goal_key(size):
+    """Packed goal board for a puzzle size"""
+    return puzzle_context(size).goal_key
+
+def distance_tables(size):
+    """Per-tile lookup tables: (manhattan[tile][cell], target_row[tile], target_col[tile])"""
+    context = puzzle_context(size)
+    return context.manhattan, context.target_row, context.target_col
+
+for _puzzle_size in PuzzleSize:
+    puzzle_context(_puzzle_size.value[0])
+
+def _line_pairs(key, size, bits, mask, cell, tile, in_column, target_row, target_col):
+    """Count linear-conflict pairs that involve `tile` sitting at `cell` in its row or column"""
+    row, col = divmod(cell, size)
+    if in_column:
+        # Column conflicts: both tiles belong in this column, order by target row
+        if target_col[tile] != col:
+            return 0
+        others = range(col, size * size, size)
+        position, goal, goal_of = row, target_row[tile], target_row
+        line_of = target_col
+    else:
+        # Row conflicts: both tiles belong in this row, order by target column
+        if target_row[tile] != row:
+            return 0
+        others = range(row * size, row * size + size)
+        position, goal, goal_of = col, target_col[tile], target_col
+        line_of = target_row
+    line = col if in_column else row
+    count = 0
+    for index, other_cell in enumerate(others):
+        if index == position:
+            continue
+        other = (key >> (other_cell * bits)) & mask
+        if other and line_of[other] == line:
+            if index < position:
+                if goal_of[other] > goal:
+                    count += 1
+            elif goal > goal_of[other]:
+                count += 1
+    return count
+
+class NPuzzleState:
+    """Represents a state of the N-puzzle as a packed integer board"""
+
+    __slots__ = ('key', 'size', 'ctx', 'blank', 'parent', 'move', 'depth', 'h_manhattan', 'h_conflicts')
+
+    def __init__(self, board, size, parent=None, move=None, depth=0):
+        self.key = encode_board(board, size)
+        self.size = size
+        self.ctx = puzzle_context(size)
+        self.parent = parent
+        self.move = move
+        self.depth = depth
+        self.h_manhattan = None
+        self.h_conflicts = None
+        row, col = self.find_empty()
+        self.blank = row * size + col
+
+    @classmethod
+    def from_key(cls, key, size, blank, parent=None, move=None, depth=0, ctx=None):
+        """Build a state straight from a packed key without re-encoding"""
+        state = cls.__new__(cls)
+        state.key = key
+        state.size = size
+        state.ctx = ctx or puzzle_context(size)
+        state.blank = blank
+        state.parent = parent
+        state.move = move
+        state.depth = depth
+        state.h_manhattan = None
+        state.h_conflicts = None
+        return state
+
+    @property
+    def board(self):
+        return decode_board(self.key, self.size)
+
+    @property
+    def empty_pos(self):
+        return divmod(self.blank, self.size)
+
+    def tiles(self):
+        """Flat list of tiles in row-major order"""
+        ctx = self.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        key = self.key
+        return [(key >> (i * bits)) & mask for i in range(ctx.cells)]
+
+    def find_empty(self):
+        """Find the position of the empty tile (0)"""
+        for index, value in enumerate(self.tiles()):
+            if value == 0:
+                return divmod(index, self.size)
+        return None
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return (isinstance(other, NPuzzleState) and self.key == other.key
+                and self.size == other.size)
+
+    def __lt__(self, other):
+        return False
+
+    def is_goal(self):
+        """Check if this is the goal state"""
+        return self.key == self.ctx.goal_key
+
+    def get_goal_state(self):
+        """Get the goal state for the current puzzle size"""
+        return goal_board(self.size)
+
+    def manhattan_distance(self):
+        """Calculate Manhattan distance heuristic"""
+        if self.h_manhattan is None:
+            parent = self.parent
+            if parent is not None and parent.h_manhattan is not None:
+                # Only the tile that slid into the parent's blank moved
+                table = self.ctx.manhattan[self._moved_tile()]
+                self.h_manhattan = parent.h_manhattan + table[parent.blank] - table[self.blank]
+            else:
+                self.h_manhattan = self._full_manhattan()
+        return self.h_manhattan
+
+    def _full_manhattan(self):
+        """Manhattan distance summed over the whole board"""
+        table = self.ctx.manhattan
+        distance = 0
+        for index, value in enumerate(self.tiles()):
+            distance += table[value][index]
+        return distance
+
+    def _moved_tile(self):
+        """Tile that moved from this state's blank cell into the parent's blank cell"""
+        ctx = self.ctx
+        return (self.key >> (self.parent.blank * ctx.bits)) & ctx.mask
+
+    def euclidean_distance(self):
+        """Calculate Euclidean distance heuristic"""
+        size = self.size
+        target_row = self.ctx.target_row
+        target_col = self.ctx.target_col
+        distance = 0
+        for index, value in enumerate(self.tiles()):
+            if value != 0:
+                i, j = divmod(index, size)
+                distance += math.sqrt((i - target_row[value])**2 + (j - target_col[value])**2)
+        return distance
+
+    def linear_conflict(self):
+        """Calculate Linear Conflict heuristic (Manhattan + conflicts)"""
+        manhattan = self.manhattan_distance()
+        if self.h_conflicts is None:
+            parent = self.parent
+            if parent is not None and parent.h_conflicts is not None:
+                self.h_conflicts = parent.h_conflicts + self._conflict_delta()
+            else:
+                self.h_conflicts = self._full_conflicts()
+        return manhattan + 2 * self.h_conflicts
+
+    def _conflict_delta(self):
+        """Change in conflicting pairs for the single tile moved from the parent"""
+        parent = self.parent
+        size = self.size
+        ctx = self.ctx
+        bits = ctx.bits
+        mask = ctx.mask
+        target_row = ctx.target_row
+        target_col = ctx.target_col
+        tile = self._moved_tile()
+        # A horizontal slide keeps the tile's order within its row but moves
+        # it between columns, and a vertical slide the other way round
+        horizontal = self.blank // size == parent.blank // size
+        before = _line_pairs(parent.key, size, bits, mask, self.blank, tile, horizontal, target_row, target_col)
+        after = _line_pairs(self.key, size, bits, mask, parent.blank, tile, horizontal, target_row, target_col)
+        return after - before
+
+    def _full_conflicts(self):
+        """Count conflicting pairs over every row and column"""
+        size = self.size
+        tiles = self.tiles()
+        conflicts = 0
+
+        # Check row conflicts
+        for i in range(size):
+            for j in range(size):
+                value = tiles[i * size + j]
+                if value != 0 and (value - 1) // size == i:  # Tile is in correct row
+                    for k in range(j + 1, size):
+                        other_value = tiles[i * size + k]
+                        if (other_value != 0 and (other_value - 1) // size == i and
+                                (value - 1) % size > (other_value - 1) % size):
+                            conflicts += 1
+
+        # Check column conflicts
+        for j in range(size):
+            for i in range(size):
+                value = tiles[i * size + j]
+                if value != 0 and (value - 1) % size == j:  # Tile is in correct column
+                    for k in range(i + 1, size):
+                        other_value = tiles[k * size + j]
+                        if (other_value != 0 and (other_value - 1) % size == j and
+                                (value - 1) // size > (other_value - 1) // size):
+                            conflicts += 1
+
+        return conflicts
+
+    def misplaced_tiles(self):
+        """Calculate misplaced tiles heuristic"""
+        # Cells that differ from the goal; the blank's own cell differs too
+        # unless it is already home, and the blank never counts as misplaced
+        ctx = self.ctx
+        count = ctx.occupied_cells(self.key ^ ctx.goal_key)
+        return count - (self.blank != ctx.goal_blank)
+
+    def is_solvable(self):
+        """Check if the puzzle state is solvable"""
+        return tiles_solvable(self.tiles(), self.size)
+
+    def get_neighbors(self):
+        """Get all possible neighbor states"""
+        neighbors = []
+        ctx = self.ctx
+        size = self.size
+        mask = ctx.mask
+        key = self.key
+        blank = self.blank
+        blank_shift = blank * ctx.bits
+        depth = self.depth + 1
+
+        for move_name, target, tile_shift in ctx.slides[blank]:
+            # Slide the tile into the blank cell: the blank holds 0, so
+            # moving the tile is one subtract and one add on the key
+            value = (key >> tile_shift) & mask
+            new_key = key - (value << tile_shift) + (value << blank_shift)
+            neighbors.append(NPuzzleState.from_key(new_key, size, target, self, move_name, depth, ctx))
+
+        return neighbors
+
+    def get_path(self):
+        """Get the path from start to this state"""
+        path = []
+        current = self
+        while current.parent is not None:
+            path.append(current.move)
+            current = current.parent
+        return path[::-1]
+
+_INVERSE_NAME = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+def walk_path(state, path):
+    """Yield the state after each move of a move-name list; raises ValueError on a move off the board"""
+    size = state.size
+    ctx = state.ctx
+    bits = ctx.bits
+    mask = ctx.mask
+    key, blank = state.key, state.blank
+    for name in path:
+        _, dr, dc = MOVES[MOVE_INDEX[name]]
+        row, col = divmod(blank, size)
+        if not (0 <= row + dr < size and 0 <= col + dc < size):
+            raise ValueError(f"Move {name} leaves the board")
+        target = blank + dr * size + dc
+        tile = (key >> (target * bits)) & mask
+        key = key - (tile << (target * bits)) + (tile << (blank * bits))
+        blank = target
+        yield NPuzzleState.from_key(key, size, blank, ctx=ctx)
+
+def apply_path(state, path):
+    """State reached from state by a move-name list"""
+    result = state
+    for result in walk_path(state, path):
+        pass
+    return result
+
+def invert_path(path):
+    """Move list that undoes path"""
+    return [_INVERSE_NAME[name] for name in reversed(path)]
+
+class ManhattanDelta:
+    """Incremental Manhattan distance for searches that move tiles in place"""
+
+    # delta() depends only on its arguments, so it also works for searches
+    # that jump between unrelated states (A*, not just depth-first)
+    stateless = True
+
+    def __init__(self, size):
+        self.table = puzzle_context(size).manhattan
+
+    def initial(self, state):
+        return state.manhattan_distance()
+
+    def delta(self, h, tile, src, dst, key_before, key_after):
+        """Heuristic after `tile` slides from cell src to cell dst"""
+        row = self.table[tile]
+        return h + row[dst] - row[src]
+
+    def push(self, tile, src, dst):
+        pass
+
+    def pop(self, tile, src, dst):
+        pass
+
+class LinearConflictDelta(ManhattanDelta):
+    """Incremental Manhattan + 2 * conflicting pairs"""
+
+    def __init__(self, size):
+        super().__init__(size)
+        ctx = puzzle_context(size)
+        self.size = size
+        self.bits = ctx.bits
+        self.mask = ctx.mask
+        self.target_row = ctx.target_row
+        self.target_col = ctx.target_col
+
+    def initial(self, state):
+        return state.linear_conflict()
+
+    def delta(self, h, tile, src, dst, key_before, key_after):
+        size = self.size
+        horizontal = src // size == dst // size
+        before = _line_pairs(key_before, size, self.bits, self.mask, src, tile, horizontal,
+                             self.target_row, self.target_col)
+        after = _line_pairs(key_after, size, self.bits, self.mask, dst, tile, horizontal,
+                            self.target_row, self.target_col)
+        row = self.table[tile]
+        return h + row[dst] - row[src] + 2 * (after - before)
+
+class StateHeuristic(ManhattanDelta):
+    """Fallback for arbitrary heuristic functions: rebuild a state and evaluate it"""
+
+    def __init__(self, heuristic_func, size):
+        self.heuristic_func = heuristic_func
+        self.size = size
+
+    def initial(self, state):
+        return self.heuristic_func(state)
+
+    def delta(self, h, tile, src, dst, key_before, key_after):
+        return self.heuristic_func(NPuzzleState.from_key(key_after, self.size, src))
+
+def incremental_heuristic(heuristic_func, state):
+    """Pick an in-place evaluator for a heuristic_func accepted by the engine"""
+    if heuristic_func is NPuzzleState.manhattan_distance:
+        return ManhattanDelta(state.size)
+    if heuristic_func is NPuzzleState.linear_conflict:
+        return LinearConflictDelta(state.size)
+    owner = getattr(heuristic_func, '__self__', None)
+    if owner is not None and hasattr(owner, 'incremental'):
+        return owner.incremental(state)
+    return StateHeuristic(heuristic_func, state.size)
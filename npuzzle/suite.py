@@ -0,0 +1,221 @@
+import csv
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is reported as None
+    resource = None
+
+from .state import NPuzzleState
+from .engine import AdvancedAIEngine, SearchAlgorithm
+from .generate import random_solvable_tiles, random_tiles_at_distance, random_walk_tiles
+from .solutions import decode_moves, encode_moves, validate_solutions
+
+# name -> (kind, board size, walk length or optimal distance, instance count);
+# seeded, so every machine benchmarks exactly the same boards
+GENERATED_SETS = {
+    'eight-easy': ('walk', 3, 16, 20),
+    'eight-hard': ('walk', 3, 80, 20),
+    'eight-uniform': ('uniform', 3, None, 20),
+    'eight-depth-26': ('distance', 3, 26, 20),
+    'fifteen-walk': ('walk', 4, 40, 10),
+    'fifteen-depth-30': ('distance', 4, 30, 10),
+}
+
+RECORD_FIELDS = ('set', 'instance', 'size', 'algorithm', 'status', 'solution_length', 'nodes',
+                 'nodes_per_sec', 'wall_time', 'peak_rss_kb', 'error', 'solution')
+
+def korf_to_tiles(tiles):
+    """Convert a Korf-style 15-puzzle (goal 0 1 2 .. 15, blank first) to this engine's goal layout
+
+    Rotating the board by 180 degrees and renaming tile t to 16 - t maps Korf's
+    goal onto 1 .. 15 with the blank last, so optimal solution lengths carry over.
+    """
+    cells = len(tiles)
+    converted = [0] * cells
+    for cell, tile in enumerate(tiles):
+        converted[cells - 1 - cell] = 0 if tile == 0 else cells - tile
+    return converted
+
+def load_korf_instances(path):
+    """Read the Korf 100 file format: optional instance number, then 16 tiles per line"""
+    instances = []
+    with open(path) as handle:
+        for line in handle:
+            tokens = line.split('#', 1)[0].split()
+            if not tokens:
+                continue
+            numbers = [int(token) for token in tokens]
+            if len(numbers) == 17:
+                number, tiles = numbers[0], numbers[1:]
+            elif len(numbers) == 16:
+                number, tiles = len(instances) + 1, numbers
+            else:
+                raise ValueError(f"Expected 16 tiles per Korf instance, got: {line.strip()}")
+            instances.append({'set': 'korf100', 'instance': f"korf-{number}", 'size': 4,
+                              'tiles': korf_to_tiles(tiles)})
+    return instances
+
+def generated_instances(name, seed=2024):
+    """Seeded instances for one of GENERATED_SETS"""
+    kind, size, parameter, count = GENERATED_SETS[name]
+    rng = random.Random(f"{name}:{seed}")
+    instances = []
+    for number in range(count):
+        if kind == 'walk':
+            tiles = random_walk_tiles(size, parameter, rng)
+        elif kind == 'distance':
+            tiles = random_tiles_at_distance(size, parameter, rng)
+        else:
+            tiles = random_solvable_tiles(size, rng)
+        instances.append({'set': name, 'instance': f"{name}-{number}", 'size': size, 'tiles': tiles})
+    return instances
+
+# Benchmark children start from a fresh interpreter on every platform
+_SPAWN = multiprocessing.get_context('spawn')
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux but in bytes on macOS
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _run_child(conn, tiles, size, algorithm_name):
+    """Child process: solve once and send back a result record"""
+    record = {}
+    try:
+        engine = AdvancedAIEngine()
+        state = NPuzzleState([tiles[i * size:(i + 1) * size] for i in range(size)], size)
+        start = time.perf_counter()
+        path = engine.solve(state, SearchAlgorithm[algorithm_name])
+        wall = time.perf_counter() - start
+        nodes = engine.stats['nodes_explored']
+        record.update(status='solved' if path is not None else 'unsolved',
+                      solution_length=len(path) if path is not None else None,
+                      solution=encode_moves(path).hex() if path is not None else None,
+                      nodes=nodes, wall_time=wall, nodes_per_sec=nodes / wall if wall > 0 else 0.0)
+    except Exception as error:
+        record.update(status='error', error=f"{type(error).__name__}: {error}")
+    record['peak_rss_kb'] = peak_rss_kb()
+    conn.send(record)
+    conn.close()
+
+def run_one(instance, algorithm, time_limit):
+    """Solve one instance with one algorithm in a fresh process, enforcing a wall-clock limit
+
+    The child is spawned rather than forked, so its peak RSS counts only what
+    the solve itself touched, not pages it shared with this process. The
+    time limit starts before the spawn and so includes the child's start-up.
+    """
+    record = dict.fromkeys(RECORD_FIELDS)
+    record.update(set=instance['set'], instance=instance['instance'], size=instance['size'],
+                  algorithm=algorithm.name)
+    receiver, sender = _SPAWN.Pipe(duplex=False)
+    child = _SPAWN.Process(target=_run_child,
+                                    args=(sender, instance['tiles'], instance['size'], algorithm.name))
+    start = time.perf_counter()
+    child.start()
+    sender.close()
+    if receiver.poll(time_limit):
+        record.update(receiver.recv())
+    else:
+        record.update(status='timeout', wall_time=time.perf_counter() - start)
+    child.join(1)
+    if child.is_alive():
+        child.terminate()
+        child.join()
+    receiver.close()
+    return record
+
+def run_suite(instances, algorithms, time_limit=10.0, progress=None):
+    """Run every algorithm over every instance and return the result records"""
+    records = []
+    for instance in instances:
+        for algorithm in algorithms:
+            record = run_one(instance, algorithm, time_limit)
+            records.append(record)
+            if progress is not None:
+                progress(record)
+    return records
+
+def solution_records(instances, records):
+    """(size, tiles, moves) for every solved record, in the form validate_solutions takes"""
+    tiles = {(instance['set'], instance['instance']): instance['tiles'] for instance in instances}
+    return [(record['size'], tiles[(record['set'], record['instance'])],
+             decode_moves(bytes.fromhex(record['solution']), record['solution_length']))
+            for record in records if record['status'] == 'solved']
+
+def validate_records(instances, records):
+    """Replay every solved record in one batch and mark those that miss the goal as 'invalid'"""
+    solved = [record for record in records if record['status'] == 'solved']
+    report = validate_solutions(solution_records(instances, records))
+    for index in report['failures']:
+        solved[index].update(status='invalid', error="solution does not reach the goal")
+    return report
+
+def suite_metadata(time_limit):
+    return {'python': platform.python_version(), 'machine': platform.machine(),
+            'platform': platform.platform(), 'time_limit': time_limit,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+def write_json(path, records, metadata):
+    with open(path, 'w') as handle:
+        json.dump({'metadata': metadata, 'results': records}, handle, indent=2)
+
+def write_csv(path, records):
+    with open(path, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=RECORD_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({field: record.get(field) for field in RECORD_FIELDS})
+
+def load_results(path):
+    """Records from a JSON file written by write_json"""
+    with open(path) as handle:
+        return json.load(handle)['results']
+
+def compare_results(baseline, current, tolerance=0.15, min_time=0.05):
+    """List regressions of current against baseline records
+
+    Correctness regressions (a solved instance no longer solved, a longer
+    solution) are always reported. Nodes, nodes/sec, wall time and peak RSS
+    are flagged when they get worse by more than `tolerance` (a fraction);
+    timings below min_time seconds are too noisy to compare.
+    """
+    index = {(r['set'], r['instance'], r['algorithm']): r for r in baseline}
+    regressions = []
+
+    def flag(record, metric, old, new):
+        regressions.append({'set': record['set'], 'instance': record['instance'],
+                            'algorithm': record['algorithm'], 'metric': metric,
+                            'baseline': old, 'current': new})
+
+    for record in current:
+        old = index.get((record['set'], record['instance'], record['algorithm']))
+        if old is None:
+            continue
+        if old['status'] == 'solved' and record['status'] != 'solved':
+            flag(record, 'status', old['status'], record['status'])
+            continue
+        if record['status'] != 'solved' or old['status'] != 'solved':
+            continue
+        if record['solution_length'] > old['solution_length']:
+            flag(record, 'solution_length', old['solution_length'], record['solution_length'])
+        if record['nodes'] > old['nodes'] * (1 + tolerance):
+            flag(record, 'nodes', old['nodes'], record['nodes'])
+        if old['wall_time'] >= min_time:
+            if record['wall_time'] > old['wall_time'] * (1 + tolerance):
+                flag(record, 'wall_time', old['wall_time'], record['wall_time'])
+            if record['nodes_per_sec'] < old['nodes_per_sec'] * (1 - tolerance):
+                flag(record, 'nodes_per_sec', old['nodes_per_sec'], record['nodes_per_sec'])
+        if (record['peak_rss_kb'] is not None and old['peak_rss_kb'] is not None
+                and record['peak_rss_kb'] > old['peak_rss_kb'] * (1 + tolerance)):
+            flag(record, 'peak_rss_kb', old['peak_rss_kb'], record['peak_rss_kb'])
+    return regressions
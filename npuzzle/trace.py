@@ -0,0 +1,295 @@
+import json
+import time
+import tracemalloc
+
+# Phases the engine reports; anything else inside a run counts as 'other'
+PHASES = ('expand', 'heuristic', 'heap', 'visited')
+
+# One size sample per this many frontier pushes or visited insertions
+SAMPLE_EVERY = 4096
+
+class SearchTrace:
+    """Instrumentation for the solves of one AdvancedAIEngine
+
+    Attach with AdvancedAIEngine(trace=SearchTrace()). Every solve() then
+    becomes a run with perf_counter_ns timers per phase (expand, heuristic,
+    heap, visited), exclusive of nested phases, peak frontier and visited
+    sizes, the tracemalloc peak of the search (also stored as
+    stats['memory_used']) and, for IDA*, one record per threshold iteration
+    with an optional histogram of the f values that went over it. The
+    timers slow the search down, so compare phases with each other rather
+    than with untraced runs. Parallel IDA* only gets run-level figures,
+    since its work happens in other processes.
+    """
+
+    def __init__(self, memory=True, histograms=True):
+        self.memory = memory
+        self.histograms = histograms
+        self.runs = []
+        self.origin = time.perf_counter_ns()
+        self.run = None
+        # Nested phase time of the callers still running, innermost last
+        self._stack = [0]
+        self._sample_counts = {}
+        self._own_tracemalloc = False
+        self._memory_base = 0
+        self._memory_run = False
+
+    def begin(self, algorithm, state, memory=True):
+        """Start a run record for one solve"""
+        self.run = {
+            'algorithm': algorithm,
+            'size': state.size,
+            'board': state.tiles(),
+            'start_ns': time.perf_counter_ns() - self.origin,
+            'duration_ns': 0,
+            'phases': {phase: {'ns': 0, 'calls': 0} for phase in PHASES},
+            'peak_frontier': 0,
+            'peak_visited': 0,
+            'memory_peak': None,
+            'iterations': [],
+            'samples': [],
+            'stats': None,
+        }
+        self.runs.append(self.run)
+        self._stack = [0]
+        self._sample_counts = {}
+        self._memory_run = self.memory and memory
+        if self._memory_run:
+            self._own_tracemalloc = not tracemalloc.is_tracing()
+            if self._own_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._memory_base = tracemalloc.get_traced_memory()[0]
+        return self.run
+
+    def end(self, stats):
+        """Close the current run, copying peaks and memory into stats"""
+        run = self.run
+        if run is None:
+            return None
+        run['duration_ns'] = time.perf_counter_ns() - self.origin - run['start_ns']
+        if self._memory_run:
+            peak = tracemalloc.get_traced_memory()[1] - self._memory_base
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+            run['memory_peak'] = max(peak, 0)
+            stats['memory_used'] = run['memory_peak']
+        stats['peak_frontier'] = run['peak_frontier']
+        stats['peak_visited'] = run['peak_visited']
+        run['stats'] = dict(stats)
+        self.run = None
+        return run
+
+    def _current(self):
+        if self.run is None:
+            # Search methods called directly, outside solve()
+            self.run = self.begin('direct', _NoBoard, memory=False)
+        return self.run
+
+    def enter(self):
+        """Open a phase measured by leave(); phases nest"""
+        self._stack.append(0)
+        return time.perf_counter_ns()
+
+    def leave(self, phase, started):
+        """Close the innermost phase opened by enter()"""
+        elapsed = time.perf_counter_ns() - started
+        nested = self._stack.pop()
+        self._stack[-1] += elapsed
+        record = self._current()['phases'][phase]
+        record['ns'] += elapsed - nested
+        record['calls'] += 1
+
+    def timed(self, phase, func):
+        """func wrapped so that its calls count towards phase"""
+        enter = self.enter
+        leave = self.leave
+
+        def wrapper(*args):
+            started = enter()
+            try:
+                return func(*args)
+            finally:
+                leave(phase, started)
+        return wrapper
+
+    def heap_ops(self, push, pop):
+        """(push, pop) that time the heap phase and follow the peak frontier size"""
+        timed_pop = self.timed('heap', pop)
+        enter = self.enter
+        leave = self.leave
+        trace = self
+
+        def timed_push(heap, item):
+            started = enter()
+            push(heap, item)
+            leave('heap', started)
+            trace.frontier(len(heap))
+        return timed_push, timed_pop
+
+    def frontier(self, size):
+        """Report the current frontier size"""
+        run = self._current()
+        if size > run['peak_frontier']:
+            run['peak_frontier'] = size
+        self._sample('frontier', size)
+
+    def visited_size(self, size):
+        """Report the current visited-set size"""
+        run = self._current()
+        if size > run['peak_visited']:
+            run['peak_visited'] = size
+        self._sample('visited', size)
+
+    def _sample(self, name, size):
+        count = self._sample_counts.get(name, 0) + 1
+        self._sample_counts[name] = count
+        if count % SAMPLE_EVERY == 1:
+            self.run['samples'].append((name, time.perf_counter_ns() - self.origin, size))
+
+    def visited_set(self, items=()):
+        """Set whose membership tests and insertions count towards the visited phase"""
+        return TracedSet(self, items)
+
+    def visited_dict(self, items=()):
+        """Dict whose lookups and stores count towards the visited phase"""
+        return TracedDict(self, items)
+
+    def iteration(self, threshold, nodes, started, histogram):
+        """Record one IDA* iteration that started at perf_counter_ns() == started"""
+        self._current()['iterations'].append({
+            'threshold': threshold,
+            'nodes': nodes,
+            'start_ns': started - self.origin,
+            'duration_ns': time.perf_counter_ns() - started,
+            'overflow_histogram': {str(f): count for f, count in sorted(histogram.items())} if histogram else None,
+        })
+
+    def summary(self):
+        """Per-run phase times in seconds with the remainder as 'other', for printing"""
+        rows = []
+        for run in self.runs:
+            phases = {phase: record['ns'] / 1e9 for phase, record in run['phases'].items()}
+            phases['other'] = max(run['duration_ns'] / 1e9 - sum(phases.values()), 0.0)
+            rows.append({'algorithm': run['algorithm'], 'seconds': run['duration_ns'] / 1e9, 'phases': phases,
+                         'peak_frontier': run['peak_frontier'], 'peak_visited': run['peak_visited'],
+                         'memory_peak': run['memory_peak'], 'iterations': len(run['iterations'])})
+        return rows
+
+    def to_json(self, path=None):
+        """Every run as a JSON document; written to path when given"""
+        document = {'runs': self.runs, 'summary': self.summary()}
+        if path:
+            with open(path, 'w') as handle:
+                json.dump(document, handle, indent=2, default=str)
+        return document
+
+    def to_chrome_trace(self, path=None):
+        """Runs in Chrome trace-event format (chrome://tracing, Perfetto)
+
+        Each run is a span on thread 1 with its IDA* iterations nested
+        inside. Thread 2 lays the run's phase totals end to end, which reads
+        like a one-level flame graph, and frontier and visited sizes are
+        counter tracks.
+        """
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': 'npuzzle search'}},
+                  {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'runs'}},
+                  {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2, 'args': {'name': 'phase totals'}}]
+        for run in self.runs:
+            start = run['start_ns'] / 1000
+            events.append({'name': run['algorithm'], 'cat': 'run', 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': start, 'dur': run['duration_ns'] / 1000,
+                           'args': {key: value for key, value in (run['stats'] or {}).items()}})
+            for number, iteration in enumerate(run['iterations']):
+                events.append({'name': f"iteration {number} (f <= {iteration['threshold']})", 'cat': 'iteration',
+                               'ph': 'X', 'pid': 1, 'tid': 1, 'ts': iteration['start_ns'] / 1000,
+                               'dur': iteration['duration_ns'] / 1000,
+                               'args': {'nodes': iteration['nodes'],
+                                        'overflow_histogram': iteration['overflow_histogram']}})
+            offset = start
+            for phase, record in run['phases'].items():
+                if record['ns']:
+                    events.append({'name': phase, 'cat': 'phase', 'ph': 'X', 'pid': 1, 'tid': 2, 'ts': offset,
+                                   'dur': record['ns'] / 1000, 'args': {'calls': record['calls']}})
+                    offset += record['ns'] / 1000
+            for name, stamp, size in run['samples']:
+                events.append({'name': name, 'ph': 'C', 'pid': 1, 'ts': stamp / 1000, 'args': {'size': size}})
+        document = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path:
+            with open(path, 'w') as handle:
+                json.dump(document, handle, default=str)
+        return document
+
+class _NoBoard:
+    """Stand-in board for runs opened outside solve()"""
+    size = 0
+
+    @staticmethod
+    def tiles():
+        return []
+
+class TracedSet(set):
+    """set that charges membership tests and insertions to the visited phase"""
+
+    def __init__(self, trace, items=()):
+        super().__init__(items)
+        self.trace = trace
+
+    def __contains__(self, item):
+        started = self.trace.enter()
+        try:
+            return super().__contains__(item)
+        finally:
+            self.trace.leave('visited', started)
+
+    def add(self, item):
+        started = self.trace.enter()
+        super().add(item)
+        self.trace.leave('visited', started)
+        self.trace.visited_size(len(self))
+
+class TracedDict(dict):
+    """dict that charges lookups and stores to the visited phase"""
+
+    def __init__(self, trace, items=()):
+        super().__init__(items)
+        self.trace = trace
+
+    def __contains__(self, key):
+        started = self.trace.enter()
+        try:
+            return super().__contains__(key)
+        finally:
+            self.trace.leave('visited', started)
+
+    def __getitem__(self, key):
+        started = self.trace.enter()
+        try:
+            return super().__getitem__(key)
+        finally:
+            self.trace.leave('visited', started)
+
+    def get(self, key, default=None):
+        started = self.trace.enter()
+        try:
+            return super().get(key, default)
+        finally:
+            self.trace.leave('visited', started)
+
+    def __setitem__(self, key, value):
+        started = self.trace.enter()
+        super().__setitem__(key, value)
+        self.trace.leave('visited', started)
+        self.trace.visited_size(len(self))
+
+class TracedEvaluator:
+    """Incremental heuristic proxy whose initial() and delta() count towards the heuristic phase"""
+
+    def __init__(self, evaluator, trace):
+        self.evaluator = evaluator
+        self.stateless = evaluator.stateless
+        self.initial = trace.timed('heuristic', evaluator.initial)
+        self.delta = trace.timed('heuristic', evaluator.delta)
+        self.push = evaluator.push
+        self.pop = evaluator.pop
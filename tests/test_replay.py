@@ -0,0 +1,43 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pytest
+
+from brickbreaker import NO_INPUT, GameState
+from brickbreaker.replay import record_session, run_replay
+
+
+@pytest.fixture(scope='module')
+def game_over_replay():
+    """A game the player never touches, which ends with the last ball lost"""
+    replay = record_session(5000, seed=7, policy=lambda sim: NO_INPUT)
+    assert replay.steps < 5000
+    return replay
+
+
+def test_headless_replay_of_game_over(game_over_replay):
+    result = run_replay(game_over_replay)
+    assert result['state'] == GameState.GAME_OVER.value
+    assert result['steps'] == game_over_replay.steps
+    assert result['matches']
+
+
+def test_rendered_replay_finishes_at_game_over(game_over_replay, tmp_path, monkeypatch, capsys):
+    # The high score file is written to the working directory
+    monkeypatch.chdir(tmp_path)
+    import brick_hit
+
+    game = brick_hit.UltimateBrickBreaker()
+    game.quit_after_replay = True
+    game.start_replay(game_over_replay)
+    for _ in range(game_over_replay.steps + 10):
+        game.update(brick_hit.FIXED_DT)
+        if game.quit_requested:
+            break
+    assert game.quit_requested
+    assert game.replay_controls is None
+    assert game.state == GameState.GAME_OVER
+    assert game.sim.digest() == game_over_replay.digest
+    assert "state matches" in capsys.readouterr().out